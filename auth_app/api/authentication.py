@@ -0,0 +1,81 @@
+import copy
+import hashlib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from core.utils.cache import TTLCache
+
+_local_cache = None
+
+
+def _config():
+    return getattr(settings, "TOKEN_AUTH_CACHE", {})
+
+
+def local_token_cache():
+    """Bounded in-process LRU/TTL cache of token key -> (user, token)"""
+    global _local_cache
+    if _local_cache is None:
+        config = _config()
+        _local_cache = TTLCache(max_size=config.get("MAX_SIZE", 10000), ttl=config.get("TTL", 30))
+    return _local_cache
+
+
+def shared_token_cache():
+    """Optional Django cache (e.g. Redis/Memcached) shared between processes"""
+    alias = _config().get("SHARED_CACHE")
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    return "authtoken:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    local_token_cache().delete(key)
+    shared = shared_token_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that caches the token -> user lookup instead of joining Token and User per request"""
+
+    def authenticate_credentials(self, key):
+        cache = local_token_cache()
+        cached = cache.get(key)
+        if cached is None:
+            shared = shared_token_cache()
+            if shared is not None:
+                cached = shared.get(_shared_key(key))
+            if cached is None:
+                cached = super().authenticate_credentials(key)
+                if shared is not None:
+                    shared.set(_shared_key(key), cached, _config().get("TTL", 30))
+            cache.set(key, cached)
+        user, token = cached
+        return copy.copy(user), token
+
+
+def token_from_request(request, allow_query_param=False):
+    """Token key from the Authorization header; ?token= only where clients cannot send headers (EventSource)"""
+    parts = get_authorization_header(request).split()
+    if len(parts) == 2 and parts[0].lower() == CachedTokenAuthentication.keyword.lower().encode():
+        return parts[1].decode(errors="ignore")
+    if allow_query_param:
+        return request.GET.get("token")
+    return None
+
+
+async def aauthenticate_token(request, allow_query_param=False):
+    """Async counterpart for plain Django async views: (user, error) with error None on success"""
+    key = token_from_request(request, allow_query_param=allow_query_param)
+    if not key:
+        return None, "Anmeldung erforderlich."
+    try:
+        user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+    except AuthenticationFailed:
+        return None, "Ungültiger Token."
+    return user, None
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import AuthenticationFailed
+from kanban_app.membership import is_board_member
 
 
 class IsBoardOwnerOrMember(BasePermission):
@@ -9,20 +10,18 @@ class IsBoardOwnerOrMember(BasePermission):
     def has_object_permission(self, request, view, obj):
         """Attributes needs to be checked to avoid unwanted error messages"""
         
-        if hasattr(obj, "owner") and hasattr(obj, "members"):
+        if hasattr(obj, "owner_id") and hasattr(obj, "members"):
             board = obj
             
-        elif hasattr(obj, "board"):
-            board = obj.board
+        elif hasattr(obj, "board_id"):
+            board = obj.board_id
             
-        elif hasattr(obj, "task") and hasattr(obj.task, "board"):
-            board = obj.task.board
+        elif hasattr(obj, "task") and hasattr(obj.task, "board_id"):
+            board = obj.task.board_id
         else:
             raise AuthenticationFailed(self.message)
 
-        is_owner = board.owner_id == request.user.id
-        is_member = board.members.filter(id=request.user.id).exists()
-        if is_owner or is_member:
+        if is_board_member(board, request.user, request=request):
             return True
 
         raise AuthenticationFailed(self.message)
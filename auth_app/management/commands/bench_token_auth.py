@@ -0,0 +1,56 @@
+import json
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from auth_app.api.authentication import CachedTokenAuthentication, local_token_cache
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compares SQL queries and time per authenticated request for TokenAuthentication and CachedTokenAuthentication."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--users", type=int, default=50, help="Distinct tokens used round-robin.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                report = self.run(options["requests"], options["users"])
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run(self, total, user_count):
+        users = User.objects.bulk_create(
+            User(username=f"bench-auth-{i}@example.com", email=f"bench-auth-{i}@example.com") for i in range(user_count)
+        )
+        keys = [Token.objects.create(user=user).key for user in users]
+        factory = APIRequestFactory()
+        requests = [Request(factory.get("/", HTTP_AUTHORIZATION=f"Token {key}")) for key in keys]
+
+        report = {}
+        for authenticator in (TokenAuthentication(), CachedTokenAuthentication()):
+            local_token_cache().clear()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for i in range(total):
+                    authenticator.authenticate(requests[i % len(requests)])
+                elapsed = time.perf_counter() - started
+            report[type(authenticator).__name__] = {
+                "requests": total,
+                "queries": len(queries),
+                "queries_per_request": round(len(queries) / total, 4),
+                "us_per_request": round(elapsed / total * 1_000_000, 1),
+            }
+        return report
@@ -1,3 +1,63 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from auth_app.api import authentication
+from auth_app.api.authentication import local_token_cache
 
-# Create your tests here.
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        local_token_cache().clear()
+        self.user = User.objects.create_user(username="max@example.com", email="max@example.com", first_name="Max", last_name="Muster")
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse("email-check")
+        self.params = {"email": "max@example.com"}
+
+    def get(self, key=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return self.client.get(self.url, self.params)
+
+    def test_cached_request_skips_token_query(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get().status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get().status_code, 200)
+
+    def test_deleted_token_is_rejected(self):
+        self.get()
+        self.token.delete()
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_regenerated_token(self):
+        old_key = self.token.key
+        self.get()
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        self.assertEqual(self.get(old_key).status_code, 401)
+        self.assertEqual(self.get(new_token.key).status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_invalid_token_is_not_cached(self):
+        self.assertEqual(self.get("invalid").status_code, 401)
+        self.assertEqual(len(local_token_cache()), 0)
+
+    @override_settings(
+        CACHES={"shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "token-tests"}},
+        TOKEN_AUTH_CACHE={"MAX_SIZE": 100, "TTL": 30, "SHARED_CACHE": "shared"},
+    )
+    def test_shared_cache_backend(self):
+        self.get()
+        local_token_cache().clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get().status_code, 200)
+
+        self.token.delete()
+        self.assertEqual(self.get().status_code, 401)
+        authentication.shared_token_cache().clear()
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from core.utils.database import apply_sqlite_tuning
+        connection_created.connect(apply_sqlite_tuning, dispatch_uid="core.sqlite_tuning")
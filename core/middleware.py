@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from core.routers import is_pinned, pin_to_primary, replica_alias, reset_replica, use_replica
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("kanmind.instrumentation")
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class _QueryRecorder:
+    """Execute wrapper collecting query count, DB time and SQL fingerprints of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[sql] += 1
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        if self.render_started is not None:
+            self.render_time = time.perf_counter() - self.render_started
+        return response
+
+    def duplicates(self):
+        """Statements (parameters stripped) that ran more than once, most frequent first"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+def fingerprint(sql):
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+class RequestInstrumentationMiddleware:
+    """Records view name, DB time, query count, duplicate queries and render time per request.
+
+    Adds a Server-Timing header, writes a sampled JSON log line and warns when a request
+    issues more identical queries than DUPLICATE_QUERY_THRESHOLD. Disabled (and removed
+    from the middleware chain) unless REQUEST_INSTRUMENTATION["ENABLED"] is set.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "REQUEST_INSTRUMENTATION", {})
+        self.get_response = get_response
+        self.server_timing = config.get("SERVER_TIMING", True)
+        self.sample_rate = config.get("SAMPLE_RATE", 0.0)
+        self.duplicate_threshold = config.get("DUPLICATE_QUERY_THRESHOLD")
+        if not config.get("ENABLED") or not (self.server_timing or self.sample_rate or self.duplicate_threshold):
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        sampled = self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+        if not (sampled or self.server_timing or self.duplicate_threshold):
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        request._instrumentation = recorder
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        if self.server_timing:
+            response["Server-Timing"] = self.server_timing_header(recorder, total)
+        duplicates = recorder.duplicates()
+        if self.duplicate_threshold and duplicates and duplicates[0][1] > self.duplicate_threshold:
+            sql, count = duplicates[0]
+            logger.warning(
+                "%s %s (%s) ran the same query %d times [%s]: %s",
+                request.method, request.path, self.view_name(request), count, fingerprint(sql), sql[:300],
+            )
+        if sampled:
+            logger.info(json.dumps(self.log_record(request, response, recorder, total, duplicates)))
+        return response
+
+    def process_template_response(self, request, response):
+        """DRF responses are rendered after the view; time that step as serialization"""
+        recorder = getattr(request, "_instrumentation", None)
+        if recorder is not None:
+            recorder.start_render()
+            response.add_post_render_callback(recorder.finish_render)
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return None
+        return match.view_name or match._func_path
+
+    @staticmethod
+    def server_timing_header(recorder, total):
+        app = max(total - recorder.db_time - recorder.render_time, 0)
+        return ", ".join([
+            f'db;dur={recorder.db_time * 1000:.2f};desc="{recorder.count} queries"',
+            f"serialize;dur={recorder.render_time * 1000:.2f}",
+            f"app;dur={app * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+    def log_record(self, request, response, recorder, total, duplicates):
+        return {
+            "method": request.method,
+            "path": request.path,
+            "view": self.view_name(request),
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "db_ms": round(recorder.db_time * 1000, 2),
+            "serialize_ms": round(recorder.render_time * 1000, 2),
+            "queries": recorder.count,
+            "duplicate_queries": {fingerprint(sql): count for sql, count in duplicates[:5]},
+        }
+
+
+class ReplicaRoutingMiddleware:
+    """Lets GET/HEAD/OPTIONS requests read from the replica unless the client wrote within STICKY_SECONDS.
+
+    Removed from the middleware chain when no replica is configured; handles sync and async requests
+    natively so async views and event streams are not adapted to a thread per request.
+    """
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if replica_alias() is None:
+            return self.get_response(request)
+        safe, token = self.route(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica(token)
+        return self.finish(request, response, safe)
+
+    async def __acall__(self, request):
+        if replica_alias() is None:
+            return await self.get_response(request)
+        safe, token = self.route(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_replica(token)
+        return self.finish(request, response, safe)
+
+    def route(self, request):
+        safe = request.method in self.SAFE_METHODS
+        return safe, use_replica(safe and not is_pinned(request))
+
+    @staticmethod
+    def finish(request, response, safe):
+        if not safe and response.status_code < 400:
+            pin_to_primary(request, response)
+        return response
+
+
+class ResponseCompressionMiddleware(GZipMiddleware):
+    """Compresses responses of at least MIN_SIZE bytes with brotli (if installed and accepted) or gzip.
+
+    Server-Sent Events are never compressed so every event is flushed immediately. Disabled (and
+    removed from the middleware chain) unless RESPONSE_COMPRESSION["ENABLED"] is set.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "RESPONSE_COMPRESSION", {})
+        if not config.get("ENABLED"):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.min_size = config.get("MIN_SIZE", 1024)
+        self.brotli = brotli is not None and config.get("BROTLI", True)
+        self.brotli_quality = config.get("BROTLI_QUALITY", 4)
+
+    def process_response(self, request, response):
+        if response.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+        if response.streaming or response.has_header("Content-Encoding"):
+            return super().process_response(request, response)
+        if len(response.content) < self.min_size:
+            return response
+        if self.brotli and re_accepts_brotli.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            return self.compress_brotli(response)
+        return super().process_response(request, response)
+
+    def compress_brotli(self, response):
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
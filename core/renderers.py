@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def json_backend():
+    """'orjson' or 'stdlib' according to API_JSON_ENCODER ('auto' prefers orjson when installed)"""
+    backend = getattr(settings, "API_JSON_ENCODER", "auto")
+    if backend == "auto":
+        return "orjson" if orjson is not None else "stdlib"
+    if backend == "orjson" and orjson is None:
+        raise ImproperlyConfigured("API_JSON_ENCODER='orjson' requires the orjson package.")
+    if backend not in ("orjson", "stdlib"):
+        raise ImproperlyConfigured(f"Unknown API_JSON_ENCODER {backend!r}.")
+    return backend
+
+
+def _orjson_dumps(data):
+    # dates/datetimes go through DRF's encoder so both backends emit the same strings ("...Z", no microsecond drift)
+    content = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+def dumps(data):
+    """Compact UTF-8 JSON bytes, byte-identical to JSONRenderer().render(data) with COMPACT_JSON"""
+    if json_backend() == "orjson":
+        return _orjson_dumps(data)
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer encoding compact responses with orjson; indented, ASCII-only or non-compact output uses stdlib json"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None and self.compact and not self.ensure_ascii and json_backend() == "orjson":
+            return _orjson_dumps(data)
+        return super().render(data, accepted_media_type, renderer_context)
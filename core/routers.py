@@ -0,0 +1,89 @@
+"""Primary/replica routing: reads of safe requests go to the replica, everything else to the primary"""
+import hashlib
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from core.utils.cache import TTLCache
+
+# Number of atomic blocks open when the request was routed to the replica; None routes reads to the primary
+_replica_depth = ContextVar("replica_depth", default=None)
+_sticky = None
+
+
+def routing_setting(name, default=None):
+    return getattr(settings, "DATABASE_ROUTING", {}).get(name, default)
+
+
+def replica_alias():
+    """Configured replica alias, or None when running on a single database"""
+    return routing_setting("REPLICA_ALIAS")
+
+
+def sticky_clients():
+    """Clients that wrote recently and read from the primary until their entry expires"""
+    global _sticky
+    if _sticky is None:
+        _sticky = TTLCache(max_size=routing_setting("STICKY_MAX_CLIENTS", 10000), ttl=routing_setting("STICKY_SECONDS", 5))
+    return _sticky
+
+
+def client_key(request):
+    """Token or session of the client; None for anonymous requests without either"""
+    credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return hashlib.sha256(credential.encode()).hexdigest() if credential else None
+
+
+def is_pinned(request):
+    key = client_key(request)
+    return routing_setting("STICKY_COOKIE") in request.COOKIES or (key is not None and key in sticky_clients())
+
+
+def pin_to_primary(request, response):
+    """Read-your-writes: keeps the client on the primary for STICKY_SECONDS (cookie and per-credential entry)"""
+    key = client_key(request)
+    if key is not None:
+        sticky_clients().set(key, True)
+    seconds = routing_setting("STICKY_SECONDS", 5)
+    if routing_setting("STICKY_COOKIE") and seconds > 0:
+        response.set_cookie(routing_setting("STICKY_COOKIE"), "1", max_age=seconds, httponly=True, samesite="Lax")
+
+
+def _atomic_depth(alias=DEFAULT_DB_ALIAS):
+    return len(connections[alias].atomic_blocks)
+
+
+def use_replica(enabled):
+    """Sets the routing for the current request context; returns a token for reset_replica().
+    Remembers the transaction depth at this point, so atomic blocks opened later pin reads to the primary."""
+    return _replica_depth.set(_atomic_depth() if enabled else None)
+
+
+def reset_replica(token):
+    _replica_depth.reset(token)
+
+
+def _replica_allowed():
+    """True while reads were routed to the replica and no transaction was opened since"""
+    depth = _replica_depth.get()
+    return depth is not None and _atomic_depth() <= depth
+
+
+class PrimaryReplicaRouter:
+    """Sends reads to the replica only while a safe request runs outside a transaction on the primary"""
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if alias and _replica_allowed():
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
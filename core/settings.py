@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from core.utils.database import database_from_env
 
 # Optional: .env laden, wenn vorhanden
 try:
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework.authtoken',
+    'core',
     'auth_app',
     'kanban_app',
 ]
@@ -56,15 +58,94 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        os.getenv("API_JSON_RENDERER", "core.renderers.FastJSONRenderer"),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'COMPACT_JSON': os.getenv("API_COMPACT_JSON", "True").lower() == "true",
+}
+
+# JSON-Encoder der API: "auto" nutzt orjson, falls installiert, sonst stdlib-json ("orjson"/"stdlib" erzwingen)
+API_JSON_ENCODER = os.getenv("API_JSON_ENCODER", "auto")
+
+# Cache für Token -> User (lokal LRU/TTL, optional zusätzlich ein geteilter Django-Cache-Alias)
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": int(os.getenv("TOKEN_AUTH_CACHE_SIZE", "10000")),
+    "TTL": int(os.getenv("TOKEN_AUTH_CACHE_TTL", "30")),
+    "SHARED_CACHE": os.getenv("TOKEN_AUTH_SHARED_CACHE") or None,
+}
+
+# Cursor-Pagination der Listen-Endpoints (aktiv bei ?cursor= / ?page_size= oder wenn ALWAYS=True)
+KANBAN_PAGINATION = {
+    "ALWAYS": os.getenv("KANBAN_PAGINATION_ALWAYS", "False").lower() == "true",
+    "PAGE_SIZE": int(os.getenv("KANBAN_PAGE_SIZE", "50")),
+    "MAX_PAGE_SIZE": int(os.getenv("KANBAN_MAX_PAGE_SIZE", "500")),
+    "STREAM_CHUNK_SIZE": int(os.getenv("KANBAN_STREAM_CHUNK_SIZE", "500")),
+}
+
+# Prozessweiter Cache für Board-Mitgliedschaften (Board-ID -> erlaubte User-IDs)
+KANBAN_MEMBERSHIP_CACHE = {
+    "MAX_SIZE": int(os.getenv("KANBAN_MEMBERSHIP_CACHE_SIZE", "2048")),
+    "TTL": int(os.getenv("KANBAN_MEMBERSHIP_CACHE_TTL", "60")),
+}
+
+# Cache der gerenderten Board-Detailansicht (pro Board, gültig bis zur nächsten Revision); SHARED_CACHE = Django-Cache-Alias statt lokalem LRU
+KANBAN_BOARD_CACHE = {
+    "ENABLED": os.getenv("KANBAN_BOARD_CACHE", "True").lower() == "true",
+    "MAX_ENTRIES": int(os.getenv("KANBAN_BOARD_CACHE_SIZE", "512")),
+    "MAX_BYTES": int(os.getenv("KANBAN_BOARD_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    "TTL": int(os.getenv("KANBAN_BOARD_CACHE_TTL", "300")),
+    "SHARED_CACHE": os.getenv("KANBAN_BOARD_CACHE_SHARED") or None,
+}
+
+# Job-Queue in der Datenbank (Worker: manage.py run_jobs); EAGER führt Jobs ohne Worker direkt nach dem Commit im Prozess aus
+KANBAN_JOBS = {
+    "EAGER": os.getenv("KANBAN_JOBS_EAGER", "False").lower() == "true",
+    "VISIBILITY_TIMEOUT": int(os.getenv("KANBAN_JOBS_VISIBILITY_TIMEOUT", "300")),
+    "MAX_ATTEMPTS": int(os.getenv("KANBAN_JOBS_MAX_ATTEMPTS", "3")),
+    "RETRY_DELAY": int(os.getenv("KANBAN_JOBS_RETRY_DELAY", "10")),
+    "POLL_INTERVAL": float(os.getenv("KANBAN_JOBS_POLL_INTERVAL", "1")),
+    "BOARD_DELETE_INLINE_TASKS": int(os.getenv("KANBAN_BOARD_DELETE_INLINE_TASKS", "500")),
+}
+
+# Materialisierte Zugriffstabelle User -> Board für Listen und Berechtigungen (nach dem Aktivieren einmal rebuild_board_access ausführen)
+KANBAN_ACCESS_TABLE = os.getenv("KANBAN_ACCESS_TABLE", "False").lower() == "true"
+
+# Async-Varianten der Lese-Endpoints (nur sinnvoll unter ASGI, z.B. uvicorn core.asgi:application)
+KANBAN_ASYNC_VIEWS = os.getenv("KANBAN_ASYNC_VIEWS", "False").lower() == "true"
+
+# Server-Sent Events pro Board (/api/boards/<pk>/events/, nur unter ASGI)
+KANBAN_EVENTS = {
+    "BACKEND": os.getenv("KANBAN_EVENTS_BACKEND", "kanban_app.events.InMemoryBroker"),
+    "QUEUE_SIZE": int(os.getenv("KANBAN_EVENTS_QUEUE_SIZE", "100")),
+    "HEARTBEAT": int(os.getenv("KANBAN_EVENTS_HEARTBEAT", "15")),
+    "MAX_SUBSCRIBERS": int(os.getenv("KANBAN_EVENTS_MAX_SUBSCRIBERS", "10000")),
+}
+
+# Volltextsuche /api/search/?q= (SQLite FTS5, siehe kanban_app/search.py)
+KANBAN_SEARCH = {
+    "PAGE_SIZE": int(os.getenv("KANBAN_SEARCH_PAGE_SIZE", "20")),
+    "MAX_PAGE_SIZE": int(os.getenv("KANBAN_SEARCH_MAX_PAGE_SIZE", "100")),
+}
+
+# Maximale Anzahl Elemente pro Anfrage an /api/tasks/bulk/
+KANBAN_BULK_MAX_ITEMS = int(os.getenv("KANBAN_BULK_MAX_ITEMS", "500"))
+
+# Änderungsprotokoll für /api/boards/<pk>/changes/ (ältere Einträge entfernt compact_board_changes)
+KANBAN_CHANGELOG = {
+    "RETENTION_DAYS": int(os.getenv("KANBAN_CHANGELOG_RETENTION_DAYS", "30")),
 }
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "core.middleware.RequestInstrumentationMiddleware",
+    "core.middleware.ResponseCompressionMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,6 +155,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request-Instrumentierung (Server-Timing, Query-Statistik); ohne ENABLED wird die Middleware übersprungen
+REQUEST_INSTRUMENTATION = {
+    "ENABLED": os.getenv("INSTRUMENTATION_ENABLED", "False").lower() == "true",
+    "SERVER_TIMING": os.getenv("INSTRUMENTATION_SERVER_TIMING", "True").lower() == "true",
+    "SAMPLE_RATE": float(os.getenv("INSTRUMENTATION_SAMPLE_RATE", "0")),
+    "DUPLICATE_QUERY_THRESHOLD": int(os.getenv("INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD", "0")) or None,
+}
+
+# Antwort-Kompression (brotli, falls installiert, sonst gzip) ab MIN_SIZE Bytes; ohne ENABLED wird die Middleware übersprungen
+RESPONSE_COMPRESSION = {
+    "ENABLED": os.getenv("RESPONSE_COMPRESSION", "False").lower() == "true",
+    "MIN_SIZE": int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024")),
+    "BROTLI": os.getenv("RESPONSE_COMPRESSION_BROTLI", "True").lower() == "true",
+    "BROTLI_QUALITY": int(os.getenv("RESPONSE_COMPRESSION_BROTLI_QUALITY", "4")),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "kanmind": {"handlers": ["console"], "level": os.getenv("KANMIND_LOG_LEVEL", "INFO")},
+    },
+}
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -93,11 +201,37 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# Datenbank aus DB_* (ENGINE, NAME, USER, PASSWORD, HOST, PORT, CONN_MAX_AGE, CONN_HEALTH_CHECKS, POOL_MAX_SIZE);
+# ohne Angaben SQLite. DB_REPLICA_* (fehlende Werte von DB_*) aktiviert eine Read-Replica.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env("DB", default_name=BASE_DIR / 'db.sqlite3'),
+}
+if os.getenv("DB_REPLICA_NAME") or os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = database_from_env("DB_REPLICA", fallback_prefix="DB")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+
+# SQLite-Profil für Single-Node-Betrieb, gesetzt per connection_created (core.apps); Schreib-Transaktionen mit BEGIN IMMEDIATE
+SQLITE_TUNING = {
+    "ENABLED": os.getenv("SQLITE_TUNING", "True").lower() == "true",
+    "JOURNAL_MODE": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "SYNCHRONOUS": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "MMAP_SIZE": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "CACHE_SIZE": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),
+    "BUSY_TIMEOUT_MS": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "TEMP_STORE": "MEMORY",
+}
+for _database in DATABASES.values():
+    if SQLITE_TUNING["ENABLED"] and _database["ENGINE"].endswith("sqlite3"):
+        _database["OPTIONS"].setdefault("transaction_mode", "IMMEDIATE")
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
+# Lesende Requests auf die Replica; nach einem Schreibzugriff bleibt der Client STICKY_SECONDS auf der Primary
+DATABASE_ROUTING = {
+    "REPLICA_ALIAS": "replica" if "replica" in DATABASES else None,
+    "STICKY_SECONDS": int(os.getenv("DB_REPLICA_STICKY_SECONDS", "5")),
+    "STICKY_COOKIE": "kanmind_primary",
 }
 
 AUTH_PASSWORD_VALIDATORS = [
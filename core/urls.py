@@ -14,12 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
+# Async read views only pay off under ASGI (core/asgi.py); the sync DRF views stay the fallback
+async_api = [path("api/", include("kanban_app.api.async_urls"))] if settings.KANBAN_ASYNC_VIEWS else []
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    *async_api,
     path("api/", include("auth_app.api.urls")),
     path('api/', include('kanban_app.api.urls')),
     path('api-auth/', include('rest_framework.urls')),
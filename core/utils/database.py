@@ -0,0 +1,65 @@
+import os
+from django.conf import settings
+
+ENGINES = {
+    "sqlite": "django.db.backends.sqlite3",
+    "sqlite3": "django.db.backends.sqlite3",
+    "postgres": "django.db.backends.postgresql",
+    "postgresql": "django.db.backends.postgresql",
+    "mysql": "django.db.backends.mysql",
+}
+
+
+def _env(prefixes, name, default=None):
+    for prefix in prefixes:
+        value = os.getenv(f"{prefix}_{name}")
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def database_from_env(prefix="DB", fallback_prefix=None, default_name=None):
+    """Builds one DATABASES entry from PREFIX_* variables, falling back to FALLBACK_PREFIX_* (e.g. replica -> primary)"""
+    prefixes = [prefix] + ([fallback_prefix] if fallback_prefix else [])
+    engine = _env(prefixes, "ENGINE", "sqlite3")
+    engine = ENGINES.get(engine, engine)
+    config = {
+        "ENGINE": engine,
+        "NAME": _env(prefixes, "NAME", default_name),
+        "CONN_MAX_AGE": int(_env(prefixes, "CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": _env(prefixes, "CONN_HEALTH_CHECKS", "True").lower() == "true",
+        "OPTIONS": {},
+    }
+    if not engine.endswith("sqlite3"):
+        for key in ("USER", "PASSWORD", "HOST", "PORT"):
+            config[key] = _env(prefixes, key, "")
+
+    pool_size = int(_env(prefixes, "POOL_MAX_SIZE", "0"))
+    if pool_size and engine.endswith("postgresql"):
+        # psycopg3 pool (pip install "psycopg[pool]"); Django requires persistent connections off when pooling
+        config["OPTIONS"]["pool"] = {
+            "min_size": int(_env(prefixes, "POOL_MIN_SIZE", "1")),
+            "max_size": pool_size,
+            "timeout": float(_env(prefixes, "POOL_TIMEOUT", "10")),
+        }
+        config["CONN_MAX_AGE"] = 0
+    return config
+
+
+def apply_sqlite_tuning(sender, connection, **kwargs):
+    """connection_created hook: applies the SQLITE_TUNING pragmas to every new SQLite connection"""
+    config = getattr(settings, "SQLITE_TUNING", {})
+    if connection.vendor != "sqlite" or not config.get("ENABLED"):
+        return
+    pragmas = {
+        "journal_mode": config.get("JOURNAL_MODE"),
+        "synchronous": config.get("SYNCHRONOUS"),
+        "mmap_size": config.get("MMAP_SIZE"),
+        "cache_size": config.get("CACHE_SIZE"),
+        "busy_timeout": config.get("BUSY_TIMEOUT_MS"),
+        "temp_store": config.get("TEMP_STORE"),
+    }
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,56 @@
+"""Resolves the boards a user can access (owner or member) as an indexed id subquery"""
+from django.conf import settings
+from django.db.models import F
+from kanban_app.models import Board, BoardAccess
+
+
+def access_table_enabled():
+    return getattr(settings, "KANBAN_ACCESS_TABLE", False)
+
+
+def accessible_board_ids(user):
+    """Subquery of accessible board ids for board_id__in / pk__in filters.
+
+    Either the materialized access table (one index range on user) or a UNION ALL of the owner index
+    and the membership table, instead of an OR across a join plus DISTINCT. Boards pending deletion are left
+    out; their access rows are revoked when the deletion is queued.
+    """
+    if access_table_enabled():
+        return BoardAccess.objects.filter(user=user).values("board_id")
+    owned = Board.objects.filter(owner=user, deleting=False).values("id")
+    return owned.union(Board.members.through.objects.filter(user=user, board__deleting=False).values("board_id"), all=True)
+
+
+def accessible_boards(user):
+    return Board.objects.filter(pk__in=accessible_board_ids(user))
+
+
+def board_user_ids(board_id):
+    """Owner and member ids of a board from the access table"""
+    return frozenset(BoardAccess.objects.filter(board_id=board_id).values_list("user_id", flat=True))
+
+
+def grant_access(pairs):
+    """Adds (board_id, user_id) rows; existing rows are kept"""
+    rows = [BoardAccess(board_id=board_id, user_id=user_id) for board_id, user_id in pairs]
+    if rows:
+        BoardAccess.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def revoke_access(board_ids, user_ids):
+    """Removes member rows, except for the board owner"""
+    BoardAccess.objects.filter(board_id__in=board_ids, user_id__in=user_ids).exclude(user_id=F("board__owner_id")).delete()
+
+
+def rebuild_access(board_ids=None):
+    """Recomputes the access rows of the given boards (all boards if None), boards pending deletion get none;
+    returns the number of rows"""
+    boards = Board.objects.filter(deleting=False)
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+    stale = BoardAccess.objects.all() if board_ids is None else BoardAccess.objects.filter(board_id__in=board_ids)
+    stale.delete()
+    pairs = set(boards.values_list("id", "owner_id"))
+    pairs.update(Board.members.through.objects.filter(board__in=boards).values_list("board_id", "user_id"))
+    grant_access(pairs)
+    return len(pairs)
@@ -1,9 +1,14 @@
 from django import forms
 from django.contrib import admin
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.contrib import admin
 from django.forms.models import BaseInlineFormSet
-from kanban_app.models import Board, Task, Comment
+from kanban_app.jobs import enqueue
+from kanban_app.models import Board, Job, Task, Comment
+from kanban_app.membership import board_member_ids
+from kanban_app.api.querysets import annotate_board_counters, annotated_count
+from kanban_app.search import fts_available, matching_ids
 
 User = get_user_model()
 
@@ -25,7 +30,7 @@ class TaskAdminForm(forms.ModelForm):
         reviewer = cleaned.get("reviewer")
 
         if board:
-            allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+            allowed_ids = board_member_ids(board)
             if assignee and assignee.id not in allowed_ids:
                 self.add_error("assignee", "Assignee ist kein Mitglied/Owner dieses Boards.")
             if reviewer and reviewer.id not in allowed_ids:
@@ -46,19 +51,36 @@ class CommentAdminForm(forms.ModelForm):
         if task and author:
             board = getattr(task, "board", None)
             if board:
-                allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+                allowed_ids = board_member_ids(board)
                 if author.id not in allowed_ids:
                     self.add_error("author", "Autor ist kein Mitglied/Owner dieses Boards.")
         return cleaned
 
 
+class FullTextSearchMixin:
+    """Admin search through the FTS index; fts_related_fields search a related model's index,
+    fts_substring_fields are short user/board columns still matched as substrings like the default admin search"""
+    fts_related_fields = ()
+    fts_substring_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip() or not fts_available(self.model):
+            return super().get_search_results(request, queryset, search_term)
+        condition = Q(pk__in=matching_ids(self.model, search_term))
+        for field, model in self.fts_related_fields:
+            condition |= Q(**{f"{field}__in": matching_ids(model, search_term)})
+        for field in self.fts_substring_fields:
+            condition |= Q(**{f"{field}__icontains": search_term.strip()})
+        return queryset.filter(condition), False
+
+
 class TaskInlineFormSet(BaseInlineFormSet):
     def clean(self):
         super().clean()
         board = self.instance
         if not board:
             return
-        allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+        allowed_ids = board_member_ids(board)
 
         for form in self.forms:
             if not hasattr(form, "cleaned_data"):
@@ -83,7 +105,7 @@ class CommentInlineFormSet(BaseInlineFormSet):
         if not board:
             return
 
-        allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+        allowed_ids = board_member_ids(board)
         for form in self.forms:
             if not hasattr(form, "cleaned_data"):
                 continue
@@ -112,7 +134,7 @@ class TaskInline(admin.TabularInline):
             if board:
                 from django.contrib.auth import get_user_model
                 User = get_user_model()
-                allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+                allowed_ids = board_member_ids(board, request=request)
                 kwargs["queryset"] = User.objects.filter(id__in=allowed_ids)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
@@ -138,7 +160,7 @@ class CommentInline(admin.TabularInline):
             if task and getattr(task, "board", None):
                 User = get_user_model()
                 board = task.board
-                allowed_ids = set(board.members.values_list("id", flat=True)) | {board.owner_id}
+                allowed_ids = board_member_ids(board, request=request)
                 kwargs["queryset"] = User.objects.filter(id__in=allowed_ids)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
@@ -159,27 +181,49 @@ class BoardAdmin(admin.ModelAdmin):
     autocomplete_fields = ("owner", "members")
     filter_horizontal = ("members",)
     inlines = [TaskInline]
+    actions = ["rebuild_counters"]
+
+    def get_queryset(self, request):
+        return annotate_board_counters(super().get_queryset(request).select_related("owner"))
+
+    @admin.action(description="Zähler im Hintergrund neu berechnen")
+    def rebuild_counters(self, request, queryset):
+        job = enqueue("rebuild_board_stats", {"board_ids": list(queryset.values_list("pk", flat=True))}, user=request.user)
+        self.message_user(request, f"Job {job.pk} eingereiht.")
 
     def member_count(self, obj):
-        return obj.members.count()
+        return annotated_count(obj, "member_count", obj.members.all)
     member_count.short_description = "Mitglieder"
+    member_count.admin_order_field = "stats__member_count"
 
     def ticket_count(self, obj):
-        return obj.tasks.count()
+        return annotated_count(obj, "ticket_count", obj.tasks.all)
     ticket_count.short_description = "Tasks gesamt"
+    ticket_count.admin_order_field = "stats__task_count"
 
     def tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status="to-do").count()
+        return annotated_count(obj, "tasks_to_do_count", lambda: obj.tasks.filter(status="to-do"))
     tasks_to_do_count.short_description = "To Do"
+    tasks_to_do_count.admin_order_field = "stats__to_do_count"
 
     def tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(priority="high").count()
+        return annotated_count(obj, "tasks_high_prio_count", lambda: obj.tasks.filter(priority="high"))
     tasks_high_prio_count.short_description = "High Prio"
+    tasks_high_prio_count.admin_order_field = "stats__high_prio_count"
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "max_attempts", "created_by", "created_at", "finished_at")
+    list_filter = ("status", "name")
+    readonly_fields = [field.name for field in Job._meta.fields]
 
+    def has_add_permission(self, request):
+        return False
 
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(FullTextSearchMixin, admin.ModelAdmin):
     form = TaskAdminForm
     list_display = (
         "id",
@@ -202,6 +246,7 @@ class TaskAdmin(admin.ModelAdmin):
         "reviewer__username",
         "reviewer__email",
     )
+    fts_substring_fields = ("board__title", "assignee__username", "assignee__email", "reviewer__username", "reviewer__email")
     autocomplete_fields = ("board", "assignee", "reviewer")
     inlines = [CommentInline]
 
@@ -211,11 +256,13 @@ class TaskAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(FullTextSearchMixin, admin.ModelAdmin):
     form = CommentAdminForm
     list_display = ("id", "task", "author", "created_at", "short_content")
     list_filter = ("created_at", "author")
     search_fields = ("content", "task__title", "author__username", "author__email")
+    fts_related_fields = (("task", Task),)
+    fts_substring_fields = ("author__username", "author__email")
     readonly_fields = ("created_at",)
     autocomplete_fields = ("task", "author")
 
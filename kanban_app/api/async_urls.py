@@ -0,0 +1,13 @@
+"""Async read routes, included before kanban_app/api/urls.py when KANBAN_ASYNC_VIEWS is enabled"""
+from django.urls import path
+from kanban_app.api.async_views import AsyncBoardDetailView, AsyncBoardListView, AsyncCommentsListView, AsyncTasksAssignedView, AsyncTasksInvolvedView, AsyncTasksReviewingView
+
+
+urlpatterns = [
+    path("boards/", AsyncBoardListView.as_view(), name='board-list-create'),
+    path("boards/<int:pk>/", AsyncBoardDetailView.as_view(), name='board-detail'),
+    path("tasks/assigned-to-me/", AsyncTasksAssignedView.as_view(), name="tasks-assigned"),
+    path("tasks/reviewing/", AsyncTasksReviewingView.as_view(), name="tasks-reviewing"),
+    path("tasks/involved/", AsyncTasksInvolvedView.as_view(), name="tasks-involved"),
+    path('tasks/<int:task_id>/comments/', AsyncCommentsListView.as_view(), name='comments-list-create'),
+]
@@ -0,0 +1,145 @@
+"""Async read paths served under ASGI; anything they do not cover is handed to the sync DRF view"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.http import http_date
+from auth_app.api.authentication import aauthenticate_token
+from core.renderers import dumps
+from kanban_app.access import accessible_boards
+from kanban_app.api.filters import TASK_LIST_QUERY_PARAMS
+from kanban_app.api.pagination import pagination_setting
+from kanban_app.api.querysets import (
+    annotate_board_counters, assigned_tasks, board_members_queryset, board_task_rows,
+    involved_tasks, reviewing_tasks, task_comments,
+)
+from kanban_app.api.row_serializers import CommentRows, TaskRows, board_detail
+from kanban_app.api.serializers import BoardListSerializer
+from kanban_app.api.views import (
+    BoardDetailView, BoardListCreateView, CommentsListCreateView,
+    TasksAssignedToMeView, TasksInvolvedView, TasksReviewedByMeView,
+)
+from kanban_app.board_cache import board_cache_enabled, get_board_detail, set_board_detail
+from kanban_app.membership import is_board_member
+from kanban_app.models import Task
+from kanban_app.revisions import board_etag
+
+
+class AsyncReadView(View):
+    """GET with token auth on the async ORM; other methods, query options and error responses use sync_view_class"""
+    sync_view_class = None
+    fallback_query_params = ("cursor", "page_size", "stream")
+    fallback_headers = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+    view_is_async = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    @classmethod
+    def sync_view(cls):
+        if "_sync_view" not in cls.__dict__:
+            cls._sync_view = cls.sync_view_class.as_view()
+        return cls._sync_view
+
+    def use_async(self, request):
+        return (
+            request.method == "GET"
+            and not self.paginates()
+            and not any(param in request.GET for param in self.fallback_query_params)
+            and not any(header in request.META for header in self.fallback_headers)
+        )
+
+    def paginates(self):
+        """Pagination envelopes are only produced by the sync views"""
+        return getattr(self.sync_view_class, "pagination_class", None) is not None and pagination_setting("ALWAYS", False)
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.use_async(request):
+            user, _ = await aauthenticate_token(request)
+            if user is not None:
+                response = await self.get_response(request, user, *args, **kwargs)
+                if response is not None:
+                    return response
+        return await sync_to_async(self.sync_view())(request, *args, **kwargs)
+
+    async def get_response(self, request, user, *args, **kwargs):
+        """Returns a response, or None to let the sync view answer (404/403 and other edge cases)"""
+        raise NotImplementedError
+
+    def render(self, data):
+        return HttpResponse(dumps(data), content_type="application/json")
+
+
+BOARD_COUNTERS = ("member_count", "ticket_count", "tasks_to_do_count", "tasks_high_prio_count")
+
+
+class AsyncBoardListView(AsyncReadView):
+    sync_view_class = BoardListCreateView
+
+    async def get_response(self, request, user):
+        boards = [board async for board in annotate_board_counters(accessible_boards(user)).order_by("id")]
+        if any(getattr(board, name) is None for board in boards for name in BOARD_COUNTERS):
+            # a board without stats row would be counted with sync queries by the serializer
+            return None
+        return self.render(BoardListSerializer(boards, many=True).data)
+
+
+class AsyncBoardDetailView(AsyncReadView):
+    sync_view_class = BoardDetailView
+
+    async def get_response(self, request, user, pk):
+        board = await board_members_queryset().filter(pk=pk, deleting=False).afirst()
+        if board is None or (board.owner_id != user.id and all(member.id != user.id for member in board.members.all())):
+            return None
+        content = await sync_to_async(get_board_detail)(board.pk, board.revision) if board_cache_enabled() else None
+        if content is None:
+            serializer = TaskRows()
+            rows = [row async for row in board_task_rows(board.pk, serializer)]
+            content = dumps(board_detail(board, rows, serializer))
+            if board_cache_enabled():
+                await sync_to_async(set_board_detail)(board.pk, board.revision, content)
+        response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = board_etag("board", board.pk, board.revision)
+        response["Last-Modified"] = http_date(board.updated_at.timestamp())
+        return response
+
+
+class AsyncTaskListView(AsyncReadView):
+    tasks = None
+    fallback_query_params = (*AsyncReadView.fallback_query_params, *TASK_LIST_QUERY_PARAMS)
+
+    async def get_response(self, request, user):
+        serializer = TaskRows()
+        rows = [row async for row in serializer.rows(self.tasks(user).order_by("id"))]
+        return self.render(serializer.many(rows))
+
+
+class AsyncTasksAssignedView(AsyncTaskListView):
+    sync_view_class = TasksAssignedToMeView
+    tasks = staticmethod(assigned_tasks)
+
+
+class AsyncTasksReviewingView(AsyncTaskListView):
+    sync_view_class = TasksReviewedByMeView
+    tasks = staticmethod(reviewing_tasks)
+
+
+class AsyncTasksInvolvedView(AsyncTaskListView):
+    sync_view_class = TasksInvolvedView
+    tasks = staticmethod(involved_tasks)
+
+
+class AsyncCommentsListView(AsyncReadView):
+    sync_view_class = CommentsListCreateView
+
+    async def get_response(self, request, user, task_id):
+        state = await Task.objects.filter(pk=task_id).values("board_id", "board__revision", "board__updated_at").afirst()
+        if state is None or not await sync_to_async(is_board_member)(state["board_id"], user):
+            return None
+        serializer = CommentRows()
+        rows = [row async for row in serializer.rows(task_comments(task_id))]
+        response = self.render(serializer.many(rows))
+        response["ETag"] = board_etag("comments", task_id, state["board__revision"])
+        response["Last-Modified"] = http_date(state["board__updated_at"].timestamp())
+        return response
@@ -0,0 +1,145 @@
+"""Bulk create/update of tasks with a fixed number of queries per request"""
+from collections import defaultdict
+from django.db import transaction
+from rest_framework import status
+from kanban_app import revisions, stats
+from kanban_app.api.querysets import task_queryset
+from kanban_app.api.serializers import TaskBulkItemSerializer, TaskSerializer
+from kanban_app.membership import board_member_ids_many
+from kanban_app.models import BoardChange, Task
+
+MEMBER_FIELDS = {"assignee_id": "Assignee ist kein Mitglied dieses Boards.", "reviewer_id": "Reviewer ist kein Mitglied dieses Boards."}
+
+
+def _error(code, errors):
+    return {"status": code, "errors": errors}
+
+
+class TaskBulkWriter:
+    """Validates all items, checks board membership once per board and writes with bulk_create/bulk_update"""
+
+    def __init__(self, request, items, atomic=True):
+        self.request = request
+        self.items = items
+        self.atomic = atomic
+        self.results = [None] * len(items)
+
+    def run(self):
+        """Returns (results, written); nothing is written in atomic mode if any item fails"""
+        validated = self._validate_fields()
+        existing = Task.objects.in_bulk([attrs["id"] for _, attrs in validated if "id" in attrs])
+        board_ids = {attrs.get("board") for _, attrs in validated} | {task.board_id for task in existing.values()}
+        members = board_member_ids_many([board_id for board_id in board_ids if board_id is not None], request=self.request)
+
+        creates, updates = [], {}
+        for index, attrs in validated:
+            task = self._prepare(index, attrs, existing, members)
+            if task is None:
+                continue
+            if task.pk is None:
+                creates.append((index, task))
+            else:
+                updates[task.pk] = task
+                self.results[index] = task.pk
+
+        failed = any(result is not None and not isinstance(result, int) for result in self.results)
+        if failed and self.atomic:
+            skipped = _error(status.HTTP_424_FAILED_DEPENDENCY, {"non_field_errors": ["Nicht ausgeführt, da andere Elemente ungültig sind."]})
+            self.results = [result if isinstance(result, dict) else skipped for result in self.results]
+            return self.results, False
+
+        self._write([task for _, task in creates], list(updates.values()))
+        self._serialize(creates)
+        return self.results, True
+
+    def _validate_fields(self):
+        validated = []
+        for index, item in enumerate(self.items):
+            if not isinstance(item, dict):
+                self.results[index] = _error(status.HTTP_400_BAD_REQUEST, {"non_field_errors": ["Jedes Element muss ein Objekt sein."]})
+                continue
+            serializer = TaskBulkItemSerializer(data=item, partial="id" in item)
+            if not serializer.is_valid():
+                self.results[index] = _error(status.HTTP_400_BAD_REQUEST, serializer.errors)
+                continue
+            attrs = dict(serializer.validated_data)
+            if "id" not in attrs and "board" not in attrs:
+                self.results[index] = _error(status.HTTP_400_BAD_REQUEST, {"board": ["Dieses Feld wird benötigt."]})
+                continue
+            validated.append((index, attrs))
+        return validated
+
+    def _prepare(self, index, attrs, existing, members):
+        """Applies one item to a task instance, or records its error and returns None"""
+        user_id = self.request.user.id
+        task_id = attrs.pop("id", None)
+        if task_id is None:
+            task = Task()
+        else:
+            task = existing.get(task_id)
+            if task is None:
+                self.results[index] = _error(status.HTTP_404_NOT_FOUND, {"detail": "Task nicht gefunden."})
+                return None
+            if user_id not in members.get(task.board_id, ()):
+                self.results[index] = _error(status.HTTP_403_FORBIDDEN, {"detail": "Kein Zugriff auf dieses Board."})
+                return None
+
+        board_id = attrs.pop("board", task.board_id if task_id else None)
+        allowed = members.get(board_id)
+        if allowed is None:
+            self.results[index] = _error(status.HTTP_404_NOT_FOUND, {"board": ["Board nicht gefunden."]})
+            return None
+        if user_id not in allowed:
+            self.results[index] = _error(status.HTTP_403_FORBIDDEN, {"detail": "Kein Zugriff auf dieses Board."})
+            return None
+
+        errors = {
+            field: [message] for field, message in MEMBER_FIELDS.items()
+            if attrs.get(field) is not None and attrs[field] not in allowed
+        }
+        if errors:
+            self.results[index] = _error(status.HTTP_400_BAD_REQUEST, errors)
+            return None
+
+        task.board_id = board_id
+        for field, value in attrs.items():
+            setattr(task, field, value)
+        task._bulk_fields = getattr(task, "_bulk_fields", set()) | {"board_id", *attrs}
+        return task
+
+    def _write(self, created, updated):
+        """Bulk writes bypass signals, so counters and the change log are updated here"""
+        old_boards = {task.pk: task._loaded_counter_state[0] for task in updated}
+        by_fields = defaultdict(list)
+        for task in updated:
+            by_fields[frozenset(task._bulk_fields)].append(task)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(created)
+            for fields, tasks in by_fields.items():
+                Task.objects.bulk_update(tasks, sorted(fields))
+
+            stats.apply_task_changes(
+                [(None, task.counter_state()) for task in created]
+                + [(task._loaded_counter_state, task.counter_state()) for task in updated]
+            )
+            changes = [(task.board_id, BoardChange.ENTITY_TASK, task.pk, BoardChange.ACTION_UPSERT) for task in created + updated]
+            changes += [
+                (old_boards[task.pk], BoardChange.ENTITY_TASK, task.pk, BoardChange.ACTION_DELETE)
+                for task in updated if old_boards[task.pk] != task.board_id
+            ]
+            revisions.record_changes(changes)
+
+        for task in updated:
+            task._loaded_counter_state = task.counter_state()
+
+    def _serialize(self, creates):
+        for index, task in creates:
+            self.results[index] = task.pk
+        created_indexes = {index for index, _ in creates}
+        written = [result for result in self.results if isinstance(result, int)]
+        tasks = task_queryset().in_bulk(written)
+        for index, result in enumerate(self.results):
+            if isinstance(result, int):
+                code = status.HTTP_201_CREATED if index in created_indexes else status.HTTP_200_OK
+                self.results[index] = {"status": code, "data": TaskSerializer(tasks[result]).data}
@@ -0,0 +1,65 @@
+"""Server-sent events per board; needs the ASGI application (core/asgi.py) to keep connections open"""
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from auth_app.api.authentication import aauthenticate_token
+from kanban_app.events import board_channel, events_setting, get_broker
+from kanban_app.membership import is_board_member
+from kanban_app.models import Board
+
+
+def _authorize(user, board_id):
+    """Returns (status, error message) for the user's access to the board"""
+    if not Board.objects.filter(pk=board_id, deleting=False).exists():
+        return 404, "Board nicht gefunden."
+    if not is_board_member(board_id, user):
+        return 403, "Kein Zugriff auf dieses Board."
+    return 200, None
+
+
+def format_event(event):
+    return f"event: {event['entity']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def board_event_stream(subscription, heartbeat):
+    """Yields SSE frames until the client disconnects; a slow client gets a resync event and is dropped"""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield format_event(event)
+    finally:
+        subscription.close()
+
+
+async def board_events(request, pk):
+    """GET /api/boards/<pk>/events/: task, comment, member and board changes as they are committed"""
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Server-Sent Events benötigen den ASGI-Server (core.asgi)."}, status=501)
+    user, message = await aauthenticate_token(request, allow_query_param=True)
+    if user is None:
+        return JsonResponse({"error": message}, status=401)
+    status_code, message = await sync_to_async(_authorize)(user, pk)
+    if status_code != 200:
+        return JsonResponse({"error": message}, status=status_code)
+
+    broker = get_broker()
+    if broker.subscriber_count() >= events_setting("MAX_SUBSCRIBERS", 10000):
+        return JsonResponse({"error": "Zu viele offene Verbindungen."}, status=503)
+
+    subscription = broker.subscribe(board_channel(pk))
+    response = StreamingHttpResponse(
+        board_event_stream(subscription, events_setting("HEARTBEAT", 15)), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
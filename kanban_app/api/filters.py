@@ -0,0 +1,118 @@
+"""Query-parameter filters, ordering and sparse fieldsets for the task list endpoints"""
+from datetime import date
+from django.db.models import Case, DateField, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from kanban_app.models import Task
+
+TASK_LIST_FIELDS = ("id", "board", "title", "description", "status", "priority", "assignee", "reviewer", "due_date", "comments_count")
+TASK_ORDERING_FIELDS = ("id", "title", "status", "priority", "due_date")
+TASK_LIST_QUERY_PARAMS = ("status", "priority", "board", "due_after", "due_before", "overdue", "ordering", "fields")
+
+
+def _csv(request, name):
+    return [value.strip() for value in request.query_params.get(name, "").split(",") if value.strip()]
+
+
+def _choices(request, name, choices):
+    values = _csv(request, name)
+    allowed = {value for value, _ in choices}
+    invalid = [value for value in values if value not in allowed]
+    if invalid:
+        raise ValidationError({name: [f"Ungültiger Wert: {', '.join(invalid)}. Erlaubt: {', '.join(sorted(allowed))}."]})
+    return values
+
+
+def _date(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: ["Datum im Format JJJJ-MM-TT erwartet."]})
+
+
+def requested_fields(request):
+    """Field names from ?fields=, None when the full representation is wanted"""
+    fields = _csv(request, "fields")
+    if not fields:
+        return None
+    invalid = [name for name in fields if name not in TASK_LIST_FIELDS]
+    if invalid:
+        raise ValidationError({"fields": [f"Unbekannte Felder: {', '.join(invalid)}."]})
+    return tuple(dict.fromkeys(fields))
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """?status=, ?priority=, ?board= (comma-separated), ?due_after=/?due_before= (inclusive) and ?overdue=true"""
+
+    def filter_queryset(self, request, queryset, view):
+        statuses = _choices(request, "status", Task.STATUS_CHOICES)
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        priorities = _choices(request, "priority", Task.PRIORITY_CHOICES)
+        if priorities:
+            queryset = queryset.filter(priority__in=priorities)
+        boards = _csv(request, "board")
+        if boards:
+            if not all(board.isdigit() for board in boards):
+                raise ValidationError({"board": ["Board-IDs müssen Ganzzahlen sein."]})
+            queryset = queryset.filter(board_id__in=[int(board) for board in boards])
+        due_after, due_before = _date(request, "due_after"), _date(request, "due_before")
+        if due_after:
+            queryset = queryset.filter(due_date__gte=due_after)
+        if due_before:
+            queryset = queryset.filter(due_date__lte=due_before)
+        overdue = request.query_params.get("overdue", "").lower()
+        if overdue in ("1", "true", "yes"):
+            queryset = queryset.filter(due_date__lt=timezone.localdate()).exclude(status="done")
+        elif overdue in ("0", "false", "no"):
+            queryset = queryset.exclude(due_date__lt=timezone.localdate(), status__in=["to-do", "in-progress", "review"])
+        return queryset
+
+
+def _rank(name, choices):
+    return Case(*(When(**{name: value}, then=Value(position)) for position, (value, _) in enumerate(choices)), output_field=IntegerField())
+
+
+# Choice fields sort by workflow position (low < medium < high) and tasks without due date last;
+# the cursor pagination needs non-null sort keys
+SORT_KEYS = {
+    "status": lambda: _rank("status", Task.STATUS_CHOICES),
+    "priority": lambda: _rank("priority", Task.PRIORITY_CHOICES),
+    "due_date": lambda: Coalesce("due_date", Value(date.max), output_field=DateField()),
+}
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """?ordering=due_date,-priority; id is appended as tie-breaker so pages stay stable"""
+    ordering_fields = TASK_ORDERING_FIELDS
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [f"{term}_sort" if term.lstrip("-") in SORT_KEYS else term for term in ordering]
+        if not any(term.lstrip("-") == "id" for term in ordering):
+            ordering.append("id")
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        names = {term.lstrip("-") for term in ordering}
+        keys = {f"{name}_sort": key() for name, key in SORT_KEYS.items() if f"{name}_sort" in names}
+        return queryset.annotate(**keys).order_by(*ordering)
+
+    def get_default_ordering(self, view):
+        return None
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        if len(valid) != len(fields):
+            raise ValidationError({self.ordering_param: [f"Erlaubt: {', '.join(TASK_ORDERING_FIELDS)} (mit - absteigend)."]})
+        return valid
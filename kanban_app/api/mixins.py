@@ -1,10 +1,126 @@
-from kanban_app.models import Board
+import hashlib
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from core.renderers import dumps
+from kanban_app.api.filters import TaskFilterBackend, TaskOrderingFilter, requested_fields
+from kanban_app.api.pagination import pagination_setting
+from kanban_app.api.row_serializers import RowListSerializer, TaskRows
+from kanban_app.access import accessible_boards
+from kanban_app.membership import is_board_member
+from kanban_app.revisions import board_etag
 
 
 class UserBoardsQuerysetMixin:
     """Mixin for checking if user is owner or member of a specific board"""
     def get_queryset(self):
-        account = self.request.user
-        owned = Board.objects.filter(owner=account)
-        member = Board.objects.filter(members=account)
-        return (owned | member).distinct()
\ No newline at end of file
+        return accessible_boards(self.request.user)
+
+
+class StreamingListMixin:
+    """Opt-in streaming JSON list (?stream=true), built from a chunked iterator"""
+    stream_query_param = "stream"
+
+    def wants_stream(self, request):
+        return request.query_params.get(self.stream_query_param, "").lower() in ("1", "true", "yes")
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self.pagination_class, "ordering", None)
+        if ordering and not queryset.query.order_by:
+            queryset = queryset.order_by(*ordering)
+        response = StreamingHttpResponse(self.stream_json(queryset), content_type="application/json")
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def stream_json(self, queryset):
+        """Yields a JSON array, serializing one chunk of rows at a time"""
+        chunk_size = pagination_setting("STREAM_CHUNK_SIZE", 500)
+        first = True
+        chunk = []
+        yield b"["
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                yield self._encode_chunk(chunk, first)
+                first = False
+                chunk = []
+        if chunk:
+            yield self._encode_chunk(chunk, first)
+        yield b"]"
+
+    def _encode_chunk(self, chunk, first):
+        body = dumps(self.get_serializer(chunk, many=True).data)[1:-1]
+        return body if first else b"," + body
+
+
+class TaskListQueryMixin:
+    """Filters, ?ordering= and sparse fieldsets (?fields=id,title) for task lists, serialized from value rows;
+    get_task_queryset(user, fields) builds the base queryset"""
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+
+    def get_task_queryset(self, user, fields):
+        raise NotImplementedError
+
+    def get_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = requested_fields(self.request)
+        return self._requested_fields
+
+    def get_row_serializer(self):
+        if not hasattr(self, "_row_serializer"):
+            self._row_serializer = TaskRows(fields=self.get_fields())
+        return self._row_serializer
+
+    def get_queryset(self):
+        return self.get_task_queryset(self.request.user, self.get_fields())
+
+    def filter_queryset(self, queryset):
+        """Filtered, ordered rows; the ordering keys are selected too, the cursor position is read from them"""
+        queryset = super().filter_queryset(queryset)
+        ordering = TaskOrderingFilter().get_ordering(self.request, queryset, self) or getattr(self.pagination_class, "ordering", ())
+        return self.get_row_serializer().rows(queryset, *(term.lstrip("-") for term in ordering))
+
+    def get_serializer(self, rows, **kwargs):
+        return RowListSerializer(self.get_row_serializer(), rows)
+
+
+class BoardRevisionConditionalMixin:
+    """ETag/Last-Modified from the board revision; conditional GETs are answered before the heavy queryset"""
+    etag_kind = None
+
+    def get_board_state(self):
+        """Cheap lookup returning {"pk", "board_id", "revision", "updated_at"} or None"""
+        raise NotImplementedError
+
+    def get_loaded_board_state(self):
+        """Board state taken from the object the view already loaded, if any"""
+        return None
+
+    def get_etag(self, state):
+        query = self.request.META.get("QUERY_STRING", "")
+        variant = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()[:8] if query else ""
+        return board_etag(self.etag_kind, state["pk"], state["revision"], variant)
+
+    def get(self, request, *args, **kwargs):
+        state = None
+        if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+            state = self.get_board_state()
+            if state is not None and is_board_member(state["board_id"], request.user, request=request):
+                etag = self.get_etag(state)
+                not_modified = get_conditional_response(
+                    request, etag=etag, last_modified=int(state["updated_at"].timestamp())
+                )
+                if not_modified is not None:
+                    not_modified["ETag"] = etag
+                    return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            state = self.get_loaded_board_state() or state or self.get_board_state()
+            if state is not None:
+                response["ETag"] = self.get_etag(state)
+                response["Last-Modified"] = http_date(state["updated_at"].timestamp())
+        return response
@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination for the list endpoints"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+def pagination_setting(name, default):
+    """Reads a value from KANBAN_PAGINATION in settings"""
+    return getattr(settings, "KANBAN_PAGINATION", {}).get(name, default)
+
+
+class KanbanCursorPagination(CursorPagination):
+    """Cursor pagination on a stable ordering, active when requested or enforced in settings"""
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    def __init__(self):
+        self.page_size = pagination_setting("PAGE_SIZE", 50)
+        self.max_page_size = pagination_setting("MAX_PAGE_SIZE", 500)
+
+    def is_requested(self, request):
+        params = request.query_params
+        return (
+            pagination_setting("ALWAYS", False)
+            or self.cursor_query_param in params
+            or self.page_size_query_param in params
+        )
+
+    def get_ordering(self, request, queryset, view):
+        """?ordering= from the view's ordering filter if given, otherwise the stable default"""
+        for backend in getattr(view, "filter_backends", ()):
+            if hasattr(backend, "get_ordering"):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return tuple(ordering)
+        return self.ordering
+
+    def get_page_size(self, request):
+        """Unpaginated list (as before) unless the client asks for a page"""
+        if not self.is_requested(request):
+            return None
+        return super().get_page_size(request)
+
+
+class BoardCursorPagination(KanbanCursorPagination):
+    ordering = ("id",)
+
+
+class TaskCursorPagination(KanbanCursorPagination):
+    ordering = ("id",)
+
+
+class CommentCursorPagination(KanbanCursorPagination):
+    ordering = ("created_at", "id")
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from kanban_app.membership import is_board_member
 
 class IsBoardOwnerOrMember(BasePermission):
     """Allows access only for owner or members"""
@@ -14,18 +15,16 @@ class IsBoardOwnerOrMember(BasePermission):
         if not request.user or not request.user.is_authenticated:
             raise NotAuthenticated("Anmeldung erforderlich.")
 
-        if hasattr(obj, "owner") and hasattr(obj, "members"):
+        if hasattr(obj, "owner_id") and hasattr(obj, "members"):
             board = obj
-        elif hasattr(obj, "board"):
-            board = obj.board
-        elif hasattr(obj, "task") and hasattr(obj.task, "board"):
-            board = obj.task.board
+        elif hasattr(obj, "board_id"):
+            board = obj.board_id
+        elif hasattr(obj, "task") and hasattr(obj.task, "board_id"):
+            board = obj.task.board_id
         else:
             raise PermissionDenied(self.message)
 
-        is_owner = board.owner_id == request.user.id
-        is_member = board.members.filter(id=request.user.id).exists()
-        if is_owner or is_member:
+        if is_board_member(board, request.user, request=request):
             return True
         
         raise PermissionDenied(self.message)
\ No newline at end of file
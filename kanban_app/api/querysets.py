@@ -0,0 +1,81 @@
+"""Shared queryset builders for the kanban API"""
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Prefetch, Q
+from kanban_app.access import accessible_board_ids
+from kanban_app.models import Board, Comment, Task
+
+
+def annotate_board_counters(queryset):
+    """Adds the list counters to a board queryset, read from BoardStats without aggregation"""
+    return queryset.annotate(
+        member_count=F("stats__member_count"),
+        ticket_count=F("stats__task_count"),
+        tasks_to_do_count=F("stats__to_do_count"),
+        tasks_high_prio_count=F("stats__high_prio_count"),
+    )
+
+
+def annotated_count(obj, name, fallback_queryset):
+    """Returns a counter annotated by the queryset, counts per row only if missing"""
+    val = getattr(obj, name, None)
+    if val is not None:
+        return val
+    return fallback_queryset().count()
+
+
+USER_SHORT_COLUMNS = ("id", "email", "first_name", "last_name")
+
+
+def task_queryset(queryset=None, fields=None):
+    """Tasks with assignee/reviewer joined and the comment count annotated as comments_count;
+    fields (a sparse fieldset) limits columns, joins and the aggregate to what is serialized"""
+    if queryset is None:
+        queryset = Task.objects.all()
+    if fields is None:
+        return queryset.select_related("assignee", "reviewer").annotate(comments_count=Count("comments"))
+    users = [name for name in ("assignee", "reviewer") if name in fields]
+    columns = ["id", *(name for name in fields if name not in ("comments_count", *users))]
+    for name in users:
+        columns += [name, *(f"{name}__{column}" for column in USER_SHORT_COLUMNS)]
+    queryset = queryset.only(*columns)
+    if users:
+        queryset = queryset.select_related(*users)
+    if "comments_count" in fields:
+        queryset = queryset.annotate(comments_count=Count("comments"))
+    return queryset
+
+
+def board_members_queryset():
+    """Boards with their members (UserShortSerializer columns only); tasks are read separately as rows"""
+    members = User.objects.only(*USER_SHORT_COLUMNS)
+    return Board.objects.only("id", "title", "owner_id", "revision", "updated_at").prefetch_related(Prefetch("members", queryset=members))
+
+
+def board_task_rows(board_id, serializer):
+    """Task rows of a board in the layout of the given row serializer"""
+    return serializer.rows(task_queryset(Task.objects.filter(board_id=board_id)).order_by("id"))
+
+
+def board_detail_queryset():
+    """Boards with owner, members and tasks loaded for the detail representation"""
+    return (
+        Board.objects.select_related("owner")
+        .prefetch_related("members")
+        .prefetch_related(Prefetch("tasks", queryset=task_queryset()))
+    )
+
+
+def assigned_tasks(user, fields=None):
+    return task_queryset(Task.objects.filter(board_id__in=accessible_board_ids(user), assignee=user), fields)
+
+
+def reviewing_tasks(user, fields=None):
+    return task_queryset(Task.objects.filter(board_id__in=accessible_board_ids(user), reviewer=user), fields)
+
+
+def involved_tasks(user, fields=None):
+    return task_queryset(Task.objects.filter(board_id__in=accessible_board_ids(user)).filter(Q(assignee=user) | Q(reviewer=user)), fields)
+
+
+def task_comments(task_id):
+    return Comment.objects.filter(task_id=task_id).select_related("author").order_by("created_at")
@@ -0,0 +1,120 @@
+"""Read-only serializers over value rows with the same JSON shape as TaskSerializer, UserShortSerializer and CommentSerializer.
+
+Fields are compiled once into accessors on .values() dicts keyed by column,
+so no model instances, field introspection or per-object method dispatch are involved.
+"""
+from operator import itemgetter
+from rest_framework import serializers
+from kanban_app.api.querysets import USER_SHORT_COLUMNS
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _date(value):
+    return value.isoformat() if value is not None else None
+
+
+def _datetime(value):
+    return _datetime_field.to_representation(value)
+
+
+def _user_short(pk, email, first_name, last_name):
+    if pk is None:
+        return None
+    return {"id": pk, "email": email, "fullname": f"{first_name} {last_name}".strip()}
+
+
+def _author(first_name, last_name, username, email):
+    return f"{first_name} {last_name}".strip() or username or email
+
+
+class RowField:
+    """Output key, the columns it is read from and an optional converter called with those values"""
+    def __init__(self, key, *columns, convert=None):
+        self.key = key
+        self.columns = columns or (key,)
+        self.convert = convert
+
+
+def user_short_field(key, prefix=""):
+    """Nested UserShortSerializer from the USER_SHORT_COLUMNS under prefix"""
+    return RowField(key, *(f"{prefix}{column}" for column in USER_SHORT_COLUMNS), convert=_user_short)
+
+
+class RowSerializer:
+    """Compiles the fields (optionally a sparse subset) into accessors for one row layout"""
+    fields = ()
+
+    def __init__(self, fields=None):
+        selected = [field for field in self.fields if fields is None or field.key in fields]
+        self.columns = tuple(dict.fromkeys(column for field in selected for column in field.columns))
+        self._accessors = [(field.key, self._compile(field)) for field in selected]
+
+    @staticmethod
+    def _compile(field):
+        keys = list(field.columns)
+        convert = field.convert
+        if convert is None:
+            return itemgetter(keys[0])
+        if len(keys) == 1:
+            key = keys[0]
+            return lambda row: convert(row[key])
+        getter = itemgetter(*keys)
+        return lambda row: convert(*getter(row))
+
+    def rows(self, queryset, *extra):
+        """The queryset as value rows with this serializer's columns plus extra ones (e.g. ordering keys)"""
+        return queryset.values(*self.columns, *(column for column in extra if column not in self.columns))
+
+    def to_representation(self, row):
+        return {key: get(row) for key, get in self._accessors}
+
+    def many(self, rows):
+        accessors = self._accessors
+        return [{key: get(row) for key, get in accessors} for row in rows]
+
+
+class RowListSerializer:
+    """Stand-in for a DRF list serializer so generic views, pagination and streaming can use a RowSerializer"""
+    def __init__(self, serializer, rows):
+        self.serializer = serializer
+        self.rows = rows
+
+    @property
+    def data(self):
+        return self.serializer.many(self.rows)
+
+
+class TaskRows(RowSerializer):
+    fields = (
+        RowField("id"),
+        RowField("board", "board_id"),
+        RowField("title"),
+        RowField("description"),
+        RowField("status"),
+        RowField("priority"),
+        user_short_field("assignee", "assignee__"),
+        user_short_field("reviewer", "reviewer__"),
+        RowField("due_date", convert=_date),
+        RowField("comments_count"),
+    )
+
+
+class CommentRows(RowSerializer):
+    fields = (
+        RowField("id"),
+        RowField("created_at", convert=_datetime),
+        RowField("author", "author__first_name", "author__last_name", "author__username", "author__email", convert=_author),
+        RowField("content"),
+    )
+
+
+def board_detail(board, task_rows, task_serializer):
+    """BoardDetailSerializer shape from a board with prefetched members and its task rows"""
+    return {
+        "id": board.pk,
+        "title": board.title,
+        "owner_id": board.owner_id,
+        "members": [_user_short(user.pk, user.email, user.first_name, user.last_name) for user in board.members.all()],
+        "tasks": task_serializer.many(task_rows),
+    }
@@ -1,7 +1,9 @@
 from django.contrib.auth.models import User
 from django.db.models.functions import Coalesce
 from rest_framework import serializers
-from kanban_app.models import Board, Task, Comment
+from kanban_app.models import Board, Job, Task, Comment
+from kanban_app.membership import board_member_ids
+from kanban_app.api.querysets import annotated_count
 
 
 class UserMiniSerializer(serializers.ModelSerializer):
@@ -21,7 +23,7 @@ class UserShortSerializer(serializers.ModelSerializer):
 
 
 class TaskSerializer(serializers.ModelSerializer):
-    board = serializers.ReadOnlyField(source="board.id")
+    board = serializers.ReadOnlyField(source="board_id")
     assignee = UserShortSerializer(read_only=True, allow_null=True)
     reviewer = UserShortSerializer(read_only=True, allow_null=True)
     comments_count = serializers.SerializerMethodField()
@@ -69,7 +71,7 @@ class TaskInBoardSerializer(serializers.ModelSerializer):
         
 class TaskWriteSerializer(serializers.ModelSerializer):
     """Serializes and validates new and updated task"""
-    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all())
+    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.filter(deleting=False))
     assignee_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     reviewer_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
@@ -78,40 +80,42 @@ class TaskWriteSerializer(serializers.ModelSerializer):
         fields = ["id", "board", "title", "description", "status", "priority",
                   "assignee_id", "reviewer_id", "due_date"]
 
-    def _get_allowed_user_ids(self, board: Board):
-        return list(board.members.values_list("id", flat=True)) + [board.owner_id]
+    def _get_allowed_user_ids(self, board):
+        return board_member_ids(board, request=self.context.get("request"))
+
+    def _resolve_users(self, user_ids):
+        """Users by id in one query, reusing assignee/reviewer already loaded on the instance"""
+        users = {}
+        for descriptor in (Task.assignee, Task.reviewer):
+            if self.instance is not None and descriptor.is_cached(self.instance):
+                user = getattr(self.instance, descriptor.field.name)
+                if user is not None:
+                    users[user.pk] = user
+        missing = set(user_ids) - set(users)
+        if missing:
+            users.update(User.objects.in_bulk(missing))
+        return users
 
     def validate(self, attrs):
-        board = attrs.get("board") or getattr(self.instance, "board", None)
-        if board is None:
+        board = attrs.get("board")
+        board_id = board.pk if board is not None else getattr(self.instance, "board_id", None)
+        if board_id is None:
             raise serializers.ValidationError({"board": "Dieses Feld wird benötigt."})
 
-        allowed = set(self._get_allowed_user_ids(board))
-
-        assignee_id = attrs.pop("assignee_id", serializers.empty)
-        reviewer_id = attrs.pop("reviewer_id", serializers.empty)
+        allowed = set(self._get_allowed_user_ids(board or board_id))
+        requested = {name: attrs.pop(f"{name}_id", serializers.empty) for name in ("assignee", "reviewer")}
 
         errors = {}
-
-        if assignee_id is not serializers.empty:
-            if assignee_id is None:
-                attrs["assignee"] = None
-            elif assignee_id not in allowed:
-                errors["assignee_id"] = "Assignee ist kein Mitglied dieses Boards."
-            else:
-                attrs["assignee"] = User.objects.filter(id=assignee_id).first()
-
-        if reviewer_id is not serializers.empty:
-            if reviewer_id is None:
-                attrs["reviewer"] = None
-            elif reviewer_id not in allowed:
-                errors["reviewer_id"] = "Reviewer ist kein Mitglied dieses Boards."
-            else:
-                attrs["reviewer"] = User.objects.filter(id=reviewer_id).first()
-
+        for name, user_id in requested.items():
+            if user_id not in (serializers.empty, None) and user_id not in allowed:
+                errors[f"{name}_id"] = f"{name.capitalize()} ist kein Mitglied dieses Boards."
         if errors:
             raise serializers.ValidationError(errors)
 
+        users = self._resolve_users(user_id for user_id in requested.values() if user_id not in (serializers.empty, None))
+        for name, user_id in requested.items():
+            if user_id is not serializers.empty:
+                attrs[name] = None if user_id is None else users.get(user_id)
         return attrs
 
     def create(self, validated_data):
@@ -124,9 +128,22 @@ class TaskWriteSerializer(serializers.ModelSerializer):
         return instance
 
 
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """Field validation of one bulk item; items with an id are partial updates"""
+    id = serializers.IntegerField(required=False)
+    board = serializers.IntegerField(required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = ["id", "board", "title", "description", "status", "priority",
+                  "assignee_id", "reviewer_id", "due_date"]
+
+
 class BoardListSerializer(serializers.ModelSerializer):
     """Serializes and validates board list"""
-    owner_id = serializers.ReadOnlyField(source="owner.id")
+    owner_id = serializers.ReadOnlyField()
     members = serializers.PrimaryKeyRelatedField(many=True, queryset=User.objects.all(), required=False, write_only=True)
     member_count = serializers.SerializerMethodField()
     ticket_count = serializers.SerializerMethodField()
@@ -145,16 +162,16 @@ class BoardListSerializer(serializers.ModelSerializer):
         return board
 
     def get_member_count(self, obj):
-        return obj.members.count()
+        return annotated_count(obj, "member_count", obj.members.all)
 
     def get_ticket_count(self, obj):
-        return obj.tasks.count()
+        return annotated_count(obj, "ticket_count", obj.tasks.all)
 
     def get_tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status="to-do").count()
+        return annotated_count(obj, "tasks_to_do_count", lambda: obj.tasks.filter(status="to-do"))
 
     def get_tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(priority="high").count()
+        return annotated_count(obj, "tasks_high_prio_count", lambda: obj.tasks.filter(priority="high"))
 
 
 class BoardDetailSerializer(serializers.ModelSerializer):
@@ -232,3 +249,12 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_author(self, obj):
         fullname = f"{obj.author.first_name} {obj.author.last_name}".strip()
         return fullname or obj.author.username or obj.author.email
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Status of a background job, read-only"""
+
+    class Meta:
+        model = Job
+        fields = ["id", "name", "status", "attempts", "max_attempts", "result", "error", "created_at", "started_at", "finished_at"]
+        read_only_fields = fields
@@ -1,15 +1,21 @@
 """Contains all endpoints after login/registration"""
 from django.urls import path
-from kanban_app.api.views import BoardListCreateView, BoardDetailView, TaskCreateView, TasksAssignedToMeView, TasksReviewedByMeView, TaskDetailView, TasksInvolvedView, CommentsListCreateView, CommentDeleteView
+from kanban_app.api.events import board_events
+from kanban_app.api.views import BoardListCreateView, BoardDetailView, BoardChangesView, TaskCreateView, TaskBulkView, TasksAssignedToMeView, TasksReviewedByMeView, TaskDetailView, TasksInvolvedView, CommentsListCreateView, CommentDeleteView, SearchView, JobDetailView
 
 
 urlpatterns = [
     path("boards/", BoardListCreateView.as_view(), name='board-list-create'),
     path("boards/<int:pk>/", BoardDetailView.as_view(), name='board-detail'),
+    path("boards/<int:pk>/changes/", BoardChangesView.as_view(), name='board-changes'),
+    path("boards/<int:pk>/events/", board_events, name='board-events'),
     path("tasks/assigned-to-me/", TasksAssignedToMeView.as_view(), name="tasks-assigned"),
     path("tasks/reviewing/", TasksReviewedByMeView.as_view(), name="tasks-reviewing"),
     path("tasks/involved/", TasksInvolvedView.as_view(), name="tasks-involved"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job-detail"),
     path('tasks/', TaskCreateView.as_view(), name='task-create'),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="task-bulk"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path('tasks/<int:task_id>/comments/', CommentsListCreateView.as_view(), name='comments-list-create'),
     path('tasks/<int:task_id>/comments/<int:comment_id>/', CommentDeleteView.as_view(), name='comment-delete'),
@@ -1,22 +1,41 @@
-from django.db.models import Count
-from django.db.models.functions import Coalesce
-from django.db.models import Prefetch
+import json
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.urls import reverse
 from rest_framework import generics, permissions, status
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from core.renderers import dumps
 from core.utils.exceptions import exception_handler_status500
-from kanban_app.models import Board, Task, Comment
-from kanban_app.api.serializers import BoardListSerializer, BoardDetailSerializer, TaskSerializer, TaskWriteSerializer, CommentSerializer, CommentCreateSerializer, BoardUpdateSerializer, UserShortSerializer
-from kanban_app.api.mixins import UserBoardsQuerysetMixin
+from kanban_app.models import Board, BoardAccess, BoardChange, Job, Task, Comment
+from kanban_app.api.serializers import BoardListSerializer, BoardDetailSerializer, TaskSerializer, TaskWriteSerializer, CommentSerializer, CommentCreateSerializer, BoardUpdateSerializer, UserShortSerializer, JobSerializer
+from kanban_app.api.mixins import UserBoardsQuerysetMixin, StreamingListMixin, BoardRevisionConditionalMixin, TaskListQueryMixin
+from kanban_app.api.pagination import BoardCursorPagination, TaskCursorPagination, CommentCursorPagination
+from kanban_app.api.querysets import annotate_board_counters, assigned_tasks, board_detail_queryset, board_members_queryset, board_task_rows, involved_tasks, reviewing_tasks, task_comments, task_queryset
 from kanban_app.api.permissions import IsBoardOwnerOrMember
+from kanban_app.api.row_serializers import CommentRows, RowListSerializer, TaskRows, board_detail
+from kanban_app.api.bulk import TaskBulkWriter
+from kanban_app.board_cache import board_cache_enabled, get_board_detail, invalidate_boards, set_board_detail
+from kanban_app.jobs import active_job, enqueue, job_setting
+from kanban_app.membership import invalidate_board, is_board_member
+from kanban_app.revisions import latest_changes
+from kanban_app.search import search
 
 
-class BoardListCreateView(UserBoardsQuerysetMixin, generics.ListCreateAPIView):
+class BoardListCreateView(UserBoardsQuerysetMixin, StreamingListMixin, generics.ListCreateAPIView):
     """Lists all boards or creates a new one"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BoardListSerializer
+    pagination_class = BoardCursorPagination
+
+    def get_queryset(self):
+        return annotate_board_counters(super().get_queryset()).order_by("id")
 
     def create(self, request, *args, **kwargs):
         try:
@@ -28,26 +47,76 @@ class BoardListCreateView(UserBoardsQuerysetMixin, generics.ListCreateAPIView):
             return exception_handler_status500(exc, context=None)
 
 
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+def _task_board_state(task_id):
+    """Revision state of the board a task belongs to, in one query"""
+    state = Task.objects.filter(pk=task_id).values("pk", "board_id", "board__revision", "board__updated_at").first()
+    if state is None:
+        return None
+    return {"pk": state["pk"], "board_id": state["board_id"], "revision": state["board__revision"], "updated_at": state["board__updated_at"]}
+
+
+class BoardDetailView(BoardRevisionConditionalMixin, generics.RetrieveUpdateDestroyAPIView):
     """Reads, updates or deletes a board"""
     permission_classes = [permissions.IsAuthenticated, IsBoardOwnerOrMember]
     serializer_class = BoardDetailSerializer
-    queryset = Board.objects.all()
+    queryset = Board.objects.filter(deleting=False)
+    etag_kind = "board"
+
+    def get_board_state(self):
+        state = Board.objects.filter(pk=self.kwargs["pk"], deleting=False).values("pk", "revision", "updated_at").first()
+        if state is not None:
+            state["board_id"] = state["pk"]
+        return state
+
+    def get_loaded_board_state(self):
+        board = getattr(self, "board", None)
+        if board is None:
+            return getattr(self, "cached_state", None)
+        return {"pk": board.pk, "board_id": board.pk, "revision": board.revision, "updated_at": board.updated_at}
 
     def get_queryset(self):
-        task_qs = (
-            Task.objects
-            .select_related("assignee", "reviewer", "board")
-            .annotate(num_comments=Coalesce(Count("comments"), 0))
-        )
-        return (
-            super()
-            .get_queryset()
-            .select_related("owner")
-            .prefetch_related("members")
-            .prefetch_related(Prefetch("tasks", queryset=task_qs))
-        )
-        
+        """Boards pending deletion are answered with 404"""
+        if self.request.method == "GET":
+            queryset = board_members_queryset()
+        elif self.request.method == "DELETE":
+            queryset = Board.objects.select_related("stats")
+        else:
+            queryset = board_detail_queryset()
+        return queryset.filter(deleting=False)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Members and tasks are serialized from rows by TaskRows instead of BoardDetailSerializer;
+        with KANBAN_BOARD_CACHE the rendered JSON is reused until the board revision changes"""
+        if board_cache_enabled():
+            response = self.cached_response(request)
+            if response is not None:
+                return response
+        board = self.get_object()
+        rows = TaskRows()
+        data = board_detail(board, board_task_rows(board.pk, rows), rows)
+        response = Response(data)
+        if board_cache_enabled():
+            set_board_detail(board.pk, board.revision, dumps(data))
+            response["X-Board-Cache"] = "miss"
+        return response
+
+    def cached_response(self, request):
+        """Cached JSON for members of the board; unknown boards and outsiders get their 404/403 from get_object"""
+        state = self.get_board_state()
+        if state is None or not is_board_member(state["board_id"], request.user, request=request):
+            return None
+        content = get_board_detail(state["pk"], state["revision"])
+        if content is None:
+            return None
+        self.cached_state = state
+        renderer = request.accepted_renderer
+        if isinstance(renderer, JSONRenderer) and renderer.compact and renderer.get_indent(request.accepted_media_type, {}) is None:
+            response = HttpResponse(content, content_type="application/json")
+        else:
+            response = Response(json.loads(content))
+        response["X-Board-Cache"] = "hit"
+        return response
+
     def get_serializer_class(self):
         if self.request.method in ("PUT", "PATCH"):
             return BoardUpdateSerializer
@@ -56,11 +125,23 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_object(self):
         board = super().get_object()
         self.check_object_permissions(self.request, board)
+        self.board = board
         return board
 
     def destroy(self, request, *args, **kwargs):
+        """Boards with more than BOARD_DELETE_INLINE_TASKS tasks are deleted by the job worker (202 + job);
+        until then the board is marked as pending deletion and no longer accessible"""
         try:
             board = self.get_object()
+            stats = getattr(board, "stats", None)
+            if stats is not None and stats.task_count > job_setting("BOARD_DELETE_INLINE_TASKS", 500):
+                with transaction.atomic():
+                    Board.objects.filter(pk=board.pk).update(deleting=True)
+                    BoardAccess.objects.filter(board_id=board.pk).delete()
+                    job = active_job("delete_board", board_id=board.pk) or enqueue("delete_board", {"board_id": board.pk}, user=request.user)
+                invalidate_board(board.pk)
+                invalidate_boards([board.pk])
+                return job_accepted(request, job)
             board.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Board.DoesNotExist:
@@ -69,38 +150,115 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
             return exception_handler_status500(exc, context=None)
 
 
-class TasksAssignedToMeView(generics.ListAPIView):
+def job_accepted(request, job):
+    """202 with the job status and its URL in Location"""
+    url = request.build_absolute_uri(reverse("job-detail", args=[job.pk]))
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={"Location": url})
+
+
+class BoardChangesView(APIView):
+    """Delta sync: tasks, comments and members changed after ?since=<revision>, with tombstones for deletes"""
+    permission_classes = [permissions.IsAuthenticated, IsBoardOwnerOrMember]
+
+    def get(self, request, pk: int):
+        board = get_object_or_404(Board.objects.only("id", "title", "owner_id", "revision", "changes_floor"), pk=pk, deleting=False)
+        self.check_object_permissions(request, board)
+
+        since = request.query_params.get("since", "0")
+        if not since.isdigit():
+            return Response({"error": "'since' muss eine nicht-negative Ganzzahl sein."}, status=status.HTTP_400_BAD_REQUEST)
+        since = int(since)
+        if since < board.changes_floor:
+            return Response(
+                {"error": "Änderungen seit dieser Revision sind nicht mehr verfügbar, Board bitte neu laden.", "revision": board.revision},
+                status=status.HTTP_410_GONE,
+            )
+
+        latest, revision = latest_changes(board.pk, since)
+        tasks = self._upserts(latest, BoardChange.ENTITY_TASK, task_queryset(board.tasks.all()))
+        comments = self._upserts(latest, BoardChange.ENTITY_COMMENT, Comment.objects.filter(task__board=board).select_related("author"))
+        members = self._upserts(latest, BoardChange.ENTITY_MEMBER, board.members.all())
+
+        return Response({
+            "board": board.pk,
+            "since": since,
+            "revision": max(revision, board.revision),
+            "board_data": {"id": board.pk, "title": board.title, "owner_id": board.owner_id} if BoardChange.ENTITY_BOARD in latest else None,
+            "tasks": TaskSerializer(tasks, many=True).data,
+            "comments": [{**CommentSerializer(comment).data, "task": comment.task_id} for comment in comments],
+            "members": UserShortSerializer(members, many=True).data,
+            "deleted": {
+                "tasks": self._deleted(latest, BoardChange.ENTITY_TASK, tasks),
+                "comments": self._deleted(latest, BoardChange.ENTITY_COMMENT, comments),
+                "members": self._deleted(latest, BoardChange.ENTITY_MEMBER, members),
+            },
+        })
+
+    def _upserts(self, latest, entity, queryset):
+        """Current rows for upserted ids; ids that vanished since are reported as deleted"""
+        ids = [entity_id for entity_id, action in latest.get(entity, {}).items() if action == BoardChange.ACTION_UPSERT]
+        return list(queryset.filter(pk__in=ids).order_by("pk")) if ids else []
+
+    def _deleted(self, latest, entity, present):
+        present_ids = {obj.pk for obj in present}
+        return sorted(entity_id for entity_id in latest.get(entity, {}) if entity_id not in present_ids)
+
+
+class TasksAssignedToMeView(TaskListQueryMixin, StreamingListMixin, generics.ListAPIView):
     """Lists all tasks assigned to the current user"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        accessible_boards = Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
-        return (Task.objects.filter(board__in=accessible_boards, assignee=user).select_related("board", "assignee", "reviewer"))
+    def get_task_queryset(self, user, fields):
+        return assigned_tasks(user, fields)
 
 
-class TasksReviewedByMeView(generics.ListAPIView):
+class TasksReviewedByMeView(TaskListQueryMixin, StreamingListMixin, generics.ListAPIView):
     """Lists all tasks reviewed by the current user"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        accessible_boards = Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
-        return (Task.objects.filter(board__in=accessible_boards, reviewer=user).select_related("board", "assignee", "reviewer"))
+    def get_task_queryset(self, user, fields):
+        return reviewing_tasks(user, fields)
 
 
-class TasksInvolvedView(generics.ListAPIView):
+class TasksInvolvedView(TaskListQueryMixin, StreamingListMixin, generics.ListAPIView):
     """Lists all tasks the current user is involved in"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        accessible_boards = Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
-        return (
-            Task.objects.filter(board__in=accessible_boards).filter(Q(assignee=user) | Q(reviewer=user)).select_related("board", "assignee", "reviewer"))
+    def get_task_queryset(self, user, fields):
+        return involved_tasks(user, fields)
+
+
+class SearchView(APIView):
+    """Full-text search over tasks and comments on the user's boards, ranked and paginated by ?page="""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "'q' darf nicht leer sein."}, status=status.HTTP_400_BAD_REQUEST)
+        config = getattr(settings, "KANBAN_SEARCH", {})
+        page, page_size = request.query_params.get("page", "1"), request.query_params.get("page_size", str(config.get("PAGE_SIZE", 20)))
+        if not (page.isdigit() and page_size.isdigit() and int(page) > 0 and int(page_size) > 0):
+            return Response({"error": "'page' und 'page_size' müssen positive Ganzzahlen sein."}, status=status.HTTP_400_BAD_REQUEST)
+        page, page_size = int(page), min(int(page_size), config.get("MAX_PAGE_SIZE", 100))
+
+        results = search(request.user, query, limit=page_size + 1, offset=(page - 1) * page_size)
+        url = request.build_absolute_uri()
+        previous = None
+        if page > 1:
+            previous = remove_query_param(url, "page") if page == 2 else replace_query_param(url, "page", page - 1)
+        return Response({
+            "query": query,
+            "next": replace_query_param(url, "page", page + 1) if len(results) > page_size else None,
+            "previous": previous,
+            "results": results[:page_size],
+        })
 
 
 class TaskCreateView(generics.CreateAPIView):
@@ -115,27 +273,69 @@ class TaskCreateView(generics.CreateAPIView):
         serializer.save()
 
     def create(self, request, *args, **kwargs):
+        """Board, members and users are loaded once during validation; the response is built from the saved task"""
         try:
-            board_id = request.data.get("board")
-            if board_id is not None and not Board.objects.filter(pk=board_id).exists():
-                return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
-
-            response = super().create(request, *args, **kwargs)
-
-            task = Task.objects.get(pk=response.data["id"])
+            serializer = self.get_serializer(data=request.data)
+            if not serializer.is_valid():
+                if any(error.code == "does_not_exist" for error in serializer.errors.get("board", ())):
+                    return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
+                raise ValidationError(serializer.errors)
+            self.perform_create(serializer)
+            task = serializer.instance
+            task.comments_count = 0
             return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
         except Exception as exc:
             return exception_handler_status500(exc, context=None)
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskBulkView(APIView):
+    """Creates and updates many tasks in one request: {"atomic": true, "tasks": [{...}, {"id": 1, ...}]}"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get("tasks") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({"error": "'tasks' muss eine nicht-leere Liste sein."}, status=status.HTTP_400_BAD_REQUEST)
+        max_items = getattr(settings, "KANBAN_BULK_MAX_ITEMS", 500)
+        if len(items) > max_items:
+            return Response({"error": f"Maximal {max_items} Tasks pro Anfrage."}, status=status.HTTP_400_BAD_REQUEST)
+
+        atomic = request.data.get("atomic", True) not in (False, "false", "0", 0)
+        results, written = TaskBulkWriter(request, items, atomic=atomic).run()
+        if not written:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif all(result["status"] < 300 for result in results):
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({"atomic": atomic, "results": results}, status=response_status)
+
+
+class TaskDetailView(BoardRevisionConditionalMixin, generics.RetrieveUpdateDestroyAPIView):
     """Lists, updates or deletes a task"""
-    queryset = Task.objects.all()
+    queryset = task_queryset()
     permission_classes = [permissions.IsAuthenticated, IsBoardOwnerOrMember]
+    etag_kind = "task"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == "GET":
+            queryset = queryset.annotate(board_revision=F("board__revision"), board_updated_at=F("board__updated_at"))
+        return queryset
+
+    def get_board_state(self):
+        return _task_board_state(self.kwargs["pk"])
+
+    def get_loaded_board_state(self):
+        task = getattr(self, "task", None)
+        if task is None or not hasattr(task, "board_revision"):
+            return None
+        return {"pk": task.pk, "board_id": task.board_id, "revision": task.board_revision, "updated_at": task.board_updated_at}
 
     def get_object(self):
         task = super().get_object()
         self.check_object_permissions(self.request, task)
+        self.task = task
         return task
 
     def get_serializer_class(self):
@@ -194,17 +394,46 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
             return exception_handler_status500(exc, context=None)
 
 
-class CommentsListCreateView(generics.ListCreateAPIView):
+class CommentsListCreateView(BoardRevisionConditionalMixin, StreamingListMixin, generics.ListCreateAPIView):
     """Lists or creates comments"""
     permission_classes = [permissions.IsAuthenticated, IsBoardOwnerOrMember]
+    pagination_class = CommentCursorPagination
+    etag_kind = "comments"
+
+    def get_board_state(self):
+        return _task_board_state(self.kwargs["task_id"])
+
+    def get_loaded_board_state(self):
+        task = getattr(self, "_task", None)
+        if task is None:
+            return None
+        return {"pk": task.pk, "board_id": task.board_id, "revision": task.board_revision, "updated_at": task.board_updated_at}
 
     def get_task(self):
-        return get_object_or_404(Task, pk=self.kwargs["task_id"])
+        """Loads the task (id, board and board revision) once per request and checks access"""
+        if getattr(self, "_task", None) is None:
+            queryset = Task.objects.only("id", "board_id").annotate(
+                board_revision=F("board__revision"), board_updated_at=F("board__updated_at"),
+            )
+            task = get_object_or_404(queryset, pk=self.kwargs["task_id"])
+            self.check_object_permissions(self.request, task)
+            self._task = task
+        return self._task
 
     def get_queryset(self):
-        task = self.get_task()
-        self.check_object_permissions(self.request, task)
-        return task.comments.select_related("author").order_by("created_at")
+        return task_comments(self.get_task().pk)
+
+    def filter_queryset(self, queryset):
+        """GET lists are read as rows for CommentRows, including the cursor ordering keys"""
+        queryset = super().filter_queryset(queryset)
+        if self.request.method == "GET":
+            queryset = CommentRows().rows(queryset, *self.pagination_class.ordering)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == "GET":
+            return RowListSerializer(CommentRows(), args[0])
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
         if self.request.method == "GET":
@@ -218,8 +447,6 @@ class CommentsListCreateView(generics.ListCreateAPIView):
 
     def create(self, request, *args, **kwargs):
         try:
-            task = self.get_task()
-            self.check_object_permissions(request, task)
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             obj = serializer.save()
@@ -234,12 +461,13 @@ class CommentDeleteView(APIView):
 
     def delete(self, request, task_id: int, comment_id: int):
         try:
-            task = get_object_or_404(Task, pk=task_id)
+            task = get_object_or_404(Task.objects.only("id", "board_id"), pk=task_id)
             self.check_object_permissions(request, task)
 
             comment = Comment.objects.filter(pk=comment_id, task=task).first()
             if not comment:
                 return Response({"error": "Comment not found."}, status=status.HTTP_404_NOT_FOUND)
+            comment.task = task
 
             if comment.author_id != request.user.id:
                 return Response({"error": "No permission to delete this comment."}, status=status.HTTP_403_FORBIDDEN)
@@ -251,3 +479,12 @@ class CommentDeleteView(APIView):
             return Response({"error": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as exc:
             return exception_handler_status500(exc, context=None)
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    """Status of a background job started by the current user"""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user)
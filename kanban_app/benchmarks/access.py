@@ -0,0 +1,51 @@
+"""Compares the ways of resolving a user's accessible boards on the involved-tasks query"""
+import time
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef, Q
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.models import Board, BoardAccess, Task
+
+Membership = Board.members.through
+
+
+def _involved(user, boards):
+    return Task.objects.filter(boards, Q(assignee=user) | Q(reviewer=user)).order_by("id").values_list("id", flat=True)
+
+
+# Each form returns the involved-tasks query of a user, differing only in the accessible-board filter
+ACCESS_FORMS = {
+    "or-distinct": lambda user: _involved(user, Q(board__in=Board.objects.filter(Q(owner=user) | Q(members=user)).distinct())),
+    "exists": lambda user: _involved(user, Q(board__owner=user) | Q(Exists(Membership.objects.filter(board_id=OuterRef("board_id"), user=user)))),
+    "union": lambda user: _involved(user, Q(board_id__in=Board.objects.filter(owner=user).values("id").union(
+        Membership.objects.filter(user=user).values("board_id"), all=True,
+    ))),
+    "access-table": lambda user: _involved(user, Q(board_id__in=BoardAccess.objects.filter(user=user).values("board_id"))),
+}
+
+
+def run_access_benchmark(users=50, iterations=5, forms=None):
+    """Runs every form for the users with the most memberships; results must match the or-distinct baseline"""
+    forms = forms or list(ACCESS_FORMS)
+    sample = list(
+        User.objects.filter(member_boards__isnull=False).order_by().values_list("id", flat=True).distinct()[:users]
+    ) or list(User.objects.values_list("id", flat=True)[:users])
+    sample = [User(pk=pk) for pk in sample]
+    baseline = {user.pk: list(ACCESS_FORMS["or-distinct"](user)) for user in sample}
+
+    report = {"users": len(sample), "forms": {}}
+    for name in forms:
+        timings, mismatches = [], 0
+        for user in sample:
+            query = ACCESS_FORMS[name]
+            for _ in range(iterations):
+                started = time.perf_counter()
+                rows = list(query(user))
+                timings.append((time.perf_counter() - started) * 1000)
+            mismatches += rows != baseline[user.pk]
+        report["forms"][name] = {
+            "p50_ms": round(nearest_rank(timings, 50), 3),
+            "p95_ms": round(nearest_rank(timings, 95), 3),
+            "mismatches": mismatches,
+            "plan": ACCESS_FORMS[name](sample[0]).explain().splitlines() if sample else [],
+        }
+    return report
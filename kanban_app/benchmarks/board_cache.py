@@ -0,0 +1,65 @@
+"""Board detail latency without and with the response cache, under a read-heavy mix with periodic task writes"""
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.board_cache import board_cache_stats, reset_board_cache
+from kanban_app.models import Board, Task
+
+
+def _seed(tasks, members):
+    users = User.objects.bulk_create(
+        User(username=f"bench-cache-{tasks}-{i}@example.com", email=f"bench-cache-{tasks}-{i}@example.com", first_name="Bench", last_name=str(i))
+        for i in range(members)
+    )
+    board = Board.objects.create(title=f"Cache bench {tasks}", owner=users[0])
+    board.members.set(users)
+    Task.objects.bulk_create(
+        Task(board=board, title=f"Task {i}", description="Beschreibung " * 5, assignee=users[i % members])
+        for i in range(tasks)
+    )
+    return board, users[0]
+
+
+def _run(client, board, reads, write_every):
+    latencies, queries = [], []
+    url = reverse("board-detail", args=[board.pk])
+    for i in range(reads):
+        if write_every and i and i % write_every == 0:
+            Task.objects.create(board=board, title=f"Write {i}")
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+        queries.append(len(captured))
+    return {
+        "p50_ms": round(nearest_rank(latencies, 50), 3),
+        "p95_ms": round(nearest_rank(latencies, 95), 3),
+        "queries_p50": nearest_rank(queries, 50),
+    }
+
+
+def run_board_cache_benchmark(sizes=(100, 1000), reads=50, write_every=10, members=10):
+    """p50/p95 and queries per GET for each board size, uncached vs cached, plus the cache's hit/miss counters"""
+    report = {"reads": reads, "write_every": write_every, "sizes": {}}
+    config = {**getattr(settings, "KANBAN_BOARD_CACHE", {}), "SHARED_CACHE": None}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for tasks in sizes:
+            board, owner = _seed(tasks, members)
+            client = APIClient()
+            client.force_authenticate(owner)
+            result = {}
+            for name, enabled in (("uncached", False), ("cached", True)):
+                with override_settings(KANBAN_BOARD_CACHE={**config, "ENABLED": enabled}):
+                    reset_board_cache()
+                    result[name] = _run(client, board, reads, write_every)
+                    if enabled:
+                        result[name]["metrics"] = board_cache_stats()
+            reset_board_cache()
+            report["sizes"][tasks] = result
+    return report
@@ -0,0 +1,116 @@
+"""Throughput and tail latency of the read endpoints under concurrent clients: WSGI threads vs. ASGI"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from types import ModuleType
+from django.conf import settings
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import include, path, reverse
+from rest_framework.authtoken.models import Token
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.models import Board
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+
+
+def async_urlconf():
+    """Project URLs with the async read routes in front, independent of KANBAN_ASYNC_VIEWS"""
+    urlconf = ModuleType("kanban_async_urlconf")
+    urlconf.urlpatterns = [path("api/", include("kanban_app.api.async_urls")), *import_module(settings.ROOT_URLCONF).urlpatterns]
+    return urlconf
+
+
+class ReadTarget:
+    """Existing board, its owner and a token; the token is removed again if it was created here"""
+
+    def __init__(self):
+        self.board = Board.objects.order_by("-stats__task_count", "id").select_related("owner").first()
+        if self.board is None:
+            raise LookupError("No boards found, run seed_kanban first.")
+        self.actor = self.board.owner
+        self.token, self.token_created = Token.objects.get_or_create(user=self.actor)
+        task = self.board.tasks.order_by("-id").first()
+        self.urls = [
+            reverse("board-list-create"),
+            reverse("board-detail", kwargs={"pk": self.board.pk}),
+            reverse("tasks-assigned"),
+            reverse("tasks-reviewing"),
+            reverse("tasks-involved"),
+        ]
+        if task is not None:
+            self.urls.append(reverse("comments-list-create", kwargs={"task_id": task.pk}))
+
+    def cleanup(self):
+        if self.token_created:
+            self.token.delete()
+
+
+def _summary(latencies, statuses, elapsed):
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(nearest_rank(latencies, 50), 3),
+        "p95_ms": round(nearest_rank(latencies, 95), 3),
+        "p99_ms": round(nearest_rank(latencies, 99), 3),
+        "errors": sum(1 for code in statuses if code != 200),
+    }
+
+
+def _run_wsgi(target, clients, requests):
+    def worker(offset):
+        client = Client(HTTP_AUTHORIZATION=f"Token {target.token.key}")
+        results = []
+        try:
+            for i in range(offset, requests, clients):
+                url = target.urls[i % len(target.urls)]
+                started = time.perf_counter()
+                response = client.get(url)
+                results.append(((time.perf_counter() - started) * 1000, response.status_code))
+        finally:
+            connections.close_all()
+        return results
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = [item for chunk in pool.map(worker, range(clients)) for item in chunk]
+    return results, time.perf_counter() - started
+
+
+async def _run_asgi(target, clients, requests):
+    client = AsyncClient()
+    headers = {"Authorization": f"Token {target.token.key}"}
+    results = []
+
+    async def worker(offset):
+        for i in range(offset, requests, clients):
+            url = target.urls[i % len(target.urls)]
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            results.append(((time.perf_counter() - started) * 1000, response.status_code))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(clients)))
+    return results, time.perf_counter() - started
+
+
+def run_concurrency_benchmark(clients=20, requests=400, modes=MODES):
+    """Runs the same request mix in every mode and returns a summary per mode"""
+    target = ReadTarget()
+    report = {"board": target.board.pk, "clients": clients, "urls": target.urls, "modes": {}}
+    try:
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for mode in modes:
+                if mode == "wsgi":
+                    results, elapsed = _run_wsgi(target, clients, requests)
+                else:
+                    urlconf = async_urlconf() if mode == "asgi-async" else settings.ROOT_URLCONF
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        results, elapsed = asyncio.run(_run_asgi(target, clients, requests))
+                latencies = [latency for latency, _ in results]
+                report["modes"][mode] = _summary(latencies, [code for _, code in results], elapsed)
+    finally:
+        target.cleanup()
+    return report
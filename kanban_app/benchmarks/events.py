@@ -0,0 +1,80 @@
+"""Load test of the board event stream: many concurrent subscribers in one event loop"""
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+from kanban_app.api.events import board_event_stream
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.events import InMemoryBroker, board_channel
+
+
+async def _consume(stream, expected, latencies):
+    """Reads SSE frames until the expected number of events arrived"""
+    received = 0
+    async for frame in stream:
+        if not frame.startswith("event: "):
+            continue
+        payload = json.loads(frame.split("data: ", 1)[1])
+        latencies.append((time.perf_counter() - payload["sent"]) * 1000)
+        received += 1
+        if received >= expected:
+            break
+    await stream.aclose()
+    return received
+
+
+def _publish(broker, boards, events, interval):
+    for i in range(events):
+        board_id = i % boards
+        broker.publish(board_channel(board_id), {"board": board_id, "entity": "task", "id": i, "action": "upsert", "sent": time.perf_counter()})
+        if interval:
+            time.sleep(interval)
+
+
+async def run_event_benchmark(subscribers=1000, boards=50, events=200, interval_ms=5, queue_size=None, timeout=60):
+    """Subscribes, publishes from a separate thread like a sync worker would, and reports fan-out latency and memory"""
+    broker = InMemoryBroker(queue_size=queue_size or max(100, events))
+    expected = {board_id: len(range(board_id, events, boards)) for board_id in range(boards)}
+    latencies = []
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    baseline, _ = tracemalloc.get_traced_memory()
+    consumers = []
+    for i in range(subscribers):
+        board_id = i % boards
+        stream = board_event_stream(broker.subscribe(board_channel(board_id)), heartbeat=timeout)
+        await stream.__anext__()
+        consumers.append(asyncio.create_task(_consume(stream, expected[board_id], latencies)))
+    await asyncio.sleep(0)
+    subscribed, _ = tracemalloc.get_traced_memory()
+    subscribe_ms = (time.perf_counter() - started) * 1000
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    publisher = threading.Thread(target=_publish, args=(broker, boards, events, interval_ms / 1000))
+    publisher.start()
+    done, pending = await asyncio.wait(consumers, timeout=timeout)
+    publisher.join()
+    for task in pending:
+        task.cancel()
+    elapsed = time.perf_counter() - started
+
+    delivered = sum(task.result() for task in done)
+    wanted = sum(expected[i % boards] for i in range(subscribers))
+    return {
+        "subscribers": subscribers,
+        "boards": boards,
+        "events_published": events,
+        "deliveries_expected": wanted,
+        "deliveries": delivered,
+        "lost": wanted - delivered,
+        "deliveries_per_s": round(delivered / elapsed, 1) if elapsed else None,
+        "subscribe_ms": round(subscribe_ms, 1),
+        "memory_per_subscriber_kb": round((subscribed - baseline) / 1024 / max(1, subscribers), 2),
+        "latency_p50_ms": round(nearest_rank(latencies, 50), 3) if latencies else None,
+        "latency_p95_ms": round(nearest_rank(latencies, 95), 3) if latencies else None,
+        "latency_max_ms": round(max(latencies), 3) if latencies else None,
+        "open_after_run": broker.subscriber_count(),
+    }
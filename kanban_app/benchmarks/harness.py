@@ -0,0 +1,238 @@
+"""Drives every API endpoint through the test client and records latency, SQL queries and peak memory"""
+import itertools
+import math
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from kanban_app.jobs import enqueue
+from kanban_app.models import Board, Comment, Task
+
+BENCH_PASSWORD = "Bench123!x"
+
+
+def nearest_rank(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class Endpoint:
+    """One benchmarked request; prepare() runs untimed before every iteration and returns (url, data)"""
+    name: str
+    method: str
+    prepare: Callable
+    authenticated: bool = True
+    expected_status: tuple = (200,)
+
+    @property
+    def key(self):
+        return f"{self.method} {self.name}"
+
+
+@dataclass
+class EndpointResult:
+    key: str
+    latencies_ms: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    peak_memory_kb: float = 0
+    statuses: set = field(default_factory=set)
+    expected_status: tuple = (200,)
+
+    def percentile(self, pct):
+        return nearest_rank(self.latencies_ms, pct)
+
+    def as_dict(self):
+        return {
+            "iterations": len(self.latencies_ms),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "mean_ms": round(sum(self.latencies_ms) / len(self.latencies_ms), 3),
+            "max_queries": max(self.queries),
+            "peak_memory_kb": round(self.peak_memory_kb, 1),
+            "statuses": sorted(self.statuses),
+        }
+
+
+class BenchmarkContext:
+    """Actor user, token and target objects the endpoints run against"""
+
+    def __init__(self, actor_boards=50, assigned_tasks=200):
+        self._counter = itertools.count()
+        self.actor = User.objects.create_user(
+            username="bench-actor@example.com", email="bench-actor@example.com",
+            password=BENCH_PASSWORD, first_name="Bench", last_name="Actor",
+        )
+        self.token = Token.objects.create(user=self.actor)
+        self.peer = User.objects.exclude(pk=self.actor.pk).order_by("id").first() or User.objects.create_user(
+            username="bench-peer@example.com", email="bench-peer@example.com", first_name="Bench", last_name="Peer",
+        )
+
+        boards = list(Board.objects.order_by("-stats__task_count", "id")[:actor_boards])
+        for board in boards:
+            board.members.add(self.actor)
+        own = Board.objects.create(title="Bench board", owner=self.actor)
+        own.members.add(self.peer)
+        self.board = boards[0] if boards else own
+        self.own_board = own
+
+        task_ids = list(Task.objects.filter(board__in=boards).order_by("id").values_list("id", flat=True)[:assigned_tasks])
+        Task.objects.filter(id__in=task_ids[::2]).update(assignee=self.actor)
+        Task.objects.filter(id__in=task_ids[1::2]).update(reviewer=self.actor)
+        self.task = (
+            Task.objects.filter(board=self.board).order_by("-id").first()
+            or Task.objects.create(board=self.board, title="Bench task", assignee=self.actor)
+        )
+        if not self.task.comments.exists():
+            Comment.objects.create(task=self.task, author=self.actor, content="Bench comment")
+        self.job = enqueue("rebuild_board_stats", {"board_ids": [own.pk]}, user=self.actor)
+
+    def unique(self):
+        return next(self._counter)
+
+    def new_task(self):
+        return Task.objects.create(board=self.own_board, title=f"Bench task {self.unique()}", assignee=self.actor)
+
+    def new_board(self):
+        board = Board.objects.create(title=f"Bench {self.unique()}", owner=self.actor)
+        Task.objects.bulk_create(Task(board=board, title=f"Task {i}") for i in range(20))
+        return board
+
+
+# Long-lived streams are load-tested by bench_events instead
+STREAMING_ROUTES = {"board-events"}
+
+
+def build_endpoints(ctx):
+    """All routes of kanban_app/api/urls.py and auth_app/api/urls.py"""
+    def url(name, **kwargs):
+        return reverse(name, kwargs=kwargs or None)
+
+    def comment_to_delete():
+        comment = Comment.objects.create(task=ctx.task, author=ctx.actor, content="Delete me")
+        return url("comment-delete", task_id=ctx.task.pk, comment_id=comment.pk), None
+
+    return [
+        Endpoint("login-user", "POST", lambda: (url("login-user"), {"email": ctx.actor.email, "password": BENCH_PASSWORD}), authenticated=False),
+        Endpoint(
+            "register-user", "POST",
+            lambda: (url("register-user"), {
+                "fullname": "Bench User", "email": f"bench-new-{ctx.unique()}@example.com",
+                "password": BENCH_PASSWORD, "repeated_password": BENCH_PASSWORD,
+            }),
+            authenticated=False, expected_status=(201,),
+        ),
+        Endpoint("email-check", "GET", lambda: (url("email-check"), {"email": ctx.peer.email})),
+        Endpoint("board-list-create", "GET", lambda: (url("board-list-create"), None)),
+        Endpoint(
+            "board-list-create", "POST",
+            lambda: (url("board-list-create"), {"title": f"New {ctx.unique()}", "members": [ctx.peer.pk]}),
+            expected_status=(201,),
+        ),
+        Endpoint("board-detail", "GET", lambda: (url("board-detail", pk=ctx.board.pk), None)),
+        Endpoint("board-changes", "GET", lambda: (url("board-changes", pk=ctx.board.pk), {"since": 0})),
+        Endpoint("board-detail", "PATCH", lambda: (url("board-detail", pk=ctx.own_board.pk), {"title": f"Renamed {ctx.unique()}"})),
+        Endpoint("board-detail", "DELETE", lambda: (url("board-detail", pk=ctx.new_board().pk), None), expected_status=(204,)),
+        Endpoint("job-detail", "GET", lambda: (url("job-detail", pk=ctx.job.pk), None)),
+        Endpoint("search", "GET", lambda: (url("search"), {"q": ctx.task.title.split()[0]})),
+        Endpoint("tasks-assigned", "GET", lambda: (url("tasks-assigned"), None)),
+        Endpoint("tasks-reviewing", "GET", lambda: (url("tasks-reviewing"), None)),
+        Endpoint("tasks-involved", "GET", lambda: (url("tasks-involved"), None)),
+        Endpoint(
+            "task-create", "POST",
+            lambda: (url("task-create"), {
+                "board": ctx.own_board.pk, "title": f"Task {ctx.unique()}", "status": "to-do",
+                "priority": "high", "assignee_id": ctx.actor.pk, "reviewer_id": ctx.peer.pk,
+            }),
+            expected_status=(201,),
+        ),
+        Endpoint(
+            "task-bulk", "POST",
+            lambda: (url("task-bulk"), {"tasks": [
+                *({"board": ctx.own_board.pk, "title": f"Bulk {ctx.unique()}", "assignee_id": ctx.actor.pk} for _ in range(10)),
+                {"id": ctx.task.pk, "status": "review", "reviewer_id": ctx.actor.pk},
+            ]}),
+        ),
+        Endpoint("task-detail", "GET", lambda: (url("task-detail", pk=ctx.task.pk), None)),
+        Endpoint("task-detail", "PATCH", lambda: (url("task-detail", pk=ctx.task.pk), {"status": "review", "assignee_id": ctx.actor.pk})),
+        Endpoint(
+            "task-detail", "PUT",
+            lambda: (url("task-detail", pk=ctx.task.pk), {"board": ctx.task.board_id, "title": "Bench", "status": "done", "priority": "low"}),
+        ),
+        Endpoint("task-detail", "DELETE", lambda: (url("task-detail", pk=ctx.new_task().pk), None), expected_status=(204,)),
+        Endpoint("comments-list-create", "GET", lambda: (url("comments-list-create", task_id=ctx.task.pk), None)),
+        Endpoint(
+            "comments-list-create", "POST",
+            lambda: (url("comments-list-create", task_id=ctx.task.pk), {"content": f"Comment {ctx.unique()}"}),
+            expected_status=(201,),
+        ),
+        Endpoint("comment-delete", "DELETE", comment_to_delete, expected_status=(204,)),
+    ]
+
+
+def _request(client, endpoint, url, data):
+    method = getattr(client, endpoint.method.lower())
+    if endpoint.method == "GET":
+        return method(url, data)
+    return method(url, data, format="json")
+
+
+def run_benchmarks(ctx, iterations=20, warmup=2, only=None):
+    """Runs every endpoint; memory is measured in a separate pass so tracemalloc does not skew latency"""
+    anonymous = APIClient()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {ctx.token.key}")
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for endpoint in build_endpoints(ctx):
+            if only and endpoint.key not in only and endpoint.name not in only:
+                continue
+            http = client if endpoint.authenticated else anonymous
+            result = EndpointResult(endpoint.key, expected_status=endpoint.expected_status)
+            for i in range(warmup + iterations):
+                url, data = endpoint.prepare()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = _request(http, endpoint, url, data)
+                    elapsed = (time.perf_counter() - started) * 1000
+                result.statuses.add(response.status_code)
+                if i >= warmup:
+                    result.latencies_ms.append(elapsed)
+                    result.queries.append(len(queries))
+
+            url, data = endpoint.prepare()
+            tracemalloc.start()
+            try:
+                _request(http, endpoint, url, data)
+                result.peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+            results[endpoint.key] = result
+    return results
+
+
+def check_budgets(results, budgets):
+    """Returns a list of human readable budget violations"""
+    violations = [
+        f"{key}: unexpected status {sorted(result.statuses)}, expected {list(result.expected_status)}"
+        for key, result in results.items()
+        if not result.statuses <= set(result.expected_status)
+    ]
+    for key, budget in budgets.items():
+        result = results.get(key)
+        if result is None:
+            continue
+        measured = result.as_dict()
+        for limit, metric in (("max_queries", "max_queries"), ("max_ms", "p95_ms"), ("max_memory_kb", "peak_memory_kb")):
+            if limit in budget and measured[metric] > budget[limit]:
+                violations.append(f"{key}: {metric}={measured[metric]} exceeds {limit}={budget[limit]}")
+    return violations
@@ -0,0 +1,59 @@
+"""JSON rendering and compression cost of board detail payloads of growing size"""
+import time
+from django.contrib.auth.models import User
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from core.middleware import brotli
+from core.renderers import FastJSONRenderer, json_backend
+from kanban_app.api.querysets import board_members_queryset, board_task_rows
+from kanban_app.api.row_serializers import TaskRows, board_detail
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.models import Board, Task
+
+
+def _board_payload(tasks, members):
+    users = User.objects.bulk_create(
+        User(username=f"bench-render-{tasks}-{i}@example.com", email=f"bench-render-{tasks}-{i}@example.com", first_name="Bench", last_name=str(i))
+        for i in range(members)
+    )
+    board = Board.objects.create(title=f"Render bench {tasks}", owner=users[0])
+    board.members.set(users)
+    Task.objects.bulk_create(
+        Task(board=board, title=f"Task {i} – Übersicht", description="Beschreibung " * 8, assignee=users[i % members],
+             reviewer=users[(i + 1) % members] if i % 3 else None, due_date=f"2025-{i % 12 + 1:02d}-15" if i % 2 else None)
+        for i in range(tasks)
+    )
+    serializer = TaskRows()
+    return board_detail(board_members_queryset().get(pk=board.pk), board_task_rows(board.pk, serializer), serializer)
+
+
+def _measure(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.process_time()
+        func()
+        timings.append((time.process_time() - started) * 1000)
+    return round(nearest_rank(timings, 50), 3)
+
+
+def run_render_benchmark(sizes=(10, 100, 1000, 5000), members=20, iterations=20):
+    """Median CPU ms for stdlib vs fast rendering and for gzip/brotli, with payload sizes per board size"""
+    stdlib, fast = JSONRenderer(), FastJSONRenderer()
+    report = {"encoder": json_backend(), "brotli": brotli is not None, "sizes": {}}
+    for tasks in sizes:
+        data = _board_payload(tasks, members)
+        content = stdlib.render(data)
+        result = {
+            "bytes": len(content),
+            "stdlib_ms": _measure(lambda: stdlib.render(data), iterations),
+            "fast_ms": _measure(lambda: fast.render(data), iterations),
+            "identical": fast.render(data) == content,
+            "gzip_bytes": len(compress_string(content)),
+            "gzip_ms": _measure(lambda: compress_string(content), iterations),
+        }
+        if brotli is not None:
+            result["brotli_bytes"] = len(brotli.compress(content, quality=4))
+            result["brotli_ms"] = _measure(lambda: brotli.compress(content, quality=4), iterations)
+        result["speedup"] = round(result["stdlib_ms"] / result["fast_ms"], 1) if result["fast_ms"] else None
+        report["sizes"][tasks] = result
+    return report
@@ -0,0 +1,82 @@
+"""CPU cost of the DRF read serializers against the row serializers on one large board"""
+import time
+from django.contrib.auth.models import User
+from kanban_app.api.querysets import board_detail_queryset, board_members_queryset, board_task_rows, task_comments, task_queryset
+from kanban_app.api.row_serializers import CommentRows, TaskRows, board_detail
+from kanban_app.api.serializers import BoardDetailSerializer, CommentSerializer, TaskSerializer
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.models import Board, Comment, Task
+
+
+def _seed(tasks, comments, members):
+    users = User.objects.bulk_create(
+        User(username=f"bench-ser-{i}@example.com", email=f"bench-ser-{i}@example.com", first_name="Bench", last_name=str(i))
+        for i in range(members)
+    )
+    board = Board.objects.create(title="Serializer bench", owner=users[0])
+    board.members.set(users)
+    created = Task.objects.bulk_create(
+        Task(board=board, title=f"Task {i}", description="Beschreibung " * 5, assignee=users[i % members],
+             reviewer=users[(i + 1) % members] if i % 3 else None)
+        for i in range(tasks)
+    )
+    Comment.objects.bulk_create(Comment(task=created[0], author=users[i % members], content=f"Kommentar {i}") for i in range(comments))
+    return board, created[0]
+
+
+def _cases(board, task):
+    def drf_board():
+        return BoardDetailSerializer(board_detail_queryset().get(pk=board.pk)).data
+
+    def rows_board():
+        loaded = board_members_queryset().get(pk=board.pk)
+        serializer = TaskRows()
+        return board_detail(loaded, board_task_rows(board.pk, serializer), serializer)
+
+    def drf_tasks():
+        return TaskSerializer(task_queryset(Task.objects.filter(board=board)).order_by("id"), many=True).data
+
+    def rows_tasks():
+        serializer = TaskRows()
+        return serializer.many(serializer.rows(task_queryset(Task.objects.filter(board=board)).order_by("id")))
+
+    def drf_comments():
+        return CommentSerializer(task_comments(task.pk), many=True).data
+
+    def rows_comments():
+        serializer = CommentRows()
+        return serializer.many(serializer.rows(task_comments(task.pk)))
+
+    instances = list(task_queryset(Task.objects.filter(board=board)).order_by("id"))
+    serializer = TaskRows()
+    rows = list(serializer.rows(task_queryset(Task.objects.filter(board=board)).order_by("id")))
+    return {
+        "board-detail": (drf_board, rows_board),
+        "task-list": (drf_tasks, rows_tasks),
+        "comments": (drf_comments, rows_comments),
+        "task-list (serialize only)": (lambda: TaskSerializer(instances, many=True).data, lambda: serializer.many(rows)),
+    }
+
+
+def _measure(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.process_time()
+        func()
+        timings.append((time.process_time() - started) * 1000)
+    return nearest_rank(timings, 50)
+
+
+def run_serializer_benchmark(tasks=2000, comments=2000, members=20, iterations=10):
+    """Median CPU ms per case for both paths, including the queries unless marked serialize only"""
+    board, task = _seed(tasks, comments, members)
+    report = {"tasks": tasks, "comments": comments, "cases": {}}
+    for name, (drf, rows) in _cases(board, task).items():
+        drf_ms, rows_ms = _measure(drf, iterations), _measure(rows, iterations)
+        report["cases"][name] = {
+            "drf_cpu_ms": round(drf_ms, 3),
+            "rows_cpu_ms": round(rows_ms, 3),
+            "speedup": round(drf_ms / rows_ms, 1) if rows_ms else None,
+            "identical": drf() == rows(),
+        }
+    return report
@@ -0,0 +1,85 @@
+"""Concurrent reads and writes against the API on a file-based SQLite database"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from kanban_app.benchmarks.harness import nearest_rank
+from kanban_app.models import Board
+from kanban_app.seeding import KanbanSeeder
+
+
+def _prepare(seed):
+    call_command("migrate", verbosity=0)
+    KanbanSeeder(seed=seed, password=None).run(users=50, boards=10, members_per_board=5, tasks=2000, comments=2000)
+    board = Board.objects.order_by("-stats__task_count", "id").select_related("owner").first()
+    token, _ = Token.objects.get_or_create(user=board.owner)
+    task_ids = list(board.tasks.order_by("id").values_list("id", flat=True)[:200])
+    return board, token, task_ids
+
+
+def run_mixed_load(threads=8, requests=200, write_ratio=0.3, seed=7):
+    """Runs in a process whose default database is a scratch SQLite file; every thread has its own connection"""
+    board, token, task_ids = _prepare(seed)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+    lock = threading.Lock()
+    latencies, counts = [], {"reads": 0, "writes": 0, "failed": 0, "locked": 0}
+
+    def request(client, rng):
+        if rng.random() < write_ratio:
+            kind = "writes"
+            task_id = rng.choice(task_ids)
+            if rng.random() < 0.5:
+                status = rng.choice(["to-do", "in-progress", "review", "done"])
+                return kind, lambda: client.patch(reverse("task-detail", args=[task_id]), {"status": status}, content_type="application/json")
+            return kind, lambda: client.post(reverse("comments-list-create", args=[task_id]), {"content": "Load"}, content_type="application/json")
+        kind = "reads"
+        if rng.random() < 0.5:
+            return kind, lambda: client.get(reverse("board-detail", args=[board.pk]))
+        return kind, lambda: client.get(reverse("tasks-assigned"))
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = Client(HTTP_AUTHORIZATION=f"Token {token.key}")
+        try:
+            for _ in range(requests):
+                kind, call = request(client, rng)
+                started = time.perf_counter()
+                try:
+                    failed = call().status_code >= 500
+                    locked = False
+                except OperationalError as exc:
+                    failed, locked = True, "locked" in str(exc)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    counts[kind] += 1
+                    counts["failed"] += failed
+                    counts["locked"] += locked
+        finally:
+            connections.close_all()
+
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "journal_mode": journal_mode,
+        "transaction_mode": connection.settings_dict["OPTIONS"].get("transaction_mode") or "DEFERRED",
+        "threads": threads,
+        **counts,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(nearest_rank(latencies, 50), 3),
+        "p95_ms": round(nearest_rank(latencies, 95), 3),
+        "p99_ms": round(nearest_rank(latencies, 99), 3),
+    }
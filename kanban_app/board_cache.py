@@ -0,0 +1,129 @@
+"""Rendered board detail responses cached per board and validated against the board revision"""
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from core.utils.cache import TTLCache
+
+_backend = None
+_lock = threading.Lock()
+_metrics = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+
+def _config():
+    return getattr(settings, "KANBAN_BOARD_CACHE", {})
+
+
+def board_cache_enabled():
+    return _config().get("ENABLED", False)
+
+
+class SharedBoardCache:
+    """Django cache alias (e.g. Redis/Memcached) shared between processes"""
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    @staticmethod
+    def key(board_id):
+        return f"board-detail:{board_id}"
+
+    def get(self, board_id):
+        return self.cache.get(self.key(board_id))
+
+    def set(self, board_id, entry):
+        self.cache.set(self.key(board_id), entry, self.ttl)
+
+    def delete_many(self, board_ids):
+        self.cache.delete_many([self.key(board_id) for board_id in board_ids])
+
+    def clear(self):
+        """Other keys share the alias; entries of old revisions simply expire"""
+
+    def stats(self):
+        return {"backend": "shared"}
+
+
+class LocalBoardCache:
+    """Process-local LRU bounded by entry count and by the summed size of the cached JSON"""
+
+    def __init__(self, max_entries, max_bytes, ttl):
+        self.cache = TTLCache(max_size=max_entries, ttl=ttl, max_bytes=max_bytes, sizeof=lambda entry: len(entry[1]))
+
+    def get(self, board_id):
+        return self.cache.get(board_id)
+
+    def set(self, board_id, entry):
+        self.cache.set(board_id, entry)
+
+    def delete_many(self, board_ids):
+        for board_id in board_ids:
+            self.cache.delete(board_id)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return {"backend": "local", "entries": len(self.cache), "bytes": self.cache.bytes, "evictions": self.cache.evictions}
+
+
+def board_cache():
+    """The configured backend: SHARED_CACHE alias if set, otherwise the local LRU"""
+    global _backend
+    if _backend is None:
+        config = _config()
+        ttl = config.get("TTL", 300)
+        if config.get("SHARED_CACHE"):
+            _backend = SharedBoardCache(config["SHARED_CACHE"], ttl)
+        else:
+            _backend = LocalBoardCache(config.get("MAX_ENTRIES", 512), config.get("MAX_BYTES", 64 * 1024 * 1024), ttl)
+    return _backend
+
+
+def _count(name):
+    with _lock:
+        _metrics[name] += 1
+
+
+def get_board_detail(board_id, revision):
+    """Cached JSON bytes of the board detail at this revision, or None"""
+    entry = board_cache().get(board_id)
+    if entry is not None and entry[0] == revision:
+        _count("hits")
+        return entry[1]
+    _count("misses")
+    return None
+
+
+def set_board_detail(board_id, revision, content):
+    """Stores the JSON rendered for `revision`; entries from before a concurrent write never match the new revision"""
+    board_cache().set(board_id, (revision, content))
+    _count("stores")
+
+
+def invalidate_boards(board_ids):
+    board_ids = [board_id for board_id in board_ids if board_id is not None]
+    if board_ids and board_cache_enabled():
+        board_cache().delete_many(board_ids)
+        with _lock:
+            _metrics["invalidations"] += len(board_ids)
+
+
+def board_cache_stats():
+    """Hit/miss counters of this process plus backend figures"""
+    with _lock:
+        stats = dict(_metrics)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else None
+    return {**stats, **board_cache().stats()}
+
+
+def reset_board_cache():
+    """Drops the backend (re-read from settings on next use), its entries and the counters"""
+    global _backend
+    if _backend is not None:
+        _backend.clear()
+    _backend = None
+    with _lock:
+        for name in _metrics:
+            _metrics[name] = 0
@@ -0,0 +1,108 @@
+"""In-process pub/sub for board events with a pluggable broker backend"""
+import asyncio
+import threading
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def events_setting(name, default):
+    return getattr(settings, "KANBAN_EVENTS", {}).get(name, default)
+
+
+def board_channel(board_id):
+    return f"board:{board_id}"
+
+
+class Subscription:
+    """Bounded queue of one subscriber; events that do not fit mark it as overflowed instead of blocking publishers"""
+
+    def __init__(self, broker, channel, queue_size):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, event):
+        """Thread-safe; called from the publishing thread"""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self, timeout=None):
+        """Next event, None after an overflow, or raises TimeoutError"""
+        if self.overflowed:
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Single-process broker; enough for tests and one ASGI worker"""
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or events_setting("QUEUE_SIZE", 100)
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """Must be called from the event loop that will consume the subscription"""
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+        return len(subscribers)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def get_broker():
+    """Broker configured in KANBAN_EVENTS["BACKEND"], created once per process"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(events_setting("BACKEND", "kanban_app.events.InMemoryBroker"))()
+    return _broker
+
+
+def reset_broker():
+    global _broker
+    _broker = None
+
+
+def publish_board_events(changes):
+    """Publishes (board_id, entity, entity_id, action) tuples to the board channels"""
+    broker = get_broker()
+    for board_id, entity, entity_id, action in changes:
+        broker.publish(board_channel(board_id), {"board": board_id, "entity": entity, "id": entity_id, "action": action})
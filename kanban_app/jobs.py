@@ -0,0 +1,167 @@
+"""Database-backed job queue: enqueue() stores a Job, the run_jobs worker leases and executes it"""
+import logging
+import os
+import socket
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from kanban_app.access import access_table_enabled, rebuild_access
+from kanban_app.board_cache import invalidate_boards
+from kanban_app.membership import invalidate_board
+from kanban_app.models import Board, Job
+from kanban_app.stats import rebuild_board_stats
+
+logger = logging.getLogger("kanmind.jobs")
+_registry = {}
+_failure_handlers = {}
+
+ACTIVE_STATUSES = (Job.STATUS_QUEUED, Job.STATUS_RUNNING)
+
+
+def job_setting(name, default=None):
+    return getattr(settings, "KANBAN_JOBS", {}).get(name, default)
+
+
+def register(name, on_failure=None):
+    """Registers func(payload) -> JSON-serializable result as job `name`; jobs must be idempotent.
+    on_failure(payload) runs once the job has failed for good."""
+    def decorator(func):
+        _registry[name] = func
+        if on_failure is not None:
+            _failure_handlers[name] = on_failure
+        return func
+    return decorator
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(name, payload=None, user=None, max_attempts=None):
+    """Stores a queued job; with KANBAN_JOBS["EAGER"] it runs in-process right after the commit"""
+    if name not in _registry:
+        raise ValueError(f"Unknown job {name!r}.")
+    job = Job.objects.create(
+        name=name, payload=payload or {}, created_by=user,
+        max_attempts=max_attempts or job_setting("MAX_ATTEMPTS", 3),
+    )
+    if job_setting("EAGER", False):
+        transaction.on_commit(lambda: run_pending(default_worker_id(), pk=job.pk))
+    return job
+
+
+def _claimable(now):
+    return Q(status=Job.STATUS_QUEUED, run_after__lte=now) | Q(
+        status=Job.STATUS_RUNNING, locked_until__lt=now, attempts__lt=F("max_attempts")
+    )
+
+
+def _failed_for_good(job):
+    handler = _failure_handlers.get(job.name)
+    if handler is not None:
+        handler(job.payload)
+
+
+def fail_abandoned(now=None):
+    """Running jobs whose lease expired on their last attempt (worker died) are marked failed"""
+    abandoned = Q(status=Job.STATUS_RUNNING, locked_until__lt=now or timezone.now(), attempts__gte=F("max_attempts"))
+    failed = 0
+    for job in Job.objects.filter(abandoned):
+        if Job.objects.filter(abandoned, pk=job.pk).update(
+            status=Job.STATUS_FAILED, finished_at=timezone.now(), locked_until=None, error="Lease expired on the last attempt."
+        ):
+            _failed_for_good(job)
+            failed += 1
+    return failed
+
+
+def claim_next(worker_id, visibility_timeout=None, pk=None):
+    """Leases the next due job, or one whose lease expired, with a conditional UPDATE so concurrent
+    workers never claim the same job; returns None if nothing is due"""
+    timeout = visibility_timeout or job_setting("VISIBILITY_TIMEOUT", 300)
+    now = timezone.now()
+    candidates = Job.objects.filter(_claimable(now))
+    if pk is not None:
+        candidates = candidates.filter(pk=pk)
+    for job_id in candidates.order_by("run_after", "id").values_list("pk", flat=True)[:10]:
+        claimed = Job.objects.filter(_claimable(now), pk=job_id).update(
+            status=Job.STATUS_RUNNING, locked_by=worker_id, locked_until=now + timedelta(seconds=timeout),
+            attempts=F("attempts") + 1, started_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def execute(job, worker_id):
+    """Runs a leased job; failures are retried with exponential backoff until max_attempts.
+    Results of a worker whose lease was taken over in the meantime are discarded."""
+    leased = Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING, locked_by=worker_id, attempts=job.attempts)
+    try:
+        func = _registry.get(job.name)
+        if func is None:
+            raise LookupError(f"Unknown job {job.name!r}.")
+        result = func(job.payload)
+    except Exception as exc:
+        logger.exception("Job %s #%s failed (attempt %s/%s)", job.name, job.pk, job.attempts, job.max_attempts)
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts:
+            delay = job_setting("RETRY_DELAY", 10) * 2 ** (job.attempts - 1)
+            leased.update(
+                status=Job.STATUS_QUEUED, run_after=timezone.now() + timedelta(seconds=delay),
+                locked_until=None, locked_by="", error=error,
+            )
+        elif leased.update(status=Job.STATUS_FAILED, finished_at=timezone.now(), locked_until=None, error=error):
+            _failed_for_good(job)
+        return False
+    leased.update(status=Job.STATUS_SUCCEEDED, result=result, finished_at=timezone.now(), locked_until=None, error="")
+    return True
+
+
+def run_pending(worker_id, max_jobs=None, visibility_timeout=None, pk=None):
+    """Claims and executes due jobs until none is left (or max_jobs ran); returns the number executed"""
+    fail_abandoned()
+    executed = 0
+    while max_jobs is None or executed < max_jobs:
+        job = claim_next(worker_id, visibility_timeout, pk=pk)
+        if job is None:
+            break
+        execute(job, worker_id)
+        executed += 1
+    return executed
+
+
+def active_job(name, **payload):
+    """Queued or running job `name` whose payload contains the given values"""
+    lookups = {f"payload__{key}": value for key, value in payload.items()}
+    return Job.objects.filter(name=name, status__in=ACTIVE_STATUSES, **lookups).order_by("id").first()
+
+
+def restore_board(payload):
+    """A board whose deletion failed for good is accessible again, so its owner can delete it anew"""
+    board_id = payload["board_id"]
+    if not Board.objects.filter(pk=board_id, deleting=True).update(deleting=False):
+        return
+    if access_table_enabled():
+        rebuild_access([board_id])
+    invalidate_board(board_id)
+    invalidate_boards([board_id])
+
+
+@register("delete_board", on_failure=restore_board)
+def delete_board(payload):
+    """Deletes a board with its tasks and comments; a board that is already gone counts as done"""
+    board = Board.objects.filter(pk=payload["board_id"]).first()
+    if board is None:
+        return {"deleted": 0}
+    deleted, _ = board.delete()
+    return {"deleted": deleted}
+
+
+@register("rebuild_board_stats")
+def rebuild_stats(payload):
+    """Recomputes BoardStats for the given boards, or all boards without board_ids"""
+    count = rebuild_board_stats(payload.get("board_ids"), batch_size=payload.get("batch_size", 1000))
+    return {"boards": count}
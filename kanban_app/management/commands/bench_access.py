@@ -0,0 +1,43 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.benchmarks.access import ACCESS_FORMS, run_access_benchmark
+from kanban_app.seeding import KanbanSeeder
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a dataset with a large membership table inside a transaction and compares the accessible-board "
+        "filters (OR + DISTINCT, EXISTS, UNION ALL, access table) on the involved-tasks query: latency, query "
+        "plan and result equality. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--boards", type=int, default=2000)
+        parser.add_argument("--members-per-board", type=int, default=25)
+        parser.add_argument("--tasks", type=int, default=50000)
+        parser.add_argument("--sample", type=int, default=50, help="Users the queries are run for.")
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--forms", nargs="*", choices=list(ACCESS_FORMS), default=None)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        report = None
+        try:
+            with transaction.atomic():
+                KanbanSeeder(seed=options["seed"], password=None).run(
+                    users=options["users"], boards=options["boards"], members_per_board=options["members_per_board"],
+                    tasks=options["tasks"], comments=0,
+                )
+                report = run_access_benchmark(users=options["sample"], iterations=options["iterations"], forms=options["forms"])
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        if any(form["mismatches"] for form in report["forms"].values()):
+            raise CommandError("A form returned different tasks than OR + DISTINCT.")
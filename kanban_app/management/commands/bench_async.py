@@ -0,0 +1,25 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.benchmarks.concurrency import MODES, run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput and p50/p95/p99 latency of the read endpoints under concurrent clients for "
+        "WSGI (sync views in threads), ASGI with the sync views and ASGI with the async views. "
+        "Runs against the existing data; seed it with seed_kanban first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=20, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per mode.")
+        parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1 or options["requests"] < 1:
+            raise CommandError("--clients and --requests must be positive.")
+        try:
+            report = run_concurrency_benchmark(clients=options["clients"], requests=options["requests"], modes=options["modes"])
+        except LookupError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,39 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.benchmarks.board_cache import run_board_cache_benchmark
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Reads board details of several sizes with and without the board detail cache while a task is "
+        "written every --write-every reads, and reports latency, queries and hit/miss counters. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000", help="Comma-separated task counts per board.")
+        parser.add_argument("--reads", type=int, default=50)
+        parser.add_argument("--write-every", type=int, default=10, help="0 disables writes.")
+        parser.add_argument("--members", type=int, default=10)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        if not sizes or min(sizes) < 1 or options["reads"] < 1 or options["members"] < 1:
+            raise CommandError("--sizes, --reads and --members must be positive.")
+        report = None
+        try:
+            with transaction.atomic():
+                report = run_board_cache_benchmark(
+                    sizes, reads=options["reads"], write_every=options["write_every"], members=options["members"],
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(json.dumps(report, indent=2))
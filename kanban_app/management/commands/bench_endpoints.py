@@ -0,0 +1,77 @@
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.benchmarks.harness import BenchmarkContext, check_budgets, run_benchmarks
+from kanban_app.seeding import KanbanSeeder
+
+DEFAULT_BUDGETS = Path(__file__).resolve().parents[2] / "benchmarks" / "budgets.json"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks every API endpoint against a seeded dataset (p50/p95 latency, SQL queries, peak memory) "
+        "and fails if a budget is exceeded. All data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--boards", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=40000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--use-existing", action="store_true", help="Do not seed, benchmark the current data.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--only", nargs="*", help="Endpoint names or 'METHOD name' keys to run.")
+        parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS), help="JSON file with max_queries/max_ms/max_memory_kb per endpoint.")
+        parser.add_argument("--no-budgets", action="store_true", help="Only report, never fail.")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if not options["use_existing"]:
+                    KanbanSeeder(seed=options["seed"], password=None).run(
+                        users=options["users"], boards=options["boards"], members_per_board=8,
+                        tasks=options["tasks"], comments=options["comments"],
+                    )
+                ctx = BenchmarkContext()
+                results = run_benchmarks(ctx, iterations=options["iterations"], warmup=options["warmup"], only=options["only"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        budgets = {}
+        if not options["no_budgets"]:
+            budgets = json.loads(Path(options["budgets"]).read_text())
+        violations = check_budgets(results, budgets)
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "dataset": None if options["use_existing"] else {
+                    key: options[key] for key in ("users", "boards", "tasks", "comments", "seed")
+                },
+                "iterations": options["iterations"],
+            },
+            "endpoints": {key: result.as_dict() for key, result in results.items()},
+            "violations": violations,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output)
+        else:
+            self.stdout.write(output)
+
+        if violations:
+            raise CommandError("Budget exceeded:\n" + "\n".join(violations))
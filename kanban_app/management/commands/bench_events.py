@@ -0,0 +1,29 @@
+import asyncio
+import json
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.benchmarks.events import run_event_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests the SSE board stream in one process: holds N concurrent subscribers, publishes events "
+        "from a worker thread and reports fan-out latency, throughput and memory per subscriber."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=5000)
+        parser.add_argument("--boards", type=int, default=500)
+        parser.add_argument("--events", type=int, default=2000)
+        parser.add_argument("--interval-ms", type=float, default=1, help="Pause between published events.")
+        parser.add_argument("--timeout", type=float, default=120)
+
+    def handle(self, *args, **options):
+        if options["subscribers"] < 1 or options["boards"] < 1:
+            raise CommandError("--subscribers and --boards must be positive.")
+        report = asyncio.run(run_event_benchmark(
+            subscribers=options["subscribers"], boards=options["boards"], events=options["events"],
+            interval_ms=options["interval_ms"], timeout=options["timeout"],
+        ))
+        self.stdout.write(json.dumps(report, indent=2))
+        if report["lost"]:
+            raise CommandError(f"{report['lost']} event deliveries lost.")
@@ -0,0 +1,38 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.benchmarks.rendering import run_render_benchmark
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders board detail payloads of several sizes with DRF's stdlib JSONRenderer and the configured "
+        "fast renderer, and measures gzip/brotli compression. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,1000,5000", help="Comma-separated task counts per board.")
+        parser.add_argument("--members", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        if not sizes or min(sizes) < 1 or options["members"] < 2:
+            raise CommandError("--sizes must be positive and --members at least 2.")
+        report = None
+        try:
+            with transaction.atomic():
+                report = run_render_benchmark(sizes, members=options["members"], iterations=options["iterations"])
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(json.dumps(report, indent=2))
+        if not all(result["identical"] for result in report["sizes"].values()):
+            raise CommandError("Fast renderer output differs from JSONRenderer.")
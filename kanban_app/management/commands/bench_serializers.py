@@ -0,0 +1,38 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.benchmarks.serializers import run_serializer_benchmark
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the CPU time of the DRF read serializers with the row serializers (board detail, task list, "
+        "comments) on one large board and checks that both produce identical data. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=2000)
+        parser.add_argument("--comments", type=int, default=2000)
+        parser.add_argument("--members", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if options["tasks"] < 1 or options["members"] < 2:
+            raise CommandError("--tasks must be positive and --members at least 2.")
+        report = None
+        try:
+            with transaction.atomic():
+                report = run_serializer_benchmark(
+                    tasks=options["tasks"], comments=options["comments"],
+                    members=options["members"], iterations=options["iterations"],
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(json.dumps(report, indent=2))
+        if not all(case["identical"] for case in report["cases"].values()):
+            raise CommandError("Row serializers differ from the DRF serializers.")
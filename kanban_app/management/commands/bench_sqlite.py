@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = {
+    "default": {"SQLITE_TUNING": "False"},
+    "tuned": {"SQLITE_TUNING": "True"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs concurrent reads and writes against the Kanban API on a scratch SQLite file, once with the "
+        "default SQLite settings and once with the SQLITE_TUNING profile, and compares throughput, latency "
+        "and 'database is locked' failures. Each profile runs in its own process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per thread.")
+        parser.add_argument("--write-ratio", type=float, default=0.3)
+        parser.add_argument("--profiles", nargs="*", choices=sorted(PROFILES), default=["default", "tuned"])
+        parser.add_argument("--worker", action="store_true", help="Internal: run one profile in this process.")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            from kanban_app.benchmarks.sqlite import run_mixed_load
+            report = run_mixed_load(threads=options["threads"], requests=options["requests"], write_ratio=options["write_ratio"])
+            self.stdout.write(json.dumps(report))
+            return
+
+        report = {}
+        for profile in options["profiles"]:
+            with tempfile.TemporaryDirectory() as directory:
+                env = {
+                    **os.environ, **PROFILES[profile],
+                    "DB_ENGINE": "sqlite3", "DB_NAME": str(Path(directory) / "bench.sqlite3"),
+                    "DB_REPLICA_NAME": "", "DB_REPLICA_HOST": "",
+                }
+                command = [
+                    sys.executable, str(Path(settings.BASE_DIR) / "manage.py"), "bench_sqlite", "--worker",
+                    "--threads", str(options["threads"]), "--requests", str(options["requests"]),
+                    "--write-ratio", str(options["write_ratio"]),
+                ]
+                result = subprocess.run(command, env=env, capture_output=True, text=True)
+                if result.returncode:
+                    raise CommandError(f"Profile {profile} failed:\n{result.stderr[-2000:]}")
+                report[profile] = json.loads(result.stdout.strip().splitlines()[-1])
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.revisions import compact_changes
+
+
+class Command(BaseCommand):
+    help = "Compacts the board change log: drops superseded entries and entries older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retention-days", type=int, default=None, help="Defaults to KANBAN_CHANGELOG['RETENTION_DAYS'].")
+
+    def handle(self, *args, **options):
+        retention_days = options["retention_days"]
+        if retention_days is not None and retention_days < 0:
+            raise CommandError("--retention-days must not be negative.")
+        superseded, expired = compact_changes(retention_days=retention_days)
+        self.stdout.write(self.style.SUCCESS(f"Removed {superseded} superseded and {expired} expired change(s)."))
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from kanban_app.models import Comment, Task
+from kanban_app.seeding import KanbanSeeder
+
+# Single-column FK indexes of the schema before the composite indexes were added
+BASELINE_INDEXES = [
+    (Task, "board_id"),
+    (Task, "assignee_id"),
+    (Task, "reviewer_id"),
+    (Comment, "task_id"),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large dataset inside a transaction, runs the read endpoints and prints the query plan of "
+        "every SQL query with the baseline FK indexes (before) and the Meta indexes (after). Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--boards", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=50000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user, board, task = self.seed(options)
+                self.stdout.write(self.style.MIGRATE_HEADING("Before (baseline FK indexes)"))
+                self.use_baseline_indexes()
+                before = self.explain_endpoints(user, board, task)
+                self.stdout.write(self.style.MIGRATE_HEADING("After (Meta indexes)"))
+                self.use_meta_indexes()
+                after = self.explain_endpoints(user, board, task)
+                self.report(before, after)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def seed(self, options):
+        KanbanSeeder(seed=options["seed"], password=None).run(
+            users=options["users"],
+            boards=options["boards"],
+            members_per_board=10,
+            tasks=options["tasks"],
+            comments=options["comments"],
+        )
+        task = Task.objects.filter(assignee__isnull=False).select_related("assignee", "board").order_by("id").first()
+        return task.assignee, task.board, task
+
+    def use_baseline_indexes(self):
+        with connection.cursor() as cursor:
+            for model in (Task, Comment):
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+            for model, column in BASELINE_INDEXES:
+                table = model._meta.db_table
+                name = connection.ops.quote_name(f"baseline_{table}_{column}")
+                cursor.execute(f"CREATE INDEX {name} ON {connection.ops.quote_name(table)} ({column})")
+            self.analyze(cursor)
+
+    def use_meta_indexes(self):
+        with connection.cursor() as cursor:
+            for model, column in BASELINE_INDEXES:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(f'baseline_{model._meta.db_table}_{column}')}")
+            for model in (Task, Comment):
+                for index in model._meta.indexes:
+                    columns = ", ".join(connection.ops.quote_name(model._meta.get_field(field).column) for field in index.fields)
+                    cursor.execute(
+                        f"CREATE INDEX {connection.ops.quote_name(index.name)} "
+                        f"ON {connection.ops.quote_name(model._meta.db_table)} ({columns})"
+                    )
+            self.analyze(cursor)
+
+    def analyze(self, cursor):
+        cursor.execute("ANALYZE")
+
+    def endpoints(self, board, task):
+        return {
+            "board-list": reverse("board-list-create"),
+            "board-detail": reverse("board-detail", kwargs={"pk": board.pk}),
+            "tasks-assigned": reverse("tasks-assigned"),
+            "tasks-reviewing": reverse("tasks-reviewing"),
+            "tasks-involved": reverse("tasks-involved"),
+            "task-detail": reverse("task-detail", kwargs={"pk": task.pk}),
+            "comments-list": reverse("comments-list-create", kwargs={"task_id": task.pk}),
+        }
+
+    def explain_endpoints(self, user, board, task):
+        client = APIClient()
+        client.force_authenticate(user)
+        plans = {}
+        for name, url in self.endpoints(board, task).items():
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+            if response.status_code != 200:
+                self.stderr.write(f"{name}: HTTP {response.status_code}")
+            plans[name] = [(query["sql"], self.explain(query["sql"])) for query in queries if query["sql"].startswith("SELECT")]
+        return plans
+
+    def explain(self, sql):
+        prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}")
+            return [row[-1] if connection.vendor == "sqlite" else row[0] for row in cursor.fetchall()]
+
+    def report(self, before, after):
+        for name in after:
+            self.stdout.write(self.style.MIGRATE_LABEL(f"\n== {name}"))
+            for (sql, plan_before), (_, plan_after) in zip(before[name], after[name]):
+                self.stdout.write(f"  SQL: {sql[:200]}{'…' if len(sql) > 200 else ''}")
+                self.stdout.write("  before:")
+                for line in plan_before:
+                    self.stdout.write(f"    {line}")
+                self.stdout.write("  after:")
+                for line in plan_after:
+                    self.stdout.write(f"    {line}")
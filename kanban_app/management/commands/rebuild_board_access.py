@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from kanban_app.access import rebuild_access
+
+
+class Command(BaseCommand):
+    help = "Recomputes the materialized user -> board access table (KANBAN_ACCESS_TABLE) from owners and members."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = rebuild_access()
+        self.stdout.write(self.style.SUCCESS(f"Board access rebuilt: {rows} row(s)."))
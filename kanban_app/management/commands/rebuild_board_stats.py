@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.jobs import enqueue
+from kanban_app.stats import rebuild_board_stats, verify_board_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized BoardStats counters in bulk or verifies them against the task/member tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="Only compare stored counters with the actual counts.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Boards per aggregation/upsert batch.")
+        parser.add_argument("--enqueue", action="store_true", help="Queue the rebuild for the run_jobs worker instead of running it here.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["verify"]:
+            mismatches = list(verify_board_stats(batch_size=batch_size))
+            for board_id, field, stored, actual in mismatches:
+                self.stdout.write(f"Board {board_id}: {field} stored={stored} actual={actual}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} counter(s) out of sync. Run rebuild_board_stats to fix them.")
+            self.stdout.write(self.style.SUCCESS("All board counters are in sync."))
+            return
+
+        if options["enqueue"]:
+            job = enqueue("rebuild_board_stats", {"batch_size": batch_size})
+            self.stdout.write(self.style.SUCCESS(f"Queued job {job.pk}."))
+            return
+
+        count = rebuild_board_stats(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {count} board(s)."))
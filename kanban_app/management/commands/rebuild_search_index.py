@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index over task titles, descriptions and comments from the tables."
+
+    def handle(self, *args, **options):
+        if not rebuild_index():
+            raise CommandError("The full-text index requires SQLite with FTS5.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
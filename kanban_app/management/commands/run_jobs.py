@@ -0,0 +1,46 @@
+import signal
+import time
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.jobs import default_worker_id, job_setting, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the background job worker: leases due jobs (or jobs whose lease expired), executes them and "
+        "retries failures with backoff. SIGINT/SIGTERM stop it after the current job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Process all due jobs and exit.")
+        parser.add_argument("--max-jobs", type=int, default=None, help="Exit after this many jobs.")
+        parser.add_argument("--worker-id", default=None, help="Lease owner name (default host:pid).")
+        parser.add_argument("--visibility-timeout", type=int, default=None, help="Lease length in seconds.")
+        parser.add_argument("--poll-interval", type=float, default=None, help="Seconds to sleep while the queue is empty.")
+
+    def handle(self, *args, **options):
+        max_jobs = options["max_jobs"]
+        if max_jobs is not None and max_jobs < 1:
+            raise CommandError("--max-jobs must be positive.")
+        worker_id = options["worker_id"] or default_worker_id()
+        poll_interval = options["poll_interval"]
+        if poll_interval is None:
+            poll_interval = job_setting("POLL_INTERVAL", 1)
+
+        self._stopping = False
+        previous = {signum: signal.signal(signum, self._stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+        total = 0
+        try:
+            while not self._stopping and (max_jobs is None or total < max_jobs):
+                executed = run_pending(worker_id, max_jobs=1, visibility_timeout=options["visibility_timeout"])
+                total += executed
+                if not executed:
+                    if options["once"]:
+                        break
+                    time.sleep(poll_interval)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} executed {total} job(s)."))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
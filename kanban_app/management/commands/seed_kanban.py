@@ -0,0 +1,40 @@
+import json
+from django.core.management.base import BaseCommand
+from kanban_app.seeding import KanbanSeeder
+
+
+class Command(BaseCommand):
+    help = "Bulk-creates a realistic (Faker) kanban dataset for load and performance tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--boards", type=int, default=200)
+        parser.add_argument("--members-per-board", type=int, default=8)
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=200_000)
+        parser.add_argument("--seed", type=int, default=42, help="Same seed, same dataset.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk_create/transaction.")
+        parser.add_argument("--password", default="Kanban123!", help="Password of all generated users.")
+        parser.add_argument("--json", action="store_true", help="Print the throughput report as JSON.")
+
+    def handle(self, *args, **options):
+        seeder = KanbanSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            password=options["password"],
+            log=(lambda message: None) if options["json"] else self.stdout.write,
+        )
+        stats = seeder.run(
+            users=options["users"],
+            boards=options["boards"],
+            members_per_board=options["members_per_board"],
+            tasks=options["tasks"],
+            comments=options["comments"],
+        )
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+        total = stats["total"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total['rows']:,} rows in {total['seconds']:.2f}s ({total['rows_per_sec']:,} rows/s)."
+        ))
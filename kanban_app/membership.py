@@ -0,0 +1,104 @@
+"""Resolves board membership (owner + members) with a per-request memo and a process-level cache"""
+from django.conf import settings
+from core.utils.cache import TTLCache
+from kanban_app.access import access_table_enabled, board_user_ids
+from kanban_app.models import Board
+
+_cache = None
+
+
+def membership_cache():
+    """Process-wide LRU/TTL cache of board id -> frozenset of allowed user ids"""
+    global _cache
+    if _cache is None:
+        config = getattr(settings, "KANBAN_MEMBERSHIP_CACHE", {})
+        _cache = TTLCache(max_size=config.get("MAX_SIZE", 2048), ttl=config.get("TTL", 60))
+    return _cache
+
+
+def _request_memo(request):
+    if request is None:
+        return None
+    memo = getattr(request, "_board_member_ids", None)
+    if memo is None:
+        memo = {}
+        request._board_member_ids = memo
+    return memo
+
+
+def _load_member_ids(board):
+    """Reads owner and member ids, reusing prefetched members if the board has them"""
+    if isinstance(board, Board):
+        prefetched = getattr(board, "_prefetched_objects_cache", {}).get("members")
+        if prefetched is not None:
+            member_ids = [user.id for user in prefetched]
+        else:
+            member_ids = Board.members.through.objects.filter(board_id=board.pk).values_list("user_id", flat=True)
+        return frozenset(member_ids) | {board.owner_id}
+    if access_table_enabled():
+        return board_user_ids(board)
+    rows = Board.objects.filter(pk=board, deleting=False).values_list("owner_id", "members__id")
+    return frozenset(user_id for row in rows for user_id in row if user_id is not None)
+
+
+def board_member_ids(board, request=None):
+    """Returns the ids of all users allowed on a board (owner and members); none for boards pending deletion"""
+    board_id = board.pk if isinstance(board, Board) else board
+    memo = _request_memo(request)
+    if memo is not None and board_id in memo:
+        return memo[board_id]
+
+    cache = membership_cache()
+    member_ids = cache.get(board_id)
+    if member_ids is None:
+        member_ids = _load_member_ids(board)
+        cache.set(board_id, member_ids)
+
+    if memo is not None:
+        memo[board_id] = member_ids
+    return member_ids
+
+
+def board_member_ids_many(board_ids, request=None):
+    """Member ids for several boards, loading all uncached ones in one query; unknown boards are left out"""
+    memo = _request_memo(request)
+    cache = membership_cache()
+    result, missing = {}, set()
+    for board_id in set(board_ids):
+        member_ids = memo.get(board_id) if memo is not None else None
+        if member_ids is None:
+            member_ids = cache.get(board_id)
+        if member_ids is None:
+            missing.add(board_id)
+        else:
+            result[board_id] = member_ids
+
+    if missing:
+        loaded = {}
+        for board_id, owner_id, member_id in Board.objects.filter(pk__in=missing, deleting=False).values_list("id", "owner_id", "members__id"):
+            loaded.setdefault(board_id, {owner_id}).add(member_id)
+        for board_id, user_ids in loaded.items():
+            user_ids.discard(None)
+            result[board_id] = frozenset(user_ids)
+            cache.set(board_id, result[board_id])
+
+    if memo is not None:
+        memo.update(result)
+    return {board_id: member_ids for board_id, member_ids in result.items() if member_ids}
+
+
+def is_board_member(board, user, request=None):
+    """True if the user owns the board or is one of its members"""
+    if user is None or not user.is_authenticated:
+        return False
+    if isinstance(board, Board) and board.owner_id == user.id:
+        return True
+    return user.id in board_member_ids(board, request=request)
+
+
+def invalidate_board(board_id):
+    membership_cache().delete(board_id)
+
+
+def invalidate_all():
+    membership_cache().clear()
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+STATUS_FIELDS = {"to-do": "to_do_count", "in-progress": "in_progress_count", "review": "review_count", "done": "done_count"}
+PRIORITY_FIELDS = {"low": "low_prio_count", "medium": "medium_prio_count", "high": "high_prio_count"}
+
+
+def populate_board_stats(apps, schema_editor):
+    """Fills the counters for boards that existed before this migration"""
+    Board = apps.get_model("kanban_app", "Board")
+    BoardStats = apps.get_model("kanban_app", "BoardStats")
+    Task = apps.get_model("kanban_app", "Task")
+
+    tasks = Task.objects.order_by().values("board_id").annotate(
+        task_count=Count("id"),
+        **{field: Count("id", filter=Q(status=status)) for status, field in STATUS_FIELDS.items()},
+        **{field: Count("id", filter=Q(priority=priority)) for priority, field in PRIORITY_FIELDS.items()},
+    )
+    members = Board.members.through.objects.order_by().values("board_id").annotate(total=Count("*"))
+    task_rows = {row.pop("board_id"): row for row in tasks}
+    member_totals = {row["board_id"]: row["total"] for row in members}
+    BoardStats.objects.bulk_create(
+        [
+            BoardStats(board_id=board_id, member_count=member_totals.get(board_id, 0), **task_rows.get(board_id, {}))
+            for board_id in Board.objects.values_list("id", flat=True).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0003_delete_registrationusermodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='kanban_app.board')),
+                ('member_count', models.IntegerField(default=0)),
+                ('task_count', models.IntegerField(default=0)),
+                ('to_do_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('done_count', models.IntegerField(default=0)),
+                ('low_prio_count', models.IntegerField(default=0)),
+                ('medium_prio_count', models.IntegerField(default=0)),
+                ('high_prio_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'board stats',
+            },
+        ),
+        migrations.RunPython(populate_board_stats, migrations.RunPython.noop),
+    ]
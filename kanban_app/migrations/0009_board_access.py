@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_board_access(apps, schema_editor):
+    """Fills the access rows for owners and members of existing boards"""
+    Board = apps.get_model("kanban_app", "Board")
+    BoardAccess = apps.get_model("kanban_app", "BoardAccess")
+    pairs = set(Board.objects.values_list("id", "owner_id").iterator())
+    pairs.update(Board.members.through.objects.values_list("board_id", "user_id").iterator())
+    BoardAccess.objects.bulk_create([BoardAccess(board_id=board_id, user_id=user_id) for board_id, user_id in pairs], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0008_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='access', to='kanban_app.board')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='board_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'board access',
+                'indexes': [models.Index(fields=['board', 'user'], name='boardaccess_board_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'board'), name='boardaccess_user_board_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_board_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0010_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleting',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
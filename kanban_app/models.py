@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
 
 class Board(models.Model):
@@ -7,35 +8,188 @@ class Board(models.Model):
     title = models.CharField(max_length=50)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owned_boards")
     members = models.ManyToManyField(User, related_name="member_boards", blank=True)
+    revision = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    changes_floor = models.PositiveBigIntegerField(default=0, editable=False)
+    deleting = models.BooleanField(default=False, editable=False)
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_owner_id = instance.__dict__.get("owner_id")
+        return instance
+
 
 class Task(models.Model):
     """Model for task with predefined choices"""
     STATUS_CHOICES = [("to-do", "To Do"), ("in-progress", "In Progress"), ("review", "Review"), ("done", "Done"),]
     PRIORITY_CHOICES = [("low", "Low"), ("medium", "Medium"), ("high", "High"),]
 
-    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="tasks")
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="tasks", db_index=False)
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="to-do")
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default="medium")
-    assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_tasks")
-    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="review_tasks")
+    assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_tasks", db_index=False)
+    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="review_tasks", db_index=False)
     due_date = models.DateField(null=True, blank=True)
 
+    class Meta:
+        # Composite indexes lead with the FK column and replace the single-column FK indexes
+        indexes = [
+            models.Index(fields=["board", "status"], name="task_board_status_idx"),
+            models.Index(fields=["board", "priority"], name="task_board_priority_idx"),
+            models.Index(fields=["assignee", "board"], name="task_assignee_board_idx"),
+            models.Index(fields=["reviewer", "board"], name="task_reviewer_board_idx"),
+            models.Index(fields=["due_date"], name="task_due_date_idx"),
+        ]
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        """(board_id, status, priority) as relevant for BoardStats, None if a field is deferred"""
+        values = self.__dict__
+        if not all(name in values for name in ("board_id", "status", "priority")):
+            return None
+        return values["board_id"], values["status"], values["priority"]
     
     
 class Comment(models.Model):
     """Model for comment"""
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="comments")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="comments", db_index=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.CharField(max_length=600)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="comment_task_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Comment by {self.author.username} on {self.task.title}"
+
+
+class BoardStats(models.Model):
+    """Denormalized counters per board, maintained incrementally"""
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    member_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    to_do_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    low_prio_count = models.IntegerField(default=0)
+    medium_prio_count = models.IntegerField(default=0)
+    high_prio_count = models.IntegerField(default=0)
+
+    STATUS_FIELDS = {"to-do": "to_do_count", "in-progress": "in_progress_count", "review": "review_count", "done": "done_count"}
+    PRIORITY_FIELDS = {"low": "low_prio_count", "medium": "medium_prio_count", "high": "high_prio_count"}
+    COUNTER_FIELDS = ("member_count", "task_count", *STATUS_FIELDS.values(), *PRIORITY_FIELDS.values())
+
+    class Meta:
+        verbose_name_plural = "board stats"
+
+    def __str__(self):
+        return f"Stats for board {self.board_id}"
+
+
+class BoardAccess(models.Model):
+    """Materialized user -> board access (owner and members), kept in sync when KANBAN_ACCESS_TABLE is enabled"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="board_access", db_index=False)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="access", db_index=False)
+
+    class Meta:
+        verbose_name_plural = "board access"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "board"], name="boardaccess_user_board_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["board", "user"], name="boardaccess_board_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"User {self.user_id} on board {self.board_id}"
+
+
+class BoardChange(models.Model):
+    """Change log entry per board revision, read by the delta-sync endpoint"""
+    ENTITY_BOARD = "board"
+    ENTITY_TASK = "task"
+    ENTITY_COMMENT = "comment"
+    ENTITY_MEMBER = "member"
+    ENTITY_CHOICES = [
+        (ENTITY_BOARD, "Board"),
+        (ENTITY_TASK, "Task"),
+        (ENTITY_COMMENT, "Comment"),
+        (ENTITY_MEMBER, "Member"),
+    ]
+    ACTION_UPSERT = "upsert"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [(ACTION_UPSERT, "Upsert"), (ACTION_DELETE, "Delete")]
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="changes", db_index=False)
+    revision = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    entity_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "revision"], name="boardchange_board_rev_idx"),
+            models.Index(fields=["created_at"], name="boardchange_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity} {self.entity_id} @ board {self.board_id} r{self.revision}"
+
+
+class Job(models.Model):
+    """Background job stored in the database and executed by the run_jobs worker"""
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs", db_index=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # queued jobs by due time, and expired leases of running jobs
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+            models.Index(fields=["status", "locked_until"], name="job_status_locked_idx"),
+            models.Index(fields=["created_by", "created_at"], name="job_creator_created_idx"),
+        ]
+
     def __str__(self):
-        return f"Comment by {self.author.username} on {self.task.title}"
\ No newline at end of file
+        return f"{self.name} #{self.pk} ({self.status})"
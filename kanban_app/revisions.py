@@ -0,0 +1,94 @@
+"""Board revisions and the per-board change log used for delta sync"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Subquery
+from django.utils import timezone
+from kanban_app.board_cache import invalidate_boards
+from kanban_app.events import publish_board_events
+from kanban_app.models import Board, BoardChange
+
+
+def bump_boards(board_ids):
+    """Increments the revision of the given boards in a single UPDATE and drops their cached board detail"""
+    board_ids = {board_id for board_id in board_ids if board_id is not None}
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).update(revision=F("revision") + 1, updated_at=timezone.now())
+        invalidate_boards(board_ids)
+
+
+def record_changes(changes):
+    """Bumps every affected board once, logs (board_id, entity, entity_id, action) at its new revision and publishes it after commit"""
+    per_board = defaultdict(dict)
+    for board_id, entity, entity_id, action in changes:
+        if board_id is not None and entity_id is not None:
+            per_board[board_id][(entity, entity_id)] = action
+    if not per_board:
+        return
+
+    entries = [
+        (board_id, entity, entity_id, action)
+        for board_id, board_entries in per_board.items()
+        for (entity, entity_id), action in board_entries.items()
+    ]
+    with transaction.atomic():
+        bump_boards(per_board)
+        BoardChange.objects.bulk_create(
+            BoardChange(
+                board_id=board_id,
+                revision=Subquery(Board.objects.filter(pk=board_id).values("revision")[:1]),
+                entity=entity,
+                entity_id=entity_id,
+                action=action,
+            )
+            for board_id, entity, entity_id, action in entries
+        )
+    transaction.on_commit(lambda: publish_board_events(entries))
+
+
+def record_change(board_id, entity, entity_id, action=BoardChange.ACTION_UPSERT):
+    record_changes([(board_id, entity, entity_id, action)])
+
+
+def latest_changes(board_id, since):
+    """Last action per entity after the given revision: {entity: {entity_id: action}} and the highest revision seen"""
+    latest = defaultdict(dict)
+    revision = since
+    rows = (
+        BoardChange.objects.filter(board_id=board_id, revision__gt=since)
+        .order_by("revision", "id")
+        .values_list("revision", "entity", "entity_id", "action")
+    )
+    for row_revision, entity, entity_id, action in rows:
+        latest[entity][entity_id] = action
+        revision = max(revision, row_revision)
+    return latest, revision
+
+
+def compact_changes(retention_days=None, now=None):
+    """Drops superseded entries and entries older than the retention window; returns (superseded, expired)"""
+    if retention_days is None:
+        retention_days = getattr(settings, "KANBAN_CHANGELOG", {}).get("RETENTION_DAYS", 30)
+
+    latest_ids = (
+        BoardChange.objects.values("board_id", "entity", "entity_id")
+        .annotate(last_id=Max("id"))
+        .values("last_id")
+    )
+    superseded, _ = BoardChange.objects.exclude(id__in=Subquery(latest_ids)).delete()
+
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    expired = BoardChange.objects.filter(created_at__lt=cutoff)
+    with transaction.atomic():
+        floors = expired.values("board_id").annotate(floor=Max("revision")).values_list("board_id", "floor")
+        for board_id, floor in floors:
+            Board.objects.filter(pk=board_id, changes_floor__lt=floor).update(changes_floor=floor)
+        expired_count, _ = expired.delete()
+    return superseded, expired_count
+
+
+def board_etag(kind, pk, revision, variant=""):
+    """Strong ETag for a resource whose representation only changes with its board revision"""
+    suffix = f"-{variant}" if variant else ""
+    return f'"{kind}-{pk}-r{revision}{suffix}"'
@@ -0,0 +1,94 @@
+"""Full-text search over task titles, task descriptions and comment content"""
+import re
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from kanban_app.access import accessible_boards
+from kanban_app.models import Comment, Task
+
+TASK_INDEX = "kanban_app_task_fts"
+COMMENT_INDEX = "kanban_app_comment_fts"
+SNIPPET_TOKENS = 12
+
+
+def match_expression(text):
+    """Turns user input into an FTS5 query: every word quoted and prefix-matched, all words required"""
+    terms = re.findall(r"\w+", text or "")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def fts_available(model=Task):
+    return connections[router.db_for_read(model)].vendor == "sqlite"
+
+
+def matching_ids(model, text):
+    """Subquery of task or comment ids whose indexed text matches, for pk__in filters (used by the admin search)"""
+    index = TASK_INDEX if model is Task else COMMENT_INDEX
+    expression = match_expression(text)
+    if not expression:
+        return RawSQL(f"SELECT rowid FROM {index} WHERE 0", [])
+    return RawSQL(f"SELECT rowid FROM {index} WHERE {index} MATCH %s", [expression])
+
+
+def search(user, text, limit, offset=0):
+    """Tasks and comments on the user's boards matching text, best bm25 rank first"""
+    expression = match_expression(text)
+    if not expression:
+        return []
+    if not fts_available():
+        return _search_fallback(user, text, limit, offset)
+
+    boards_sql, boards_params = accessible_boards(user).values("id").query.sql_with_params()
+    task_table, comment_table = Task._meta.db_table, Comment._meta.db_table
+    sql = f"""
+        SELECT 'task', t.id, t.id, t.board_id, t.title,
+               snippet({TASK_INDEX}, -1, '', '', '…', {SNIPPET_TOKENS}), bm25({TASK_INDEX}, 10.0, 1.0) AS rank
+        FROM {TASK_INDEX} JOIN {task_table} t ON t.id = {TASK_INDEX}.rowid
+        WHERE {TASK_INDEX} MATCH %s AND t.board_id IN ({boards_sql})
+        UNION ALL
+        SELECT 'comment', c.id, t.id, t.board_id, t.title,
+               snippet({COMMENT_INDEX}, 0, '', '', '…', {SNIPPET_TOKENS}), bm25({COMMENT_INDEX}) AS rank
+        FROM {COMMENT_INDEX} JOIN {comment_table} c ON c.id = {COMMENT_INDEX}.rowid
+        JOIN {task_table} t ON t.id = c.task_id
+        WHERE {COMMENT_INDEX} MATCH %s AND t.board_id IN ({boards_sql})
+        ORDER BY rank, 1 DESC, 2
+        LIMIT %s OFFSET %s
+    """
+    params = [expression, *boards_params, expression, *boards_params, limit, offset]
+    with connections[router.db_for_read(Task)].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [_result(*row) for row in rows]
+
+
+def _search_fallback(user, text, limit, offset):
+    """Databases without FTS5: substring match, newest first, without ranking"""
+    boards = accessible_boards(user).values("id")
+    terms = re.findall(r"\w+", text)
+    task_filter, comment_filter = Q(), Q()
+    for term in terms:
+        task_filter &= Q(title__icontains=term) | Q(description__icontains=term)
+        comment_filter &= Q(content__icontains=term)
+    window = offset + limit
+    tasks = Task.objects.filter(task_filter, board__in=boards).order_by("-id").values_list("id", "board_id", "title", "description")[:window]
+    comments = (
+        Comment.objects.filter(comment_filter, task__board__in=boards).order_by("-id")
+        .values_list("id", "task_id", "task__board_id", "task__title", "content")[:window]
+    )
+    results = [_result("task", pk, pk, board_id, title, description[:200], None) for pk, board_id, title, description in tasks]
+    results += [_result("comment", pk, task_id, board_id, title, content[:200], None) for pk, task_id, board_id, title, content in comments]
+    return results[offset:window]
+
+
+def _result(kind, pk, task_id, board_id, title, snippet, rank):
+    return {"type": kind, "id": pk, "task": task_id, "board": board_id, "title": title, "snippet": snippet, "rank": rank}
+
+
+def rebuild_index():
+    """Repopulates both FTS tables from the task and comment tables"""
+    if not fts_available():
+        return False
+    with connections[router.db_for_write(Task)].cursor() as cursor:
+        for index in (TASK_INDEX, COMMENT_INDEX):
+            cursor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+    return True
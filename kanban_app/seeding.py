@@ -0,0 +1,163 @@
+"""Bulk generator for realistic kanban data, used by seed_kanban and the benchmark commands"""
+import random
+import time
+from array import array
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from faker import Faker
+from kanban_app.access import rebuild_access
+from kanban_app.membership import invalidate_all
+from kanban_app.models import Board, Comment, Task
+from kanban_app.stats import rebuild_board_stats
+
+
+class KanbanSeeder:
+    """Creates users, boards, memberships, tasks and comments with bulk_create in batched transactions.
+
+    Faker output is generated once into small pools and sampled with a seeded RNG,
+    so the same seed always yields the same dataset and millions of rows stay fast.
+    """
+    POOL_SIZE = 2000
+
+    def __init__(self, seed=42, batch_size=5000, password="Kanban123!", locale="de_DE", log=None):
+        self.rng = random.Random(seed)
+        self.faker = Faker(locale)
+        self.faker.seed_instance(seed)
+        self.batch_size = batch_size
+        self.password_hash = make_password(password) if password else make_password(None)
+        self.log = log or (lambda message: None)
+        self.stats = {}
+        self._build_pools()
+
+    def _build_pools(self):
+        fake = self.faker
+        self.first_names = [fake.first_name() for _ in range(self.POOL_SIZE)]
+        self.last_names = [fake.last_name() for _ in range(self.POOL_SIZE)]
+        self.board_titles = [fake.catch_phrase()[:50] for _ in range(self.POOL_SIZE)]
+        self.task_titles = [fake.sentence(nb_words=5)[:100] for _ in range(self.POOL_SIZE)]
+        self.descriptions = [fake.paragraph(nb_sentences=3) for _ in range(self.POOL_SIZE)] + [""] * (self.POOL_SIZE // 4)
+        self.comment_texts = [fake.sentence(nb_words=12)[:600] for _ in range(self.POOL_SIZE)]
+        self.statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        self.priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def _timed(self, name, func, total):
+        started = time.perf_counter()
+        result = func(total)
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stats[name] = {"rows": total, "seconds": round(elapsed, 3), "rows_per_sec": round(rate)}
+        self.log(f"{name}: {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        return result
+
+    def run(self, users=1000, boards=200, members_per_board=8, tasks=100_000, comments=200_000):
+        """Seeds everything and returns the throughput stats per table"""
+        started = time.perf_counter()
+        user_ids = self._timed("users", self.create_users, users)
+        board_ids, board_owners = self._timed("boards", lambda total: self.create_boards(total, user_ids), boards)
+        allowed = self._timed(
+            "memberships",
+            lambda total: self.create_memberships(board_ids, board_owners, user_ids, members_per_board),
+            len(board_ids) * min(members_per_board, len(user_ids)),
+        )
+        task_ids, task_boards = self._timed("tasks", lambda total: self.create_tasks(total, board_ids, allowed), tasks)
+        self._timed("comments", lambda total: self.create_comments(total, task_ids, task_boards, allowed), comments)
+        self._timed("board_stats", lambda total: rebuild_board_stats(board_ids), len(board_ids))
+        self._timed("board_access", lambda total: rebuild_access(board_ids), len(board_ids))
+        invalidate_all()
+
+        elapsed = time.perf_counter() - started
+        rows = sum(entry["rows"] for name, entry in self.stats.items() if name not in ("board_stats", "board_access"))
+        self.stats["total"] = {"rows": rows, "seconds": round(elapsed, 3), "rows_per_sec": round(rows / elapsed) if elapsed else 0}
+        return self.stats
+
+    def create_users(self, total):
+        ids = array("q")
+        offset = User.objects.count()
+        for start, size in self._batches(total):
+            batch = []
+            for i in range(start, start + size):
+                first, last = self.rng.choice(self.first_names), self.rng.choice(self.last_names)
+                email = f"{first}.{last}.{offset + i}@example.com".lower().replace(" ", "")
+                batch.append(User(username=email, email=email, first_name=first, last_name=last, password=self.password_hash))
+            with transaction.atomic():
+                ids.extend(user.pk for user in User.objects.bulk_create(batch))
+        return ids
+
+    def create_boards(self, total, user_ids):
+        ids, owners = array("q"), array("q")
+        for start, size in self._batches(total):
+            batch = [Board(title=self.rng.choice(self.board_titles), owner_id=self.rng.choice(user_ids)) for _ in range(size)]
+            with transaction.atomic():
+                for board in Board.objects.bulk_create(batch):
+                    ids.append(board.pk)
+                    owners.append(board.owner_id)
+        return ids, owners
+
+    def create_memberships(self, board_ids, board_owners, user_ids, members_per_board):
+        """Adds random members to every board, returns board id -> allowed user ids (owner first)"""
+        Membership = Board.members.through
+        allowed = {}
+        batch = []
+        per_board = min(members_per_board, len(user_ids))
+        for board_id, owner_id in zip(board_ids, board_owners):
+            members = self.rng.sample(user_ids, per_board)
+            allowed[board_id] = [owner_id, *members]
+            batch.extend(Membership(board_id=board_id, user_id=user_id) for user_id in members)
+            if len(batch) >= self.batch_size:
+                with transaction.atomic():
+                    Membership.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                Membership.objects.bulk_create(batch)
+        return allowed
+
+    def _due_date(self, today):
+        if self.rng.random() < 0.3:
+            return None
+        return today + timedelta(days=self.rng.randint(-30, 60))
+
+    def create_tasks(self, total, board_ids, allowed):
+        ids, boards = array("q"), array("q")
+        today = date.today()
+        for start, size in self._batches(total):
+            batch = []
+            for _ in range(size):
+                board_id = self.rng.choice(board_ids)
+                users = allowed[board_id]
+                batch.append(Task(
+                    board_id=board_id,
+                    title=self.rng.choice(self.task_titles),
+                    description=self.rng.choice(self.descriptions),
+                    status=self.rng.choice(self.statuses),
+                    priority=self.rng.choice(self.priorities),
+                    assignee_id=self.rng.choice(users) if self.rng.random() < 0.8 else None,
+                    reviewer_id=self.rng.choice(users) if self.rng.random() < 0.5 else None,
+                    due_date=self._due_date(today),
+                ))
+            with transaction.atomic():
+                for task in Task.objects.bulk_create(batch):
+                    ids.append(task.pk)
+                    boards.append(task.board_id)
+        return ids, boards
+
+    def create_comments(self, total, task_ids, task_boards, allowed):
+        if not task_ids:
+            return
+        for start, size in self._batches(total):
+            batch = []
+            for _ in range(size):
+                index = self.rng.randrange(len(task_ids))
+                batch.append(Comment(
+                    task_id=task_ids[index],
+                    author_id=self.rng.choice(allowed[task_boards[index]]),
+                    content=self.rng.choice(self.comment_texts),
+                ))
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch)
@@ -0,0 +1,204 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from kanban_app import access, revisions, stats
+from kanban_app.board_cache import invalidate_boards
+from kanban_app.membership import invalidate_all, invalidate_board
+from kanban_app.models import Board, BoardChange, BoardStats, Comment, Task
+
+UPSERT, DELETE = BoardChange.ACTION_UPSERT, BoardChange.ACTION_DELETE
+
+
+def _deleted_with(origin, model):
+    """True if a delete cascaded from an instance or queryset of the given model"""
+    return isinstance(origin, model) or getattr(origin, "model", None) is model
+
+
+def _cascaded_board_ids(origin):
+    """Boards removed by the same delete because their owner is deleted (see remember_user_boards)"""
+    return getattr(origin, "_owned_board_ids", ())
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_saved_or_deleted(sender, instance, **kwargs):
+    """Owner changes, new boards (reused ids) and deletions drop the cached membership and board detail"""
+    invalidate_board(instance.pk)
+    invalidate_boards([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Names and e-mail appear in board, task and comment payloads: a member change on each of the user's boards
+    bumps their revision (ETags, board cache, delta sync); logins only touch last_login"""
+    if created or raw or (update_fields and set(update_fields) <= {"last_login", "password"}):
+        return
+    board_ids = Board.objects.filter(pk__in=access.accessible_board_ids(instance)).values_list("pk", flat=True)
+    revisions.record_changes((board_id, BoardChange.ENTITY_MEMBER, instance.pk, UPSERT) for board_id in board_ids)
+
+
+@receiver(post_save, sender=Board)
+def board_updated(sender, instance, created, raw=False, **kwargs):
+    """Title or owner changes are logged as a board change"""
+    if not created and not raw:
+        revisions.record_change(instance.pk, BoardChange.ENTITY_BOARD, instance.pk)
+
+
+@receiver(post_save, sender=Board)
+def board_access_saved(sender, instance, created, raw=False, **kwargs):
+    """Keeps the owner's row in the access table; an owner change recomputes the board"""
+    if raw or not access.access_table_enabled():
+        return
+    if created:
+        access.grant_access([(instance.pk, instance.owner_id)])
+    elif getattr(instance, "_loaded_owner_id", None) != instance.owner_id:
+        access.rebuild_access([instance.pk])
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_save, sender=Board)
+def create_board_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        BoardStats.objects.get_or_create(board=instance)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidates cached membership, updates member counters and logs member changes"""
+    if action == "pre_clear":
+        related = instance.member_boards if reverse else instance.members
+        instance._cleared_ids = list(related.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    board_ids = list(pk_set or ()) if reverse else [instance.pk]
+
+    if reverse and action == "post_clear":
+        invalidate_all()
+        stats.refresh_member_count()
+        revisions.record_changes(
+            (board_id, BoardChange.ENTITY_MEMBER, instance.pk, DELETE) for board_id in getattr(instance, "_cleared_ids", ())
+        )
+        if access.access_table_enabled():
+            access.revoke_access(getattr(instance, "_cleared_ids", ()), [instance.pk])
+        return
+    for board_id in board_ids:
+        invalidate_board(board_id)
+    change = UPSERT if action == "post_add" else DELETE
+    if reverse:
+        revisions.record_changes((board_id, BoardChange.ENTITY_MEMBER, instance.pk, change) for board_id in board_ids)
+    else:
+        user_ids = pk_set if action != "post_clear" else getattr(instance, "_cleared_ids", ())
+        revisions.record_changes((instance.pk, BoardChange.ENTITY_MEMBER, user_id, change) for user_id in user_ids or ())
+
+    if access.access_table_enabled():
+        _sync_member_access(action, reverse, instance, pk_set)
+
+    if action == "post_add" and pk_set:
+        stats.add_members(board_ids, count=1 if reverse else len(pk_set))
+    elif board_ids:
+        stats.refresh_member_count(board_ids)
+
+
+def _sync_member_access(action, reverse, instance, pk_set):
+    """Mirrors a membership change into the access table (reverse: instance is the user)"""
+    if action == "post_clear":
+        access.rebuild_access([instance.pk])
+        return
+    board_ids, user_ids = (pk_set or (), [instance.pk]) if reverse else ([instance.pk], pk_set or ())
+    if action == "post_add":
+        access.grant_access((board_id, user_id) for board_id in board_ids for user_id in user_ids)
+    else:
+        access.revoke_access(board_ids, user_ids)
+
+
+@receiver(pre_delete, sender=User)
+def remember_user_boards(sender, instance, origin=None, **kwargs):
+    """Memberships removed by deleting a user do not send m2m_changed; the owned boards are deleted with the user,
+    so they are recorded on the delete's origin (user or queryset) for the cascaded task and comment signals"""
+    if origin is not None:
+        origin._owned_board_ids = {*_cascaded_board_ids(origin), *instance.owned_boards.values_list("id", flat=True)}
+    instance._member_board_ids = list(instance.member_boards.values_list("id", flat=True))
+    instance._related_tasks = list(
+        Task.objects.filter(Q(assignee=instance) | Q(reviewer=instance)).values_list("board_id", "id")
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, origin=None, **kwargs):
+    """Boards deleted together with the user get no change log entries"""
+    deleted = _cascaded_board_ids(origin)
+    board_ids = [board_id for board_id in getattr(instance, "_member_board_ids", []) if board_id not in deleted]
+    for board_id in board_ids:
+        invalidate_board(board_id)
+    if board_ids:
+        stats.refresh_member_count(board_ids)
+    revisions.record_changes([
+        *((board_id, BoardChange.ENTITY_MEMBER, instance.pk, DELETE) for board_id in board_ids),
+        *(
+            (board_id, BoardChange.ENTITY_TASK, task_id, UPSERT)
+            for board_id, task_id in getattr(instance, "_related_tasks", []) if board_id not in deleted
+        ),
+    ])
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    """Moves the task between the status/priority counters of its board"""
+    if raw:
+        return
+    new = instance.counter_state()
+    old = None if created else getattr(instance, "_loaded_counter_state", None)
+    if new is None or (old is None and not created):
+        board_ids = {instance.board_id} | ({old[0]} if old else set())
+        stats.rebuild_board_stats(sorted(board_ids))
+    elif old != new:
+        stats.apply_task_change(old, new)
+    changes = [(instance.board_id, BoardChange.ENTITY_TASK, instance.pk, UPSERT)]
+    if old is not None and old[0] != instance.board_id:
+        changes.append((old[0], BoardChange.ENTITY_TASK, instance.pk, DELETE))
+    revisions.record_changes(changes)
+    instance._loaded_counter_state = instance.counter_state()
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    """Deleting a whole board (directly or with its owner) drops its stats row, so only single task deletes are counted"""
+    if _deleted_with(origin, Board) or instance.board_id in _cascaded_board_ids(origin):
+        return
+    state = instance.counter_state()
+    if state is None:
+        stats.rebuild_board_stats([instance.board_id])
+    else:
+        stats.apply_task_change(old=state)
+    revisions.record_change(instance.board_id, BoardChange.ENTITY_TASK, instance.pk, DELETE)
+
+
+def _record_comment_change(comment, action, deleted_board_ids=()):
+    """Logs the comment and its task, whose comments_count changed with it"""
+    if Comment.task.is_cached(comment):
+        board_id = comment.task.board_id
+    else:
+        board_id = Task.objects.filter(pk=comment.task_id).values_list("board_id", flat=True).first()
+    if board_id in deleted_board_ids:
+        return
+    revisions.record_changes([
+        (board_id, BoardChange.ENTITY_COMMENT, comment.pk, action),
+        (board_id, BoardChange.ENTITY_TASK, comment.task_id, UPSERT),
+    ])
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _record_comment_change(instance, UPSERT)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """Comments deleted together with their task are covered by the task tombstone, those of boards deleted
+    with their owner need none"""
+    if _deleted_with(origin, Board) or _deleted_with(origin, Task):
+        return
+    _record_comment_change(instance, DELETE, _cascaded_board_ids(origin))
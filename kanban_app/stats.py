@@ -0,0 +1,109 @@
+"""Maintains the denormalized BoardStats counters"""
+from collections import Counter, defaultdict
+from django.db.models import Count, F, Q
+from kanban_app.models import Board, BoardStats, Task
+
+
+def _task_deltas(state, sign):
+    board_id, status, priority = state
+    deltas = Counter({"task_count": sign})
+    if status in BoardStats.STATUS_FIELDS:
+        deltas[BoardStats.STATUS_FIELDS[status]] += sign
+    if priority in BoardStats.PRIORITY_FIELDS:
+        deltas[BoardStats.PRIORITY_FIELDS[priority]] += sign
+    return board_id, deltas
+
+
+def apply_task_changes(changes):
+    """Applies (old_state, new_state) pairs, where a state is (board_id, status, priority) or None.
+    A missing stats row is only rebuilt for boards that received a task, never for removals alone."""
+    per_board = defaultdict(Counter)
+    receiving = {new[0] for _, new in changes if new is not None}
+    for old, new in changes:
+        if old is not None:
+            board_id, deltas = _task_deltas(old, -1)
+            per_board[board_id].update(deltas)
+        if new is not None:
+            board_id, deltas = _task_deltas(new, 1)
+            per_board[board_id].update(deltas)
+
+    for board_id, deltas in per_board.items():
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not updates:
+            continue
+        if not BoardStats.objects.filter(board_id=board_id).update(**updates) and board_id in receiving:
+            rebuild_board_stats([board_id])
+
+
+def apply_task_change(old=None, new=None):
+    apply_task_changes([(old, new)])
+
+
+def add_members(board_ids, count=1):
+    """Increments member_count for newly added memberships"""
+    updated = BoardStats.objects.filter(board_id__in=board_ids).update(member_count=F("member_count") + count)
+    if updated < len(board_ids):
+        rebuild_board_stats(board_ids)
+
+
+def refresh_member_count(board_ids=None):
+    """Recounts members, used where the number of removed memberships is unknown"""
+    members = Board.members.through.objects.order_by().values("board_id").annotate(total=Count("*"))
+    stats = BoardStats.objects.all()
+    if board_ids is not None:
+        members = members.filter(board_id__in=board_ids)
+        stats = stats.filter(board_id__in=board_ids)
+    totals = {row["board_id"]: row["total"] for row in members}
+    for board_stats in stats:
+        board_stats.member_count = totals.get(board_stats.board_id, 0)
+    BoardStats.objects.bulk_update(stats, ["member_count"])
+
+
+def compute_board_stats(board_ids):
+    """Calculates the counters for the given boards from the source tables"""
+    task_aggregates = {
+        "task_count": Count("id"),
+        **{field: Count("id", filter=Q(status=status)) for status, field in BoardStats.STATUS_FIELDS.items()},
+        **{field: Count("id", filter=Q(priority=priority)) for priority, field in BoardStats.PRIORITY_FIELDS.items()},
+    }
+    tasks = Task.objects.filter(board_id__in=board_ids).order_by().values("board_id").annotate(**task_aggregates)
+    members = (
+        Board.members.through.objects.filter(board_id__in=board_ids)
+        .order_by().values("board_id").annotate(total=Count("*"))
+    )
+    task_rows = {row.pop("board_id"): row for row in tasks}
+    member_totals = {row["board_id"]: row["total"] for row in members}
+    return [
+        BoardStats(board_id=board_id, member_count=member_totals.get(board_id, 0), **task_rows.get(board_id, {}))
+        for board_id in board_ids
+    ]
+
+
+def rebuild_board_stats(board_ids=None, batch_size=1000):
+    """Rebuilds (upserts) the counters in batches, returns the number of boards processed"""
+    if board_ids is None:
+        board_ids = Board.objects.order_by("id").values_list("id", flat=True)
+    board_ids = list(board_ids)
+    fields = list(BoardStats.COUNTER_FIELDS)
+    for start in range(0, len(board_ids), batch_size):
+        BoardStats.objects.bulk_create(
+            compute_board_stats(board_ids[start:start + batch_size]),
+            update_conflicts=True,
+            unique_fields=["board"],
+            update_fields=fields,
+        )
+    return len(board_ids)
+
+
+def verify_board_stats(batch_size=1000):
+    """Yields (board_id, field, stored, actual) for every counter that is out of sync"""
+    board_ids = list(Board.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(board_ids), batch_size):
+        batch = board_ids[start:start + batch_size]
+        stored = {stats.board_id: stats for stats in BoardStats.objects.filter(board_id__in=batch)}
+        for actual in compute_board_stats(batch):
+            current = stored.get(actual.board_id)
+            for field in BoardStats.COUNTER_FIELDS:
+                stored_value = getattr(current, field) if current else None
+                if stored_value != getattr(actual, field):
+                    yield actual.board_id, field, stored_value, getattr(actual, field)
@@ -1,3 +1,1435 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.management.base import CommandError
+from django.db import connection, connections, transaction
+from django.db.utils import load_backend
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from auth_app.api import urls as auth_urls
+from kanban_app.api import urls as kanban_urls
+from kanban_app.api.async_views import AsyncBoardDetailView, AsyncBoardListView, AsyncCommentsListView, AsyncReadView, AsyncTasksAssignedView, AsyncTasksInvolvedView, AsyncTasksReviewingView
+from kanban_app.api.events import board_event_stream
+from kanban_app.api.querysets import board_detail_queryset, task_comments, task_queryset
+from kanban_app.api.row_serializers import CommentRows, TaskRows
+from kanban_app.api.serializers import BoardDetailSerializer, CommentSerializer, TaskSerializer
+from kanban_app.benchmarks.concurrency import async_urlconf, run_concurrency_benchmark
+from kanban_app.benchmarks.events import run_event_benchmark
+from kanban_app.benchmarks.harness import STREAMING_ROUTES
+from core.middleware import ReplicaRoutingMiddleware, RequestInstrumentationMiddleware, ResponseCompressionMiddleware
+from core.renderers import FastJSONRenderer
+from core.utils.database import database_from_env
+from core.routers import PrimaryReplicaRouter, reset_replica, sticky_clients, use_replica
+from core.utils.cache import TTLCache
+from kanban_app.board_cache import board_cache, board_cache_stats, reset_board_cache
+from kanban_app.events import InMemoryBroker, board_channel, get_broker, reset_broker
+from kanban_app.jobs import claim_next, enqueue, execute, register, run_pending
+from kanban_app.membership import board_member_ids, invalidate_all
+from kanban_app.models import Board, BoardAccess, BoardChange, BoardStats, Job, Task, Comment
+from kanban_app.search import matching_ids
+from kanban_app.seeding import KanbanSeeder
+from kanban_app.stats import rebuild_board_stats, verify_board_stats
 
-# Create your tests here.
+
+class KanbanAPITestCase(APITestCase):
+    """Base class with an authenticated user"""
+    def setUp(self):
+        self.user = User.objects.create_user(username="max@example.com", email="max@example.com", first_name="Max", last_name="Muster")
+        self.other = User.objects.create_user(username="eva@example.com", email="eva@example.com", first_name="Eva", last_name="Beispiel")
+        self.client.force_authenticate(self.user)
+        invalidate_all()
+
+    def create_board(self, title="Board", owner=None, members=()):
+        board = Board.objects.create(title=title, owner=owner or self.user)
+        if members:
+            board.members.set(members)
+        return board
+
+
+class BoardListQueryTests(KanbanAPITestCase):
+    def test_board_counters(self):
+        board = self.create_board(members=[self.user, self.other])
+        Task.objects.create(board=board, title="A", status="to-do", priority="high")
+        Task.objects.create(board=board, title="B", status="done", priority="high")
+        Task.objects.create(board=board, title="C", status="to-do", priority="low")
+
+        response = self.client.get(reverse("board-list-create"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["member_count"], 2)
+        self.assertEqual(response.data[0]["ticket_count"], 3)
+        self.assertEqual(response.data[0]["tasks_to_do_count"], 2)
+        self.assertEqual(response.data[0]["tasks_high_prio_count"], 2)
+
+    def test_owned_and_member_boards_listed_once(self):
+        self.create_board(title="Own", members=[self.user])
+        self.create_board(title="Shared", owner=self.other, members=[self.user])
+        self.create_board(title="Foreign", owner=self.other)
+
+        response = self.client.get(reverse("board-list-create"))
+
+        self.assertEqual([b["title"] for b in response.data], ["Own", "Shared"])
+
+    def test_query_count_independent_of_board_count(self):
+        for i in range(10):
+            board = self.create_board(title=f"Board {i}", members=[self.user, self.other])
+            Task.objects.create(board=board, title="Task", priority="high")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("board-list-create"))
+        self.assertEqual(len(response.data), 10)
+
+
+class ListPaginationTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user])
+        self.tasks = [Task.objects.create(board=self.board, title=f"Task {i}", assignee=self.user) for i in range(5)]
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(reverse("tasks-assigned"))
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pages_cover_all_tasks(self):
+        response = self.client.get(reverse("tasks-assigned"), {"page_size": 2})
+        ids = [t["id"] for t in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids += [t["id"] for t in response.data["results"]]
+        self.assertEqual(ids, [t.id for t in self.tasks])
+
+    def test_comment_pages_ordered_by_created_at(self):
+        task = self.tasks[0]
+        for i in range(3):
+            task.comments.create(author=self.user, content=f"Kommentar {i}")
+        url = reverse("comments-list-create", kwargs={"task_id": task.id})
+
+        first = self.client.get(url, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        contents = [c["content"] for c in first.data["results"] + second.data["results"]]
+        self.assertEqual(contents, ["Kommentar 0", "Kommentar 1", "Kommentar 2"])
+
+    def test_page_size_capped(self):
+        with self.settings(KANBAN_PAGINATION={"MAX_PAGE_SIZE": 3}):
+            response = self.client.get(reverse("tasks-assigned"), {"page_size": 100})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_stream_matches_list(self):
+        with self.settings(KANBAN_PAGINATION={"STREAM_CHUNK_SIZE": 2}):
+            response = self.client.get(reverse("tasks-assigned"), {"stream": "true"})
+            body = b"".join(response.streaming_content)
+        self.assertEqual(json.loads(body), json.loads(self.client.get(reverse("tasks-assigned")).content))
+
+    def test_stream_empty_list(self):
+        response = self.client.get(reverse("tasks-reviewing"), {"stream": "1"})
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), [])
+
+
+class TaskQuerysetTests(KanbanAPITestCase):
+    def create_tasks(self, board, count):
+        tasks = Task.objects.bulk_create(
+            Task(board=board, title=f"Task {i}", assignee=self.user, reviewer=self.other) for i in range(count)
+        )
+        Comment.objects.bulk_create(Comment(task=task, author=self.user, content="Hallo") for task in tasks[:50])
+        return tasks
+
+    def test_board_detail_query_count_is_constant(self):
+        small = self.create_board(title="Small", members=[self.user, self.other])
+        large = self.create_board(title="Large", members=[self.user, self.other])
+        self.create_tasks(small, 1)
+        self.create_tasks(large, 500)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.get(reverse("board-detail", kwargs={"pk": small.pk}))
+        with self.assertNumQueries(len(small_queries)):
+            response = self.client.get(reverse("board-detail", kwargs={"pk": large.pk}))
+
+        self.assertEqual(len(response.data["tasks"]), 500)
+        self.assertEqual(response.data["tasks"][0]["comments_count"], 1)
+        self.assertEqual(response.data["tasks"][-1]["comments_count"], 0)
+        self.assertEqual(response.data["tasks"][0]["assignee"]["fullname"], "Max Muster")
+
+    def test_task_lists_query_count_is_constant(self):
+        board = self.create_board(members=[self.user, self.other])
+        self.create_tasks(board, 100)
+
+        for name in ("tasks-assigned", "tasks-involved"):
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse(name))
+            self.assertEqual(len(response.data), 100)
+            self.assertEqual(response.data[0]["comments_count"], 1)
+
+    def test_task_detail_comments_count(self):
+        board = self.create_board(members=[self.user])
+        task = self.create_tasks(board, 1)[0]
+
+        response = self.client.get(reverse("task-detail", kwargs={"pk": task.pk}))
+
+        self.assertEqual(response.data["comments_count"], 1)
+        self.assertEqual(response.data["board"], board.pk)
+
+
+class WritePathQueryTests(KanbanAPITestCase):
+    """Exact query counts with a cold membership cache; 4 of them record the board revision (savepoint, bump, log, release)"""
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title="Task")
+        invalidate_all()
+
+    def test_task_create_loads_board_and_users_once(self):
+        data = {"board": self.board.pk, "title": "Neu", "assignee_id": self.user.pk, "reviewer_id": self.other.pk}
+        # board, members, both users, insert, stats, revision
+        with self.assertNumQueries(9):
+            response = self.client.post(reverse("task-create"), data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["assignee"]["fullname"], "Max Muster")
+        self.assertEqual(response.data["reviewer"]["email"], self.other.email)
+        self.assertEqual(response.data["comments_count"], 0)
+        self.assertEqual(response.data, self.client.get(reverse("task-detail", args=[response.data["id"]])).data)
+
+    def test_task_create_unknown_board_is_404_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse("task-create"), {"board": 9999, "title": "Neu"}, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.post(reverse("task-create"), {"board": self.board.pk}, format="json").status_code, 400)
+
+    def test_task_patch_reuses_loaded_users(self):
+        Task.objects.filter(pk=self.task.pk).update(assignee=self.user)
+        # task with users, members, update, stats, revision
+        with self.assertNumQueries(8):
+            response = self.client.patch(reverse("task-detail", args=[self.task.pk]), {"status": "done", "assignee_id": self.user.pk}, format="json")
+        self.assertEqual(response.data["assignee"]["fullname"], "Max Muster")
+
+    def test_comment_create_loads_task_once(self):
+        # task, members, insert, revision
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse("comments-list-create", args=[self.task.pk]), {"content": "Hallo"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["author"], "Max Muster")
+
+    def test_comment_list_and_delete(self):
+        comment = Comment.objects.create(task=self.task, author=self.user, content="Weg")
+        invalidate_all()
+        # task with board revision, members, comments
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("comments-list-create", args=[self.task.pk]))
+        self.assertEqual([c["id"] for c in response.data], [comment.pk])
+        self.assertTrue(response.has_header("ETag"))
+        invalidate_all()
+        # task, members, comment, delete, revision
+        with self.assertNumQueries(8):
+            response = self.client.delete(reverse("comment-delete", args=[self.task.pk, comment.pk]))
+        self.assertEqual(response.status_code, 204)
+
+
+class TaskListFilterTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.second = self.create_board(title="Zweites", members=[self.user])
+        today = timezone.localdate()
+        self.overdue = Task.objects.create(board=self.board, title="B überfällig", status="in-progress", priority="high", assignee=self.user, due_date=today - timedelta(days=2))
+        self.done = Task.objects.create(board=self.board, title="A erledigt", status="done", priority="low", assignee=self.user, due_date=today - timedelta(days=5))
+        self.later = Task.objects.create(board=self.second, title="C später", status="to-do", priority="high", assignee=self.user, due_date=today + timedelta(days=3))
+        self.undated = Task.objects.create(board=self.second, title="D offen", status="review", priority="medium", assignee=self.user, reviewer=self.other)
+
+    def ids(self, **params):
+        response = self.client.get(reverse("tasks-assigned"), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [task["id"] for task in response.data]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(status="to-do,review"), [self.later.pk, self.undated.pk])
+        self.assertEqual(self.ids(priority="high", board=self.board.pk), [self.overdue.pk])
+        self.assertEqual(self.ids(overdue="true"), [self.overdue.pk])
+        self.assertNotIn(self.overdue.pk, self.ids(overdue="false"))
+        today = timezone.localdate()
+        self.assertEqual(self.ids(due_after=(today - timedelta(days=3)).isoformat(), due_before=today.isoformat()), [self.overdue.pk])
+
+    def test_invalid_filters_are_rejected(self):
+        for params in ({"status": "open"}, {"board": "x"}, {"due_after": "gestern"}, {"ordering": "description"}, {"fields": "id,secret"}):
+            self.assertEqual(self.client.get(reverse("tasks-involved"), params).status_code, 400, params)
+
+    def test_ordering_with_cursor_pages(self):
+        self.assertEqual(self.ids(ordering="title"), [self.done.pk, self.overdue.pk, self.later.pk, self.undated.pk])
+        self.assertEqual(self.ids(ordering="-priority,title"), [self.overdue.pk, self.later.pk, self.undated.pk, self.done.pk])
+        self.assertEqual(self.ids(ordering="status", fields="id"), [self.later.pk, self.overdue.pk, self.undated.pk, self.done.pk])
+        first = self.client.get(reverse("tasks-assigned"), {"ordering": "-title", "page_size": 3})
+        second = self.client.get(first.data["next"])
+        ordered = [task["title"] for task in first.data["results"] + second.data["results"]]
+        self.assertEqual(ordered, ["D offen", "C später", "B überfällig", "A erledigt"])
+        first = self.client.get(reverse("tasks-assigned"), {"ordering": "-priority", "page_size": 2, "fields": "id"})
+        second = self.client.get(first.data["next"])
+        self.assertEqual([task["id"] for task in first.data["results"] + second.data["results"]], [self.overdue.pk, self.later.pk, self.undated.pk, self.done.pk])
+        first = self.client.get(reverse("tasks-assigned"), {"ordering": "due_date", "page_size": 3, "fields": "id"})
+        second = self.client.get(first.data["next"])
+        self.assertEqual([task["id"] for task in first.data["results"] + second.data["results"]], [self.done.pk, self.overdue.pk, self.later.pk, self.undated.pk])
+
+    def test_sparse_fieldset_limits_columns_and_payload(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks-assigned"), {"fields": "id,title,status", "ordering": "due_date"})
+        self.assertEqual(set(response.data[0]), {"id", "title", "status"})
+        sql = queries.captured_queries[-1]["sql"]
+        for column in ("description", "comments", "auth_user"):
+            self.assertNotIn(column, sql)
+
+        response = self.client.get(reverse("tasks-involved"), {"fields": "id,reviewer,comments_count", "status": "review"})
+        self.assertEqual(response.data, [{"id": self.undated.pk, "reviewer": {"id": self.other.pk, "email": self.other.email, "fullname": "Eva Beispiel"}, "comments_count": 0}])
+
+    def test_streamed_list_keeps_requested_ordering(self):
+        response = self.client.get(reverse("tasks-assigned"), {"stream": "true", "ordering": "-title", "fields": "id"})
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), [{"id": task.pk} for task in (self.undated, self.later, self.overdue, self.done)])
+
+
+class AccessResolverTests(KanbanAPITestCase):
+    def access_pairs(self):
+        return set(BoardAccess.objects.values_list("board_id", "user_id"))
+
+    def expected_pairs(self):
+        pairs = set(Board.objects.values_list("id", "owner_id"))
+        return pairs | set(Board.members.through.objects.values_list("board_id", "user_id"))
+
+    def test_task_lists_use_union_subquery_without_distinct(self):
+        board = self.create_board(owner=self.other, members=[self.user])
+        own = self.create_board()
+        Task.objects.create(board=board, title="Fremd", assignee=self.user)
+        Task.objects.create(board=own, title="Eigen", reviewer=self.user)
+        Task.objects.create(board=self.create_board(owner=self.other), title="Kein Zugriff", assignee=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks-involved"))
+        self.assertEqual(sorted(task["title"] for task in response.data), ["Eigen", "Fremd"])
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertIn("UNION ALL", sql)
+        self.assertNotIn("DISTINCT", sql)
+
+    @override_settings(KANBAN_ACCESS_TABLE=True)
+    def test_access_table_follows_membership_and_owner_changes(self):
+        board = self.create_board(members=[self.other])
+        third = User.objects.create_user(username="tom@example.com", email="tom@example.com")
+        other_board = self.create_board(title="Zwei", owner=self.other)
+        third.member_boards.add(board, other_board)
+        board.members.add(self.user)
+        board.members.remove(self.user)
+        self.assertIn((board.pk, self.user.pk), self.access_pairs())
+        self.assertEqual(self.access_pairs(), self.expected_pairs())
+
+        board.owner = third
+        board.save()
+        self.assertNotIn((board.pk, self.user.pk), self.access_pairs())
+        third.member_boards.clear()
+        other_board.members.clear()
+        board.members.remove(self.other)
+        self.assertEqual(self.access_pairs(), self.expected_pairs())
+        third.delete()
+        self.assertEqual(self.access_pairs(), self.expected_pairs())
+
+    def test_access_table_serves_lists_and_permissions(self):
+        board = self.create_board(owner=self.other, members=[self.user])
+        task = Task.objects.create(board=board, title="Fremd", assignee=self.user)
+        call_command("rebuild_board_access", stdout=StringIO())
+        with override_settings(KANBAN_ACCESS_TABLE=True):
+            self.assertEqual([t["id"] for t in self.client.get(reverse("tasks-assigned")).data], [task.pk])
+            self.assertEqual([b["id"] for b in self.client.get(reverse("board-list-create")).data], [board.pk])
+            BoardAccess.objects.filter(user=self.user).delete()
+            invalidate_all()
+            self.assertEqual(self.client.get(reverse("tasks-assigned")).data, [])
+            self.assertEqual(self.client.get(reverse("comments-list-create", args=[task.pk])).status_code, 403)
+
+    def test_bench_access_forms_agree(self):
+        out = StringIO()
+        call_command("bench_access", users=20, boards=10, members_per_board=4, tasks=100, sample=5, iterations=1, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report["forms"]), {"or-distinct", "exists", "union", "access-table"})
+        self.assertFalse(any(form["mismatches"] for form in report["forms"].values()))
+        self.assertFalse(Board.objects.exists())
+
+
+class MembershipCacheTests(KanbanAPITestCase):
+    def test_ttl_cache_expires_and_evicts(self):
+        now = [0]
+        cache = TTLCache(max_size=2, ttl=10, timer=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        now[0] = 11
+        self.assertIsNone(cache.get("a"))
+
+    def test_member_ids_include_owner(self):
+        board = self.create_board(owner=self.other, members=[self.user])
+        self.assertEqual(board_member_ids(board.pk), {self.user.id, self.other.id})
+
+    def test_permission_check_uses_cache(self):
+        board = self.create_board(owner=self.other, members=[self.user])
+        task = Task.objects.create(board=board, title="Task")
+        url = reverse("task-detail", kwargs={"pk": task.pk})
+        self.client.get(url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_membership_changes_invalidate_cache(self):
+        board = self.create_board(owner=self.other)
+        task = Task.objects.create(board=board, title="Task")
+        url = reverse("task-detail", kwargs={"pk": task.pk})
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        board.members.add(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.user.member_boards.remove(board)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_board_delete_invalidates_cache(self):
+        board = self.create_board(members=[self.other])
+        board_id = board.pk
+        board_member_ids(board_id)
+        board.delete()
+        self.assertEqual(board_member_ids(board_id), frozenset())
+
+    def test_write_serializer_validates_against_members(self):
+        board = self.create_board(members=[self.user])
+        response = self.client.post(reverse("task-create"), {"board": board.pk, "title": "Neu", "assignee_id": self.other.id}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        board.members.add(self.other)
+        response = self.client.post(reverse("task-create"), {"board": board.pk, "title": "Neu", "assignee_id": self.other.id}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+
+class BoardStatsTests(KanbanAPITestCase):
+    def stats(self, board):
+        return BoardStats.objects.get(board=board)
+
+    def test_counters_follow_task_writes(self):
+        board = self.create_board(members=[self.user])
+        response = self.client.post(reverse("task-create"), {"board": board.pk, "title": "Neu", "status": "to-do", "priority": "high"}, format="json")
+        task_id = response.data["id"]
+        stats = self.stats(board)
+        self.assertEqual((stats.task_count, stats.to_do_count, stats.high_prio_count), (1, 1, 1))
+
+        self.client.patch(reverse("task-detail", kwargs={"pk": task_id}), {"status": "done", "priority": "low"}, format="json")
+        stats = self.stats(board)
+        self.assertEqual((stats.to_do_count, stats.done_count, stats.high_prio_count, stats.low_prio_count), (0, 1, 0, 1))
+
+        self.client.delete(reverse("task-detail", kwargs={"pk": task_id}))
+        stats = self.stats(board)
+        self.assertEqual((stats.task_count, stats.done_count, stats.low_prio_count), (0, 0, 0))
+
+    def test_counters_follow_membership(self):
+        third = User.objects.create_user(username="tom@example.com", email="tom@example.com")
+        board = self.create_board(members=[self.user, self.other])
+        self.assertEqual(self.stats(board).member_count, 2)
+
+        third.member_boards.add(board)
+        self.assertEqual(self.stats(board).member_count, 3)
+
+        board.members.remove(self.other, self.other)
+        self.assertEqual(self.stats(board).member_count, 2)
+
+        third.delete()
+        self.assertEqual(self.stats(board).member_count, 1)
+
+        board.members.clear()
+        self.assertEqual(self.stats(board).member_count, 0)
+
+    def test_board_list_reads_counters(self):
+        board = self.create_board(members=[self.user])
+        Task.objects.create(board=board, title="A", priority="high")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("board-list-create"))
+        self.assertEqual(response.data[0]["tasks_high_prio_count"], 1)
+
+    def test_rebuild_command_fixes_drift(self):
+        board = self.create_board(members=[self.user])
+        Task.objects.create(board=board, title="A")
+        BoardStats.objects.filter(board=board).update(task_count=7)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_board_stats", "--verify", stdout=StringIO())
+        call_command("rebuild_board_stats", stdout=StringIO())
+        call_command("rebuild_board_stats", "--verify", stdout=StringIO())
+        self.assertEqual(self.stats(board).task_count, 1)
+
+    def test_board_delete_removes_stats(self):
+        board = self.create_board(members=[self.user])
+        Task.objects.create(board=board, title="A")
+        board.delete()
+        self.assertFalse(BoardStats.objects.exists())
+
+    def test_owner_delete_removes_boards_with_tasks(self):
+        board = self.create_board(owner=self.other, members=[self.user, self.other])
+        task = Task.objects.create(board=board, title="A", priority="high", assignee=self.other)
+        Comment.objects.create(task=task, author=self.user, content="Hallo")
+        kept = self.create_board(members=[self.other])
+        kept_task = Task.objects.create(board=kept, title="B", reviewer=self.other)
+        Comment.objects.create(task=kept_task, author=self.other, content="Weg")
+        BoardStats.objects.filter(board=board).delete()
+        User.objects.filter(pk=self.other.pk).delete()
+        connection.check_constraints()
+        self.assertFalse(Board.objects.filter(pk=board.pk).exists())
+        self.assertEqual(list(BoardStats.objects.values_list("board_id", flat=True)), [kept.pk])
+        self.assertEqual(set(BoardChange.objects.values_list("board_id", flat=True)), {kept.pk})
+        self.assertTrue(BoardChange.objects.filter(board=kept, entity=BoardChange.ENTITY_COMMENT, action=BoardChange.ACTION_DELETE).exists())
+
+
+class ConditionalGetTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title="A", assignee=self.user)
+        self.urls = [
+            reverse("board-detail", args=[self.board.pk]),
+            reverse("task-detail", args=[self.task.pk]),
+            reverse("comments-list-create", args=[self.task.pk]),
+        ]
+
+    def test_etag_round_trip_returns_304(self):
+        for url in self.urls:
+            etag = self.client.get(url)["ETag"]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response["ETag"], etag)
+            self.assertLessEqual(len(ctx.captured_queries), 2, url)
+
+    def test_writes_change_etag(self):
+        etags = [self.client.get(url)["ETag"] for url in self.urls]
+        Comment.objects.create(task=self.task, author=self.user, content="Neu")
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_user_rename_changes_etag(self):
+        etags = [self.client.get(url)["ETag"] for url in self.urls]
+        self.user.first_name = "Moritz"
+        self.user.save()
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, url)
+        self.assertEqual(self.client.get(self.urls[1]).data["assignee"]["fullname"], "Moritz Muster")
+        changes = self.client.get(reverse("board-changes", args=[self.board.pk]), {"since": 0}).data
+        self.assertIn(self.user.pk, [member["id"] for member in changes["members"]])
+
+        etag = self.client.get(self.urls[0])["ETag"]
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        self.assertEqual(self.client.get(self.urls[0], HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_revision_bumps(self):
+        def revision():
+            return Board.objects.values_list("revision", flat=True).get(pk=self.board.pk)
+
+        start = revision()
+        self.task.status = "done"
+        self.task.save()
+        self.board.members.remove(self.other)
+        self.client.patch(reverse("board-detail", args=[self.board.pk]), {"title": "Neu"}, format="json")
+        self.task.delete()
+        self.assertEqual(revision(), start + 4)
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.urls[0])
+        self.assertEqual(self.client.get(self.urls[0], HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304)
+
+    def test_non_member_gets_no_304(self):
+        etag = self.client.get(self.urls[0])["ETag"]
+        stranger = User.objects.create_user(username="x@example.com")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.urls[0], HTTP_IF_NONE_MATCH=etag).status_code, 403)
+
+    def test_query_string_changes_etag(self):
+        plain = self.client.get(self.urls[2])["ETag"]
+        paged = self.client.get(self.urls[2], {"page_size": 1})["ETag"]
+        self.assertNotEqual(plain, paged)
+
+
+class BoardChangesTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user])
+        self.url = reverse("board-changes", args=[self.board.pk])
+
+    def revision(self):
+        return Board.objects.values_list("revision", flat=True).get(pk=self.board.pk)
+
+    def test_changes_since_revision(self):
+        kept = Task.objects.create(board=self.board, title="Bleibt")
+        gone = Task.objects.create(board=self.board, title="Weg")
+        since = self.revision()
+
+        comment = Comment.objects.create(task=kept, author=self.user, content="Hallo")
+        self.board.members.add(self.other)
+        gone_id = gone.pk
+        gone.delete()
+
+        response = self.client.get(self.url, {"since": since})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["revision"], self.revision())
+        self.assertEqual([task["id"] for task in response.data["tasks"]], [kept.pk])
+        self.assertEqual(response.data["tasks"][0]["comments_count"], 1)
+        self.assertEqual(response.data["comments"][0]["id"], comment.pk)
+        self.assertEqual(response.data["comments"][0]["task"], kept.pk)
+        self.assertEqual([member["id"] for member in response.data["members"]], [self.other.pk])
+        self.assertEqual(response.data["deleted"], {"tasks": [gone_id], "comments": [], "members": []})
+        self.assertIsNone(response.data["board_data"])
+
+    def test_up_to_date_client_gets_nothing(self):
+        Task.objects.create(board=self.board, title="A")
+        response = self.client.get(self.url, {"since": self.revision()})
+        self.assertEqual(response.data["tasks"], [])
+        self.assertEqual(response.data["deleted"], {"tasks": [], "comments": [], "members": []})
+
+    def test_member_removal_and_board_update(self):
+        self.board.members.add(self.other)
+        since = self.revision()
+        self.board.members.remove(self.other)
+        self.client.patch(reverse("board-detail", args=[self.board.pk]), {"title": "Neu"}, format="json")
+
+        response = self.client.get(self.url, {"since": since})
+
+        self.assertEqual(response.data["deleted"]["members"], [self.other.pk])
+        self.assertEqual(response.data["board_data"]["title"], "Neu")
+
+    def test_task_moved_to_other_board(self):
+        target = self.create_board(title="Ziel", members=[self.user])
+        task = Task.objects.create(board=self.board, title="A")
+        since = self.revision()
+        task.board = target
+        task.save()
+        response = self.client.get(self.url, {"since": since})
+        self.assertEqual(response.data["deleted"]["tasks"], [task.pk])
+
+    def test_invalid_since(self):
+        self.assertEqual(self.client.get(self.url, {"since": "abc"}).status_code, 400)
+
+    def test_non_member_forbidden(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_compaction_keeps_latest_entry(self):
+        task = Task.objects.create(board=self.board, title="A")
+        for status_value in ("in-progress", "review", "done"):
+            task.status = status_value
+            task.save()
+
+        call_command("compact_board_changes", stdout=StringIO())
+
+        self.assertEqual(BoardChange.objects.filter(entity=BoardChange.ENTITY_TASK, entity_id=task.pk).count(), 1)
+        response = self.client.get(self.url, {"since": 0})
+        self.assertEqual(response.data["tasks"][0]["status"], "done")
+
+    def test_expired_entries_raise_floor(self):
+        Task.objects.create(board=self.board, title="A")
+        since = self.revision() - 1
+        BoardChange.objects.update(created_at=timezone.now() - timedelta(days=100))
+
+        call_command("compact_board_changes", "--retention-days", "30", stdout=StringIO())
+
+        self.assertFalse(BoardChange.objects.exists())
+        self.assertEqual(self.client.get(self.url, {"since": since}).status_code, 410)
+        self.assertEqual(self.client.get(self.url, {"since": self.revision()}).status_code, 200)
+
+
+class TaskBulkTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.url = reverse("task-bulk")
+
+    def post(self, tasks, **extra):
+        return self.client.post(self.url, {"tasks": tasks, **extra}, format="json")
+
+    def test_create_update_and_move(self):
+        target = self.create_board(title="Ziel", members=[self.user])
+        moved = Task.objects.create(board=self.board, title="Verschieben", status="review")
+        since = Board.objects.values_list("revision", flat=True).get(pk=self.board.pk)
+
+        response = self.post([
+            {"board": self.board.pk, "title": "Neu", "priority": "high", "assignee_id": self.other.pk},
+            {"id": moved.pk, "board": target.pk, "status": "done"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["status"] for result in response.data["results"]], [201, 200])
+        self.assertEqual(response.data["results"][0]["data"]["assignee"]["id"], self.other.pk)
+        self.assertEqual(response.data["results"][1]["data"]["board"], target.pk)
+        self.assertEqual(list(verify_board_stats()), [])
+        changes = self.client.get(reverse("board-changes", args=[self.board.pk]), {"since": since}).data
+        self.assertEqual(changes["deleted"]["tasks"], [moved.pk])
+
+    def test_query_count_independent_of_item_count(self):
+        tasks = [Task.objects.create(board=self.board, title=f"T{i}") for i in range(20)]
+
+        def run(count):
+            items = [{"id": task.pk, "status": "done"} for task in tasks[:count]]
+            items += [{"board": self.board.pk, "title": f"N{i}", "reviewer_id": self.other.pk} for i in range(count)]
+            invalidate_all()
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.post(items).status_code, 200)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(2), run(20))
+
+    def test_atomic_failure_writes_nothing(self):
+        stranger = User.objects.create_user(username="x@example.com")
+        task = Task.objects.create(board=self.board, title="A")
+        response = self.post([
+            {"id": task.pk, "status": "done"},
+            {"board": self.board.pk, "title": "B", "assignee_id": stranger.pk},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result["status"] for result in response.data["results"]], [424, 400])
+        task.refresh_from_db()
+        self.assertEqual(task.status, "to-do")
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_partial_mode_writes_valid_items(self):
+        foreign = self.create_board(title="Fremd", owner=self.other)
+        response = self.post([
+            {"board": self.board.pk, "title": "Gut"},
+            {"board": foreign.pk, "title": "Verboten"},
+            {"id": 999999, "status": "done"},
+            {"board": self.board.pk},
+        ], atomic=False)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["status"] for result in response.data["results"]], [201, 403, 404, 400])
+        self.assertEqual(list(Task.objects.values_list("title", flat=True)), ["Gut"])
+
+    def test_invalid_payload(self):
+        self.assertEqual(self.client.post(self.url, {"tasks": []}, format="json").status_code, 400)
+
+
+class SearchTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user])
+        self.task = Task.objects.create(board=self.board, title="Rechnung prüfen", description="Quartalsabschluss vorbereiten")
+        self.comment = Comment.objects.create(task=self.task, author=self.user, content="Die Rechnung liegt im Postfach")
+        foreign = self.create_board(title="Fremd", owner=self.other)
+        Task.objects.create(board=foreign, title="Rechnung Fremd")
+
+    def search(self, **params):
+        return self.client.get(reverse("search"), params)
+
+    def test_finds_tasks_and_comments_on_accessible_boards_ranked(self):
+        response = self.search(q="rechnung")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([(r["type"], r["id"]) for r in results], [("task", self.task.pk), ("comment", self.comment.pk)])
+        self.assertEqual(results[1]["task"], self.task.pk)
+        self.assertEqual(results[1]["board"], self.board.pk)
+
+    def test_prefix_diacritics_and_description(self):
+        self.assertEqual(self.search(q="prufen").data["results"][0]["id"], self.task.pk)
+        self.assertEqual([r["id"] for r in self.search(q="quartal").data["results"]], [self.task.pk])
+
+    def test_index_follows_updates_bulk_writes_and_deletes(self):
+        Task.objects.filter(pk=self.task.pk).update(title="Angebot schreiben")
+        Task.objects.bulk_create([Task(board=self.board, title="Angebot senden")])
+        self.assertEqual(len(self.search(q="angebot").data["results"]), 2)
+        self.assertEqual([r["type"] for r in self.search(q="rechnung").data["results"]], ["comment"])
+        self.task.delete()
+        self.assertEqual([r["title"] for r in self.search(q="angebot").data["results"]], ["Angebot senden"])
+        self.assertEqual(self.search(q="postfach").data["results"], [])
+
+    def test_pagination_and_validation(self):
+        Task.objects.bulk_create([Task(board=self.board, title=f"Rechnung {i}") for i in range(3)])
+        first = self.search(q="rechnung", page_size=2)
+        self.assertEqual(len(first.data["results"]), 2)
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        last = self.client.get(second.data["next"])
+        self.assertEqual(len(last.data["results"]), 1)
+        self.assertIsNone(last.data["next"])
+        self.assertEqual(self.client.get(second.data["previous"]).data["results"], first.data["results"])
+        ids = {(r["type"], r["id"]) for r in first.data["results"] + second.data["results"] + last.data["results"]}
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(self.search(q="  ").status_code, 400)
+        self.assertEqual(self.search(q="x", page="0").status_code, 400)
+        self.assertEqual(self.search(q='"*:(').data["results"], [])
+
+    def test_admin_search_uses_the_index(self):
+        admin_user = User.objects.create_superuser(username="admin", email="admin@example.com", password="pw")
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse("admin:kanban_app_comment_changelist"), {"q": "quartal"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.comment])
+        response = self.client.get(reverse("admin:kanban_app_task_changelist"), {"q": "rechnung"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        response = self.client.get(reverse("admin:kanban_app_task_changelist"), {"q": "oar"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.task])
+        response = self.client.get(reverse("admin:kanban_app_comment_changelist"), {"q": "max@exa"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.comment])
+
+    def test_index_match_stays_a_subquery(self):
+        Task.objects.bulk_create([Task(board=self.board, title=f"Rechnung {i}") for i in range(1200)])
+        queryset = Task.objects.filter(pk__in=matching_ids(Task, "rechnung"))
+        sql, params = queryset.query.sql_with_params()
+        self.assertIn("MATCH", sql)
+        self.assertEqual(len(params), 1)
+        self.assertEqual(queryset.count(), 1202)
+        self.assertFalse(Task.objects.filter(pk__in=matching_ids(Task, "*:")).exists())
+
+
+class BoardEventsTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        reset_broker()
+        self.board = self.create_board(members=[self.user])
+        self.url = reverse("board-events", args=[self.board.pk])
+        self.token = Token.objects.create(user=self.user)
+
+    def tearDown(self):
+        reset_broker()
+
+    async def open_stream(self, token=None):
+        key = token or self.token.key
+        return await self.async_client.get(self.url, headers={"Authorization": f"Token {key}"})
+
+    async def test_task_changes_are_pushed(self):
+        response = await self.open_stream()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        frames = aiter(response.streaming_content)
+        self.assertEqual(await anext(frames), b"retry: 3000\n\n")
+
+        def create_task():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Task.objects.create(board=self.board, title="Live")
+
+        task = await sync_to_async(create_task)()
+        frame = (await anext(frames)).decode()
+        self.assertTrue(frame.startswith("event: task\n"))
+        self.assertEqual(json.loads(frame.split("data: ", 1)[1]), {"board": self.board.pk, "entity": "task", "id": task.pk, "action": "upsert"})
+        self.assertEqual(get_broker().subscriber_count(board_channel(self.board.pk)), 1)
+
+    async def test_access_checks(self):
+        other_token = await sync_to_async(Token.objects.create)(user=self.other)
+        self.assertEqual((await self.open_stream(token=other_token.key)).status_code, 403)
+        self.assertEqual((await self.open_stream(token="invalid")).status_code, 401)
+        self.assertEqual((await self.async_client.get(self.url)).status_code, 401)
+
+    def test_wsgi_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 501)
+
+    async def test_slow_subscriber_gets_resync(self):
+        broker = InMemoryBroker(queue_size=2)
+        subscription = broker.subscribe(board_channel(1))
+        for i in range(3):
+            broker.publish(board_channel(1), {"board": 1, "entity": "task", "id": i, "action": "upsert"})
+        await asyncio.sleep(0)
+        stream = board_event_stream(subscription, heartbeat=1)
+        self.assertEqual([frame async for frame in stream][-1], "event: resync\ndata: {}\n\n")
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_event_load_benchmark(self):
+        report = asyncio.run(run_event_benchmark(subscribers=200, boards=10, events=50, interval_ms=0))
+        self.assertEqual(report["lost"], 0)
+        self.assertEqual(report["open_after_run"], 0)
+
+
+class AsyncReadViewTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title="A", assignee=self.user, reviewer=self.other, due_date="2025-01-31")
+        Task.objects.create(board=self.board, title="B", reviewer=self.user, priority="high")
+        Comment.objects.create(task=self.task, author=self.other, content="Hallo")
+        self.token = Token.objects.create(user=self.user)
+        self.routes = [
+            (AsyncBoardListView, "board-list-create", {}),
+            (AsyncBoardDetailView, "board-detail", {"pk": self.board.pk}),
+            (AsyncTasksAssignedView, "tasks-assigned", {}),
+            (AsyncTasksReviewingView, "tasks-reviewing", {}),
+            (AsyncTasksInvolvedView, "tasks-involved", {}),
+            (AsyncCommentsListView, "comments-list-create", {"task_id": self.task.pk}),
+        ]
+
+    async def test_async_responses_match_sync_views(self):
+        factory = AsyncRequestFactory()
+        with mock.patch.object(AsyncReadView, "sync_view", side_effect=AssertionError("sync fallback used")):
+            for view_class, name, kwargs in self.routes:
+                url = reverse(name, kwargs=kwargs or None)
+                expected = await sync_to_async(self.client.get)(url)
+                request = factory.get(url, headers={"Authorization": f"Token {self.token.key}"})
+                response = await view_class.as_view()(request, **kwargs)
+                self.assertEqual(response.status_code, 200, name)
+                self.assertEqual(json.loads(response.content), json.loads(expected.content), name)
+                if "ETag" in expected:
+                    self.assertEqual(response["ETag"], expected["ETag"], name)
+
+    async def test_other_requests_fall_back_to_sync_views(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        foreign = await sync_to_async(self.create_board)(title="Fremd", owner=self.other)
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            created = await self.async_client.post(reverse("board-list-create"), {"title": "Neu"}, content_type="application/json", headers=headers)
+            forbidden = await self.async_client.get(reverse("board-detail", args=[foreign.pk]), headers=headers)
+            paged = await self.async_client.get(reverse("tasks-involved"), {"page_size": 1}, headers=headers)
+            anonymous = await self.async_client.get(reverse("board-list-create"))
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(forbidden.status_code, 403)
+        self.assertEqual(len(paged.json()["results"]), 1)
+        self.assertEqual(anonymous.status_code, 401)
+
+    async def test_always_paginated_lists_and_missing_stats_use_sync_views(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        with override_settings(ROOT_URLCONF=async_urlconf(), KANBAN_PAGINATION={"ALWAYS": True, "PAGE_SIZE": 1}):
+            for name, kwargs in (("board-list-create", {}), ("tasks-involved", {}), ("comments-list-create", {"task_id": self.task.pk})):
+                response = await self.async_client.get(reverse(name, kwargs=kwargs or None), headers=headers)
+                self.assertIn("results", response.json(), name)
+            detail = await self.async_client.get(reverse("board-detail", args=[self.board.pk]), headers=headers)
+        self.assertEqual(detail.json()["id"], self.board.pk)
+
+        await BoardStats.objects.filter(board=self.board).adelete()
+        request = AsyncRequestFactory().get(reverse("board-list-create"), headers=headers)
+        with mock.patch.object(AsyncReadView, "sync_view", return_value=lambda request: HttpResponse(b"sync")):
+            response = await AsyncBoardListView.as_view()(request)
+        self.assertEqual(response.content, b"sync")
+
+
+class AsyncBenchmarkTests(APITransactionTestCase):
+    def test_all_modes_serve_the_read_mix(self):
+        KanbanSeeder(seed=3, password=None).run(users=10, boards=3, members_per_board=3, tasks=30, comments=30)
+        report = run_concurrency_benchmark(clients=3, requests=12)
+        self.assertEqual(set(report["modes"]), {"wsgi", "asgi-sync", "asgi-async"})
+        for mode in report["modes"].values():
+            self.assertEqual(mode["requests"], 12)
+            self.assertEqual(mode["errors"], 0)
+        self.assertFalse(Token.objects.exists())
+
+
+class SqliteTuningTests(SimpleTestCase):
+    def open_connection(self):
+        path = str(Path(tempfile.mkdtemp()) / "tuning.sqlite3")
+        wrapper = load_backend("django.db.backends.sqlite3").DatabaseWrapper({**connections.settings["default"], "NAME": path}, alias="tuning")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_get_the_tuning_pragmas(self):
+        wrapper = self.open_connection()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), settings.SQLITE_TUNING["BUSY_TIMEOUT_MS"])
+        self.assertEqual(self.pragma(wrapper, "temp_store"), 2)
+
+    def test_disabled_profile_keeps_sqlite_defaults(self):
+        with override_settings(SQLITE_TUNING={**settings.SQLITE_TUNING, "ENABLED": False}):
+            wrapper = self.open_connection()
+            self.assertEqual(self.pragma(wrapper, "journal_mode"), "delete")
+
+    def test_write_transactions_begin_immediate(self):
+        self.assertEqual(connections.settings["default"]["OPTIONS"].get("transaction_mode"), "IMMEDIATE")
+
+
+REPLICA_ROUTING = {"REPLICA_ALIAS": "replica", "STICKY_SECONDS": 5, "STICKY_COOKIE": "kanmind_primary"}
+
+
+class ReplicaRoutingTests(KanbanAPITestCase):
+    """A second in-memory SQLite database, declared only for this test case, stands in for a lagging read replica.
+    The alias is added to `databases` once it exists, so the test runner never checks or sets it up."""
+
+    @classmethod
+    def setUpClass(cls):
+        default = connections.settings["default"]
+        connections.settings["replica"] = {**default, "TEST": {**default["TEST"], "NAME": None}}
+        connections["replica"].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            connections["replica"].creation.destroy_test_db(connections["replica"].settings_dict["NAME"], verbosity=0)
+            del connections["replica"]
+            del connections.settings["replica"]
+            del cls.databases
+
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(title="Primär", members=[self.user])
+        User.objects.using("replica").bulk_create([User(pk=self.user.pk, username=self.user.username, email=self.user.email)])
+        Board.objects.using("replica").bulk_create([Board(pk=self.board.pk, title="Replik", owner_id=self.user.pk)])
+        self.url = reverse("board-detail", args=[self.board.pk])
+        sticky_clients().clear()
+
+    def title(self, **extra):
+        return self.client.get(self.url, **extra).data["title"]
+
+    def test_reads_use_replica_until_client_writes(self):
+        with override_settings(DATABASE_ROUTING=REPLICA_ROUTING):
+            self.assertEqual(self.title(), "Replik")
+
+            response = self.client.patch(self.url, {"title": "Neu"}, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("kanmind_primary", response.cookies)
+            self.assertEqual(self.title(), "Neu")
+
+            self.client.cookies.clear()
+            self.assertEqual(self.title(), "Replik")
+        self.assertEqual(self.title(), "Neu")
+
+    def test_stickiness_per_credential(self):
+        auth = {"HTTP_AUTHORIZATION": "Token abc"}
+        with override_settings(DATABASE_ROUTING=REPLICA_ROUTING):
+            self.client.patch(self.url, {"title": "Neu"}, format="json", **auth)
+            self.client.cookies.clear()
+            self.assertEqual(self.title(**auth), "Neu")
+            self.assertEqual(self.title(HTTP_AUTHORIZATION="Token other"), "Replik")
+
+    def test_middleware_runs_async_and_is_skipped_without_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+        seen = []
+
+        async def view(request):
+            seen.append(PrimaryReplicaRouter().db_for_read(Board))
+            return HttpResponse()
+
+        with override_settings(DATABASE_ROUTING=REPLICA_ROUTING):
+            middleware = ReplicaRoutingMiddleware(view)
+            self.assertTrue(iscoroutinefunction(middleware))
+            asyncio.run(middleware(AsyncRequestFactory().get("/")))
+            response = asyncio.run(middleware(AsyncRequestFactory().post("/")))
+        self.assertEqual(seen, ["replica", "default"])
+        self.assertIn("kanmind_primary", response.cookies)
+
+    def test_database_settings_from_env(self):
+        env = {"DB_ENGINE": "postgresql", "DB_NAME": "kanmind", "DB_HOST": "primary", "DB_POOL_MAX_SIZE": "20", "DB_REPLICA_HOST": "replica"}
+        with mock.patch.dict(os.environ, env):
+            primary = database_from_env("DB")
+            replica = database_from_env("DB_REPLICA", fallback_prefix="DB")
+        self.assertEqual(primary["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(primary["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertEqual(primary["CONN_MAX_AGE"], 0)
+        self.assertEqual((replica["NAME"], replica["HOST"]), ("kanmind", "replica"))
+        self.assertEqual(replica["CONN_MAX_AGE"], 0)
+        with mock.patch.dict(os.environ, {"DB_CONN_MAX_AGE": "60"}):
+            self.assertEqual(database_from_env("DB")["CONN_MAX_AGE"], 60)
+
+    def test_writes_and_transactions_use_primary(self):
+        router = PrimaryReplicaRouter()
+        with override_settings(DATABASE_ROUTING=REPLICA_ROUTING):
+            token = use_replica(True)
+            try:
+                self.assertEqual(router.db_for_write(Board), "default")
+                self.assertEqual(router.db_for_read(Board), "replica")
+                with transaction.atomic():
+                    self.assertEqual(router.db_for_read(Board), "default")
+            finally:
+                reset_replica(token)
+            self.assertEqual(router.db_for_read(Board), "default")
+            self.assertFalse(router.allow_migrate("replica", "kanban_app"))
+
+
+class SeedKanbanTests(APITestCase):
+    def test_seed_creates_consistent_dataset(self):
+        out = StringIO()
+        call_command("seed_kanban", "--users", "20", "--boards", "5", "--tasks", "200", "--comments", "300", "--batch-size", "50", "--password", "", "--json", stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["tasks"]["rows"], 200)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Board.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 200)
+        self.assertEqual(Comment.objects.count(), 300)
+        self.assertEqual(list(verify_board_stats()), [])
+        for task in Task.objects.select_related("board").exclude(assignee=None):
+            self.assertIn(task.assignee_id, board_member_ids(task.board))
+
+    def test_same_seed_same_data(self):
+        KanbanSeeder(seed=7, password=None).run(users=5, boards=2, members_per_board=2, tasks=10, comments=0)
+        first = list(Task.objects.order_by("id").values_list("title", "status", "priority"))
+        Task.objects.all().delete()
+        KanbanSeeder(seed=7, password=None).run(users=5, boards=2, members_per_board=2, tasks=10, comments=0)
+        second = list(Task.objects.order_by("id").values_list("title", "status", "priority"))
+        self.assertEqual(first, second)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchEndpointsTests(APITestCase):
+    def test_every_route_is_benchmarked(self):
+        out = StringIO()
+        call_command("bench_endpoints", "--users", "10", "--boards", "3", "--tasks", "30", "--comments", "30", "--iterations", "1", "--warmup", "0", "--no-budgets", stdout=out)
+
+        report = json.loads(out.getvalue())
+        benchmarked = {key.split(" ", 1)[1] for key in report["endpoints"]}
+        routes = {pattern.name for pattern in kanban_urls.urlpatterns + auth_urls.urlpatterns} - STREAMING_ROUTES
+        self.assertEqual(benchmarked, routes)
+        self.assertEqual(report["violations"], [])
+        self.assertIn("p95_ms", report["endpoints"]["GET board-detail"])
+
+    def test_budget_violation_fails(self):
+        budgets = Path(tempfile.mkdtemp()) / "budgets.json"
+        budgets.write_text(json.dumps({"GET board-detail": {"max_queries": 0}}))
+        with self.assertRaises(CommandError):
+            call_command("bench_endpoints", "--users", "5", "--boards", "2", "--tasks", "10", "--comments", "0", "--iterations", "1", "--warmup", "0", "--only", "board-detail", "--budgets", str(budgets), stdout=StringIO())
+
+
+INSTRUMENTATION_ON = {"ENABLED": True, "SERVER_TIMING": True, "SAMPLE_RATE": 1.0, "DUPLICATE_QUERY_THRESHOLD": 2}
+
+
+class RequestInstrumentationTests(KanbanAPITestCase):
+    def test_server_timing_and_log_line(self):
+        self.create_board(members=[self.user])
+        with self.settings(REQUEST_INSTRUMENTATION=INSTRUMENTATION_ON):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            with self.assertLogs("kanmind.instrumentation", level="INFO") as logs:
+                response = client.get(reverse("board-list-create"))
+
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["view"], "board-list-create")
+        self.assertEqual(record["queries"], 1)
+        self.assertGreaterEqual(record["serialize_ms"], 0)
+
+    def test_duplicate_query_alert(self):
+        def view(request):
+            for _ in range(3):
+                list(Board.objects.filter(pk=1))
+            return HttpResponse()
+
+        with self.settings(REQUEST_INSTRUMENTATION={**INSTRUMENTATION_ON, "SAMPLE_RATE": 0}):
+            middleware = RequestInstrumentationMiddleware(view)
+            with self.assertLogs("kanmind.instrumentation", level="WARNING") as logs:
+                middleware(RequestFactory().get("/"))
+        self.assertIn("ran the same query 3 times", logs.output[0])
+
+    def test_disabled_middleware_is_skipped(self):
+        with self.settings(REQUEST_INSTRUMENTATION={"ENABLED": False}):
+            with self.assertRaises(MiddlewareNotUsed):
+                RequestInstrumentationMiddleware(lambda request: HttpResponse())
+            response = self.client.get(reverse("board-list-create"))
+        self.assertNotIn("Server-Timing", response)
+
+
+class RowSerializerEquivalenceTests(KanbanAPITestCase):
+    """The row serializers must produce exactly what the DRF serializers produce"""
+    def setUp(self):
+        super().setUp()
+        self.nameless = User.objects.create_user(username="anon@example.com", email="anon@example.com")
+        self.board = self.create_board(members=[self.user, self.other, self.nameless])
+        self.task = Task.objects.create(board=self.board, title="A", description="Text", assignee=self.user, reviewer=self.other, due_date="2025-01-31")
+        Task.objects.create(board=self.board, title="B", priority="high", assignee=self.nameless)
+        Comment.objects.create(task=self.task, author=self.other, content="Hallo")
+        Comment.objects.create(task=self.task, author=self.nameless, content="Ohne Namen")
+
+    def test_task_rows_match_task_serializer(self):
+        queryset = task_queryset(Task.objects.filter(board=self.board)).order_by("id")
+        expected = TaskSerializer(queryset, many=True).data
+        self.assertEqual(TaskRows().many(TaskRows().rows(queryset)), expected)
+        sparse = TaskRows(fields=["id", "assignee", "due_date"])
+        self.assertEqual(sparse.many(sparse.rows(queryset)), [{key: row[key] for key in ("id", "assignee", "due_date")} for row in expected])
+
+    def test_comment_rows_match_comment_serializer(self):
+        expected = CommentSerializer(task_comments(self.task.pk), many=True).data
+        self.assertEqual(CommentRows().many(CommentRows().rows(task_comments(self.task.pk))), expected)
+        self.assertEqual(expected[1]["author"], "anon@example.com")
+
+    def test_board_detail_matches_board_detail_serializer(self):
+        expected = BoardDetailSerializer(board_detail_queryset().get(pk=self.board.pk)).data
+        self.assertEqual(self.client.get(reverse("board-detail", args=[self.board.pk])).json(), json.loads(json.dumps(expected)))
+
+    def test_serializer_benchmark_is_identical(self):
+        out = StringIO()
+        call_command("bench_serializers", "--tasks", "20", "--comments", "10", "--members", "3", "--iterations", "1", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertTrue(all(case["identical"] for case in report["cases"].values()))
+        self.assertFalse(Board.objects.filter(title="Serializer bench").exists())
+
+
+class JsonRenderingTests(KanbanAPITestCase):
+    def test_fast_renderer_matches_json_renderer(self):
+        data = {
+            "due_date": date(2025, 1, 31),
+            "created_at": datetime(2025, 1, 31, 12, 30, 5, 123456, tzinfo=dt_timezone.utc),
+            "error": ErrorDetail("Ungültig", code="invalid"),
+            "lazy": gettext_lazy("This field is required."),
+            "text": "Zeile Umbruch äöü",
+            1: [None, True, 1.5],
+        }
+        expected = JSONRenderer().render(data)
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+        self.assertIn(b'"2025-01-31T12:30:05.123456Z"', expected)
+        with self.settings(API_JSON_ENCODER="stdlib"):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+        with self.settings(API_JSON_ENCODER="simplejson"), self.assertRaises(ImproperlyConfigured):
+            FastJSONRenderer().render(data)
+
+    def test_api_responses_are_compact_and_honour_indent(self):
+        board = self.create_board(members=[self.user])
+        Task.objects.create(board=board, title="A", due_date="2025-01-31")
+        response = self.client.get(reverse("board-detail", args=[board.pk]))
+        self.assertNotIn(b", ", response.content)
+        self.assertEqual(response.json()["tasks"][0]["due_date"], "2025-01-31")
+        indented = self.client.get(reverse("board-detail", args=[board.pk]), HTTP_ACCEPT="application/json; indent=2")
+        self.assertEqual(json.loads(indented.content), response.json())
+        self.assertIn(b'\n  "id"', indented.content)
+
+    def test_compression_above_threshold(self):
+        board = self.create_board(members=[self.user])
+        Task.objects.bulk_create(Task(board=board, title=f"Task {i}", description="Text " * 20) for i in range(30))
+        url = reverse("board-detail", args=[board.pk])
+        plain = self.client.get(url).content
+        with self.settings(RESPONSE_COMPRESSION={"ENABLED": True, "MIN_SIZE": 1024}):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertEqual(gzip.decompress(response.content), plain)
+            small = client.get(reverse("task-detail", args=[board.tasks.first().pk]), HTTP_ACCEPT_ENCODING="gzip")
+            self.assertNotIn("Content-Encoding", small)
+        with self.settings(RESPONSE_COMPRESSION={"ENABLED": False}), self.assertRaises(MiddlewareNotUsed):
+            ResponseCompressionMiddleware(lambda request: HttpResponse())
+
+    def test_render_benchmark_is_identical(self):
+        out = StringIO()
+        call_command("bench_rendering", "--sizes", "5,20", "--members", "3", "--iterations", "1", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report["sizes"]), {"5", "20"})
+        self.assertTrue(all(result["identical"] for result in report["sizes"].values()))
+        self.assertFalse(Board.objects.exists())
+
+
+class BoardCacheTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        reset_board_cache()
+        self.board = self.create_board(members=[self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title="A", assignee=self.other)
+        self.url = reverse("board-detail", args=[self.board.pk])
+
+    def tearDown(self):
+        reset_board_cache()
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first["X-Board-Cache"], "miss")
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second["X-Board-Cache"], "hit")
+        self.assertEqual(json.loads(second.content), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        indented = self.client.get(self.url, HTTP_ACCEPT="application/json; indent=2")
+        self.assertEqual(indented["X-Board-Cache"], "hit")
+        self.assertIn(b'\n  "id"', indented.content)
+        stats = board_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 1, 1))
+
+    def test_permissions_are_checked_on_hits(self):
+        self.client.get(self.url)
+        outsider = User.objects.create_user(username="out@example.com", email="out@example.com")
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.get(reverse("board-detail", args=[9999])).status_code, 404)
+
+    def test_writes_invalidate_the_entry(self):
+        self.client.get(self.url)
+        Task.objects.create(board=self.board, title="B")
+        self.assertIsNone(board_cache().get(self.board.pk))
+        self.assertEqual(len(self.client.get(self.url).json()["tasks"]), 2)
+
+        Comment.objects.create(task=self.task, author=self.user, content="Hallo")
+        self.assertEqual(self.client.get(self.url).json()["tasks"][0]["comments_count"], 1)
+
+        self.board.members.remove(self.other)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Board-Cache"], "miss")
+        self.assertEqual([member["id"] for member in response.json()["members"]], [self.user.pk])
+
+    def test_user_rename_invalidates(self):
+        self.client.get(self.url)
+        self.other.first_name = "Eve"
+        self.other.save()
+        self.assertEqual(self.client.get(self.url).json()["tasks"][0]["assignee"]["fullname"], "Eve Beispiel")
+        self.client.get(self.url)
+        self.other.last_login = timezone.now()
+        self.other.save(update_fields=["last_login"])
+        self.assertEqual(self.client.get(self.url)["X-Board-Cache"], "hit")
+
+    def test_local_backend_is_bounded_by_bytes(self):
+        cache = TTLCache(max_size=10, ttl=60, max_bytes=10)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"123")
+        self.assertNotIn("a", cache)
+        self.assertEqual((cache.bytes, cache.evictions), (8, 1))
+        cache.set("d", b"x" * 11)
+        self.assertNotIn("d", cache)
+        cache.delete("b")
+        self.assertEqual(cache.bytes, 3)
+
+    def test_shared_backend_and_disabled_cache(self):
+        with self.settings(KANBAN_BOARD_CACHE={"ENABLED": True, "SHARED_CACHE": "default"}):
+            reset_board_cache()
+            self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url)["X-Board-Cache"], "hit")
+            self.assertEqual(board_cache_stats()["backend"], "shared")
+            Task.objects.create(board=self.board, title="B")
+            self.assertEqual(self.client.get(self.url)["X-Board-Cache"], "miss")
+        with self.settings(KANBAN_BOARD_CACHE={"ENABLED": False}):
+            reset_board_cache()
+            self.assertNotIn("X-Board-Cache", self.client.get(self.url))
+
+    def test_board_cache_benchmark(self):
+        out = StringIO()
+        call_command("bench_board_cache", "--sizes", "5", "--reads", "6", "--write-every", "3", "--members", "2", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["sizes"]["5"]["cached"]["metrics"]["hits"], 4)
+        self.assertFalse(Board.objects.filter(title__startswith="Cache bench").exists())
+
+
+class JobQueueTests(KanbanAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.create_board(members=[self.user])
+        Task.objects.bulk_create(Task(board=self.board, title=f"Task {i}") for i in range(5))
+        rebuild_board_stats([self.board.pk])
+
+    def test_large_board_delete_returns_202_and_runs_on_worker(self):
+        url = reverse("board-detail", args=[self.board.pk])
+        with self.settings(KANBAN_JOBS={"BOARD_DELETE_INLINE_TASKS": 3}):
+            response = self.client.delete(url)
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.data["status"], "queued")
+            self.assertEqual(self.client.delete(url).status_code, 404)
+        self.assertTrue(Board.objects.filter(pk=self.board.pk, deleting=True).exists())
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.patch(url, {"title": "Neu"}, format="json").status_code, 404)
+        self.assertEqual(self.client.get(reverse("board-list-create")).json(), [])
+        self.assertEqual(self.client.post(reverse("task-create"), {"board": self.board.pk, "title": "Neu"}, format="json").status_code, 404)
+        self.assertEqual(Task.objects.count(), 5)
+
+        status_url = reverse("job-detail", args=[response.data["id"]])
+        self.assertTrue(response["Location"].endswith(status_url))
+        out = StringIO()
+        call_command("run_jobs", "--once", stdout=out)
+        self.assertIn("executed 1 job(s)", out.getvalue())
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+        self.assertFalse(Task.objects.exists())
+
+        job = self.client.get(status_url).data
+        self.assertEqual(job["status"], "succeeded")
+        self.assertGreater(job["result"]["deleted"], 6)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+
+    def test_small_board_delete_stays_inline(self):
+        self.assertEqual(self.client.delete(reverse("board-detail", args=[self.board.pk])).status_code, 204)
+        self.assertFalse(Job.objects.exists())
+
+    @mock.patch.dict("kanban_app.jobs._registry")
+    def test_failures_are_retried_with_backoff_then_fail(self):
+        calls = []
+
+        @register("test_flaky")
+        def flaky(payload):
+            calls.append(payload)
+            raise RuntimeError("kaputt")
+
+        job = enqueue("test_flaky", {"n": 1}, max_attempts=2)
+        with self.settings(KANBAN_JOBS={"RETRY_DELAY": 60}), self.assertLogs("kanmind.jobs", "ERROR"):
+            self.assertEqual(run_pending("w1"), 1)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, 1))
+            self.assertIn("kaputt", job.error)
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=50))
+            self.assertEqual(run_pending("w1"), 0)
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            run_pending("w1")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, len(calls)), (Job.STATUS_FAILED, 2, 2))
+
+    def test_failed_board_delete_restores_the_board(self):
+        url = reverse("board-detail", args=[self.board.pk])
+        failing = mock.Mock(side_effect=RuntimeError("kaputt"))
+        with self.settings(KANBAN_JOBS={"BOARD_DELETE_INLINE_TASKS": 3, "MAX_ATTEMPTS": 1}):
+            with mock.patch.dict("kanban_app.jobs._registry", {"delete_board": failing}), self.assertLogs("kanmind.jobs", "ERROR"):
+                self.assertEqual(self.client.delete(url).status_code, 202)
+                self.assertEqual(self.client.get(url).status_code, 404)
+                run_pending("w1")
+            self.assertEqual(Job.objects.get().status, Job.STATUS_FAILED)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+            self.assertEqual(self.client.delete(url).status_code, 202)
+            job = Job.objects.get(status=Job.STATUS_QUEUED)
+            claim_next("w1")
+            Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(run_pending("w2"), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_expired_lease_is_reclaimed_and_late_result_discarded(self):
+        job = enqueue("rebuild_board_stats", {"board_ids": [self.board.pk]})
+        first = claim_next("w1", visibility_timeout=60)
+        self.assertIsNone(claim_next("w2"))
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        second = claim_next("w2")
+        self.assertEqual((second.pk, second.attempts, second.locked_by), (job.pk, 2, "w2"))
+        execute(first, "w1")
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        execute(second, "w2")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.STATUS_SUCCEEDED, {"boards": 1}))
+
+    def test_abandoned_job_on_last_attempt_fails(self):
+        job = enqueue("rebuild_board_stats", max_attempts=1)
+        claim_next("w1")
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(run_pending("w2"), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+    def test_rebuild_stats_enqueue_and_eager_mode(self):
+        BoardStats.objects.filter(board=self.board).update(task_count=0)
+        out = StringIO()
+        call_command("rebuild_board_stats", "--enqueue", stdout=out)
+        self.assertIn("Queued job", out.getvalue())
+        self.assertEqual(BoardStats.objects.get(board=self.board).task_count, 0)
+        call_command("run_jobs", "--max-jobs", "1", stdout=StringIO())
+        self.assertEqual(BoardStats.objects.get(board=self.board).task_count, 5)
+
+        with self.settings(KANBAN_JOBS={"EAGER": True}), self.captureOnCommitCallbacks(execute=True):
+            job = enqueue("delete_board", {"board_id": self.board.pk})
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())